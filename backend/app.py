@@ -3,29 +3,19 @@ Kalongo Farm - Flask backend
 """
 import os
 from dotenv import load_dotenv
-from flask import Flask, jsonify
-from flask_login import LoginManager
+from flask import Flask, jsonify, Response
 from flask_cors import CORS
-from database import test_connection, engine, Base, SessionLocal
+from werkzeug.middleware.dispatcher import DispatcherMiddleware
+from database import test_connection, engine, Base
 from sqlalchemy import text
-from sqlalchemy.orm import joinedload
-from models import (
-    Admin,
-    HeroSlide,
-    Room,
-    RoomImage,
-    Facility,
-    Activity,
-    PricingCategory,
-    PricingItem,
-    FoodItem,
-    Video,
-    Review,
-    SiteSettings,
-    RestaurantMenuCategory,
-    RestaurantMenuItem,
-    GalleryImage,
-)
+import queries
+import homepage_document
+import warmup
+from utils.response_cache import cached_response, stats as response_cache_stats
+from utils.json_provider import init_json
+from utils import invalidation_bus, shared_snapshot, db_pool, request_timing, slow_queries, metrics, health as health_probe
+from utils.internal_access import internal
+from utils.db_pool import read_with_retry
 
 load_dotenv()
 
@@ -34,38 +24,26 @@ app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "dev-secret-key")
 app.config["MAX_CONTENT_LENGTH"] = 16 * 1024 * 1024  # 16MB max upload
 app.config["TEMPLATES_AUTO_RELOAD"] = False  # Disable auto-reload for faster rendering
 app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 300  # Cache static files
+init_json(app)  # orjson-backed jsonify for app routes and every blueprint
+request_timing.install(app)  # Server-Timing header + per-route latency (REQUEST_TIMING=on)
+slow_queries.install()  # statements over SLOW_QUERY_MS + their plans, shown at /admin/slow-queries
+metrics.install(app, engine)  # Prometheus /metrics, summed over workers (METRICS=on)
+# "parallel" fetches /api/homepage-data sections concurrently, one pooled connection each
+HOMEPAGE_FETCH = os.getenv("HOMEPAGE_FETCH", "serial").lower()
+# "on" serves /api/homepage-data from the homepage_documents read model (homepage_document.py)
+HOMEPAGE_READ_MODEL = os.getenv("HOMEPAGE_READ_MODEL", "off").lower() in ("1", "true", "on")
 CORS(app)  # Enable CORS for frontend API calls
+# "eager" builds the admin panel at startup; "lazy" on the first /admin request (routes/admin_app.py)
+ADMIN_LOAD = os.getenv("ADMIN_LOAD", "lazy").lower()
 
-login_manager = LoginManager()
-login_manager.init_app(app)
-login_manager.login_view = "admin.login"
-login_manager.login_message = "Please log in to access the admin panel."
-login_manager.session_protection = "basic"  # Use basic to avoid redirect loops
+from routes.admin_app import LazyAdmin
+from routes.api_routes import api_bp
 
-
-@login_manager.user_loader
-def load_user(user_id):
-    """Load user from database - must return None if user doesn't exist"""
-    s = SessionLocal()
-    try:
-        if not user_id:
-            return None
-        admin = s.query(Admin).get(int(user_id))
-        return admin
-    except (ValueError, TypeError, Exception):
-        return None
-    finally:
-        s.close()
-
-
-from routes.admin_routes import admin_bp
-
-app.register_blueprint(admin_bp)
-
-
-def get_session():
-    """Get database session"""
-    return SessionLocal()
+app.register_blueprint(api_bp)
+admin = app.extensions["kalongo_admin"] = LazyAdmin(app)
+app.wsgi_app = DispatcherMiddleware(app.wsgi_app, {"/admin": admin})
+if ADMIN_LOAD == "eager":
+    admin.load()
 
 
 @app.route("/")
@@ -75,8 +53,31 @@ def index():
 
 @app.route("/health")
 def health():
-    db_status = "connected" if test_connection() else "disconnected"
-    return {"status": "healthy", "database": db_status}
+    """Same shape as before, from the background probe (utils/health.py) - no query per hit"""
+    health_probe.start(engine)
+    return {"status": "healthy", "database": health_probe.database_status()}
+
+
+@app.route("/health/live")
+def health_live():
+    """The process answers requests; never touches the database"""
+    return {"status": "alive", "pid": os.getpid()}
+
+
+@app.route("/health/ready")
+def health_ready():
+    """503 until this process has warmed up and the last background probe (at most STALE_AFTER
+    seconds old) reached the database"""
+    health_probe.start(engine)
+    db = health_probe.database()
+    ready = bool(db["ok"]) and not db["stale"] and warmup.is_ready()
+    body = {
+        "status": "ready" if ready else "not ready",
+        "database": db,
+        "pool": db_pool.stats(engine) if db["last_success"] else None,  # no engine without DATABASE_URL
+        "warmup": warmup.state(),
+    }
+    return jsonify(body), 200 if ready else 503
 
 
 @app.route("/api/db/test")
@@ -98,307 +99,72 @@ def db_test():
         return jsonify({"status": "error", "message": str(e)}), 500
 
 
-# ============================================================================
-# PUBLIC API ROUTES - All routes explicitly defined here
-# ============================================================================
+@app.route("/internal/cache-stats")
+@internal
+def cache_stats():
+    """Response cache hit/miss counters, current content versions and invalidation bus counters"""
+    return jsonify({**response_cache_stats(), "invalidation_bus": invalidation_bus.stats()})
 
-@app.route("/api/hero-slides")
-def get_hero_slides():
-    """Get all active hero slides - admin controls via active flag"""
-    s = get_session()
-    try:
-        # Get active slides for frontend display
-        slides = s.query(HeroSlide).filter_by(active=True).order_by(HeroSlide.order, HeroSlide.id).limit(50).all()
-        # If no active slides, get all slides as fallback
-        if not slides:
-            slides = s.query(HeroSlide).order_by(HeroSlide.order, HeroSlide.id).limit(50).all()
-        return jsonify([{
-            "id": slide.id,
-            "image_url": slide.image_url,
-            "title": slide.title,
-            "subtitle": slide.subtitle,
-            "order": slide.order,
-        } for slide in slides])
-    finally:
-        s.close()
 
+@app.route("/metrics")
+@internal
+def prometheus_metrics():
+    """Prometheus text format, every worker's metrics added up (METRICS=on)"""
+    if not metrics.ENABLED:
+        return jsonify({"error": "Metrics are off (METRICS=on enables them)"}), 404
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
 
-@app.route("/api/rooms")
-def get_rooms():
-    """Get all rooms with their images - optimized with eager loading"""
-    s = get_session()
-    try:
-        rooms = s.query(Room).options(joinedload(Room.images)).order_by(Room.order, Room.id).all()
-        result = []
-        for room in rooms:
-            # Filter out images with null or empty URLs
-            valid_images = [
-                {
-                    "id": img.id,
-                    "image_url": img.image_url,
-                    "caption": img.caption or "",
-                    "order": img.order or 0,
-                }
-                for img in room.images
-                if img.image_url and img.image_url.strip()  # Only include images with valid URLs
-            ]
-            result.append({
-                "id": room.id,
-                "name": room.name,
-                "slug": room.slug,
-                "description": room.description or "",
-                "capacity": room.capacity or "",
-                "features": room.features or [],
-                "images": sorted(valid_images, key=lambda x: (x["order"], x["id"])),
-            })
-        return jsonify(result)
-    finally:
-        s.close()
 
+@app.route("/internal/request-timings")
+@internal
+def request_timings():
+    """Per-route latency of this worker, with its DB and serialization share (REQUEST_TIMING=on)"""
+    return jsonify({"enabled": request_timing.ENABLED, "routes": request_timing.route_stats()})
 
-@app.route("/api/facilities")
-def get_facilities():
-    """Get all facilities"""
-    s = get_session()
-    try:
-        facilities = s.query(Facility).order_by(Facility.order, Facility.id).all()
-        return jsonify([{
-            "id": f.id,
-            "name": f.name,
-            "description": f.description,
-            "image_url": f.image_url,
-            "order": f.order,
-        } for f in facilities])
-    finally:
-        s.close()
 
+@app.route("/internal/pool-stats")
+@internal
+def pool_stats():
+    """Connection pool of this worker: size and usage now, checkout/wait timings and peaks, failures"""
+    return jsonify(db_pool.stats(engine))
 
-@app.route("/api/activities")
-def get_activities():
-    """Get all activities"""
-    s = get_session()
-    try:
-        activities = s.query(Activity).order_by(Activity.order, Activity.id).all()
-        result = []
-        for a in activities:
-            # Only include activities with valid data
-            if a.name:  # Ensure activity has a name
-                result.append({
-                    "id": a.id,
-                    "name": a.name,
-                    "description": a.description or "",
-                    "image_url": a.image_url if a.image_url and a.image_url.strip() else None,
-                    "order": a.order or 0,
-                })
-        return jsonify(result)
-    finally:
-        s.close()
-
-
-@app.route("/api/pricing")
-def get_pricing():
-    """Get all pricing categories with items - optimized"""
-    s = get_session()
-    try:
-        categories = s.query(PricingCategory).options(joinedload(PricingCategory.items)).order_by(PricingCategory.order, PricingCategory.id).all()
-        result = []
-        for cat in categories:
-            result.append({
-                "id": cat.id,
-                "name": cat.name,
-                "description": cat.description,
-                "category_type": cat.category_type,
-                "order": cat.order,
-                "items": sorted([{
-                    "id": item.id,
-                    "name": item.name,
-                    "price_label": item.price_label,
-                    "price_value": item.price_value,
-                    "description": item.description,
-                    "featured": item.featured,
-                    "order": item.order,
-                } for item in cat.items], key=lambda x: (x["order"], x["id"])),
-            })
-        return jsonify(result)
-    finally:
-        s.close()
-
-
-@app.route("/api/food")
-def get_food():
-    """Get all food items"""
-    s = get_session()
-    try:
-        food = s.query(FoodItem).order_by(FoodItem.order, FoodItem.id).all()
-        return jsonify([{
-            "id": f.id,
-            "name": f.name,
-            "description": f.description,
-            "price": f.price,
-            "featured": f.featured,
-            "order": f.order,
-        } for f in food])
-    finally:
-        s.close()
-
-
-@app.route("/api/videos")
-def get_videos():
-    """Get all videos"""
-    s = get_session()
-    try:
-        videos = s.query(Video).order_by(Video.order, Video.id).all()
-        return jsonify([{
-            "id": v.id,
-            "url": v.url,
-            "caption": v.caption,
-            "section": v.section,
-            "order": v.order,
-        } for v in videos])
-    finally:
-        s.close()
-
-
-@app.route("/api/reviews")
-def get_reviews():
-    """Get all reviews"""
-    s = get_session()
-    try:
-        reviews = s.query(Review).order_by(Review.order, Review.id).all()
-        result = []
-        for r in reviews:
-            # Only include reviews with valid data
-            if r.customer_name or r.quote:  # Ensure review has at least name or quote
-                result.append({
-                    "id": r.id,
-                    "customer_name": r.customer_name or "Guest",
-                    "image_url": r.image_url if r.image_url and r.image_url.strip() else None,
-                    "quote": r.quote or "",
-                    "rating": r.rating if r.rating else 5,
-                    "order": r.order or 0,
-                })
-        return jsonify(result)
-    finally:
-        s.close()
-
-
-@app.route("/api/settings")
-def get_settings():
-    """Get all site settings"""
-    s = get_session()
-    try:
-        settings = s.query(SiteSettings).all()
-        result = {}
-        for setting in settings:
-            result[setting.key] = setting.value
-        return jsonify(result)
-    finally:
-        s.close()
 
+# ============================================================================
+# PUBLIC API ROUTES - list endpoints are generated from the resources declared
+# in queries.py (see routes/api_routes.py); the combined homepage lives here
+# ============================================================================
 
-@app.route("/api/restaurant-menu")
-def get_restaurant_menu():
-    """Get all restaurant menu categories with items - optimized"""
-    s = get_session()
-    try:
-        categories = s.query(RestaurantMenuCategory).options(joinedload(RestaurantMenuCategory.items)).order_by(RestaurantMenuCategory.order, RestaurantMenuCategory.id).all()
-        result = []
-        for cat in categories:
-            result.append({
-                "id": cat.id,
-                "name": cat.name,
-                "subtitle": cat.subtitle or "",
-                "image_url": cat.image_url or "",
-                "icon_key": cat.icon_key or "",
-                "order": cat.order,
-                "items": sorted([{
-                    "id": item.id,
-                    "name": item.name,
-                    "price": item.price,
-                    "order": item.order,
-                } for item in cat.items], key=lambda x: (x["order"], x["id"])),
-            })
-        return jsonify(result)
-    finally:
-        s.close()
+@app.route("/api/homepage-data")
+@cached_response(*queries.HOMEPAGE_MODELS)
+def get_homepage_data():
+    """Combined endpoint for homepage data - faster loading"""
+    if HOMEPAGE_READ_MODEL:
+        body = homepage_document.read(app, engine)
+        if body is not None:
+            return Response(body, mimetype="application/json")
+    if HOMEPAGE_FETCH != "parallel":
+        return jsonify(read_with_retry(engine, queries.homepage_data))
+    data, failed = queries.homepage_data_parallel(engine)
+    response = jsonify(data)
+    if failed:
+        # Partial document: serve it, but keep it out of every cache
+        response.headers["Cache-Control"] = "no-store"
+        response.headers["X-Degraded-Sections"] = ",".join(failed)
+    return response
 
 
-@app.route("/api/gallery-images")
-def get_gallery_images():
-    """Get all gallery images"""
-    s = get_session()
-    try:
-        # Check if table exists, if not return empty array
-        try:
-            images = s.query(GalleryImage).order_by(GalleryImage.order, GalleryImage.id).all()
-            return jsonify([{
-                "id": img.id,
-                "image_url": img.image_url,
-                "caption": img.caption,
-                "section": img.section,
-                "order": img.order,
-            } for img in images])
-        except Exception as e:
-            # Table might not exist yet, return empty array
-            print(f"⚠️ Gallery images table might not exist: {e}")
-            return jsonify([])
-    finally:
-        s.close()
+if HOMEPAGE_READ_MODEL:
+    homepage_document.install(app, engine)
 
+# Broadcast content-version bumps to the other workers (INVALIDATION_BUS=postgres|local)
+invalidation_bus.install(engine, all_tables=Base.metadata.tables.keys())
 
-@app.route("/api/homepage-data")
-def get_homepage_data():
-    """Combined endpoint for homepage data - faster loading"""
-    s = get_session()
-    try:
-        hero_slides = s.query(HeroSlide).filter_by(active=True).order_by(HeroSlide.order, HeroSlide.id).limit(20).all()
-        rooms = s.query(Room).options(joinedload(Room.images)).order_by(Room.order, Room.id).all()
-        facilities = s.query(Facility).order_by(Facility.order, Facility.id).all()
-        reviews = s.query(Review).order_by(Review.order, Review.id).all()
-        settings = s.query(SiteSettings).all()
-        settings_dict = {s.key: s.value for s in settings}
-        valid_room_images = lambda room: sorted(
-            [{"id": img.id, "image_url": img.image_url, "caption": img.caption or "", "order": img.order or 0}
-             for img in room.images if img.image_url and img.image_url.strip()],
-            key=lambda x: (x["order"], x["id"])
-        )
-        return jsonify({
-            "hero_slides": [{
-                "id": slide.id,
-                "image_url": slide.image_url,
-                "title": slide.title,
-                "subtitle": slide.subtitle,
-                "order": slide.order,
-            } for slide in hero_slides],
-            "rooms": [{
-                "id": room.id,
-                "name": room.name,
-                "slug": room.slug,
-                "description": room.description or "",
-                "capacity": room.capacity or "",
-                "features": room.features or [],
-                "images": valid_room_images(room),
-            } for room in rooms],
-            "facilities": [{
-                "id": f.id,
-                "name": f.name,
-                "description": f.description,
-                "image_url": f.image_url,
-                "order": f.order,
-            } for f in facilities],
-            "reviews": [{
-                "id": r.id,
-                "customer_name": r.customer_name or "Guest",
-                "image_url": r.image_url if r.image_url and r.image_url.strip() else None,
-                "quote": r.quote or "Great experience at Kalongo Farm!",
-                "rating": r.rating if r.rating else 5,
-                "order": r.order or 0,
-            } for r in reviews],
-            "settings": settings_dict,
-        })
-    finally:
-        s.close()
+if shared_snapshot.ENABLED:
+    # One mmap'd file of every public payload, shared by the workers on this machine
+    import export_snapshot
+    shared_snapshot.install(lambda: export_snapshot.render(app))
 
 
 if __name__ == "__main__":
+    warmup.warm_up(app, engine, steps=("mappers",))  # the dev server has no gunicorn hooks to warm it up
     app.run(host="127.0.0.1", debug=os.getenv("FLASK_ENV") == "development", port=5001)
@@ -0,0 +1,3 @@
+"""
+Performance benchmarks for the Kalongo Farm backend - run each module as a script from backend/
+"""
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Synthetic data generator: the site's seed set, multiplied by a scale factor.
+
+The base is what a fresh deployment holds after `python init_db.py` and
+`python migrate_frontend_data.py`, produced by running their own seed functions
+against DATABASE_URL. The seed set has no gallery images or activities, so the
+base gets one of each per facility. The growing tables are then copied scale
+times over: rooms (with their images), gallery images, restaurant menu items
+(within their categories) and reviews. Hero slides, facilities, pricing, food,
+videos and settings keep their seed size, as on the real site.
+
+The database must be empty (no rooms); --reset drops and recreates every table
+first. Run benchmarks/routes.py to measure the routes against it.
+
+Usage (from backend/):  DATABASE_URL=postgresql://localhost/kalongo_bench python benchmarks/datagen.py --scale 100 [--reset]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, insert, select
+from database import Base, get_engine
+from models import Activity, Facility, GalleryImage, RestaurantMenuItem, Review, Room, RoomImage
+
+ADMIN_USERNAME, ADMIN_PASSWORD = "bench", "bench-password"
+BATCH = 1000  # rows per INSERT
+
+
+def seed_base():
+    """Run init_db.py's and migrate_frontend_data.py's seeds (their output is swallowed)"""
+    os.environ["ADMIN_USERNAME"], os.environ["ADMIN_PASSWORD"] = ADMIN_USERNAME, ADMIN_PASSWORD
+    with contextlib.redirect_stdout(io.StringIO()):
+        import init_db
+        import migrate_frontend_data as migrate
+
+        init_db.create_tables()
+        init_db.seed_admin()
+        init_db.seed_site_settings()
+        init_db.seed_rooms()
+        # Before init_db's placeholders, which would make it skip the real room photos
+        for step in (migrate.migrate_hero_slides, migrate.migrate_room_images, migrate.migrate_facilities,
+                     migrate.migrate_pricing, migrate.migrate_food, migrate.migrate_reviews,
+                     migrate.migrate_restaurant_menu, migrate.migrate_videos, migrate.migrate_site_settings):
+            step()
+        init_db.seed_reviews()
+        init_db.seed_room_images()
+        migrate.s.close()
+
+
+def _columns(model):
+    return [c for c in model.__table__.columns if c.name != "id"]
+
+
+def _rows(conn, model, *order_by):
+    columns = _columns(model)
+    return [dict(row._mapping) for row in conn.execute(select(*columns).order_by(*order_by))]
+
+
+def _insert(conn, model, rows):
+    for start in range(0, len(rows), BATCH):
+        conn.execute(insert(model), rows[start:start + BATCH])
+
+
+def _span(rows):
+    """Offset between copies, so copy k sorts after copy k - 1"""
+    return max((row["order"] or 0 for row in rows), default=0) + 1
+
+
+def add_missing_base(conn):
+    """Gallery images and activities, absent from the seed set: one per facility"""
+    facilities = _rows(conn, Facility, Facility.order, Facility.id)
+    if not conn.scalar(select(func.count()).select_from(GalleryImage)):
+        _insert(conn, GalleryImage, [{"image_url": f["image_url"], "caption": f["name"], "section": "gallery",
+                                      "order": f["order"]} for f in facilities])
+    if not conn.scalar(select(func.count()).select_from(Activity)):
+        _insert(conn, Activity, [{"name": f["name"], "description": f["description"], "image_url": f["image_url"],
+                                  "order": f["order"]} for f in facilities])
+
+
+def multiply(conn, scale):
+    """Copy the growing tables until each holds scale times its base"""
+    rooms = conn.execute(select(Room.id, *_columns(Room)).order_by(Room.order, Room.id)).mappings().all()
+    images = {}
+    for image in _rows(conn, RoomImage, RoomImage.order, RoomImage.id):
+        images.setdefault(image["room_id"], []).append(image)
+    span = _span(rooms)
+    for k in range(1, scale):
+        copies = [{**{c.name: room[c.name] for c in _columns(Room)}, "name": f"{room['name']} {k}",
+                   "slug": f"{room['slug']}-{k}", "order": (room["order"] or 0) + k * span} for room in rooms]
+        ids = conn.execute(insert(Room).returning(Room.id, sort_by_parameter_order=True), copies).scalars().all()
+        _insert(conn, RoomImage, [{**image, "room_id": new_id}
+                                  for room, new_id in zip(rooms, ids) for image in images.get(room["id"], [])])
+
+    for model in (GalleryImage, RestaurantMenuItem, Review):
+        base = _rows(conn, model, model.order, model.id)
+        span = _span(base)
+        _insert(conn, model, [{**row, "order": (row["order"] or 0) + k * span}
+                              for k in range(1, scale) for row in base])
+
+
+def generate(scale, reset=False):
+    """Fill DATABASE_URL's database; {table: rows} afterwards"""
+    engine = get_engine()
+    if reset:
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        if conn.scalar(select(func.count()).select_from(Room)):
+            sys.exit(f"❌ {engine.url.render_as_string(hide_password=True)} already has rooms - "
+                     "use an empty database or --reset")
+    seed_base()
+    with engine.begin() as conn:
+        add_missing_base(conn)
+        multiply(conn, scale)
+    with engine.connect() as conn:
+        return {table.name: conn.scalar(select(func.count()).select_from(table))
+                for table in Base.metadata.sorted_tables}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=10, help="copies of the growing tables (10 to 1000)")
+    parser.add_argument("--reset", action="store_true", help="drop every table first")
+    args = parser.parse_args()
+    if not os.getenv("DATABASE_URL"):
+        sys.exit("❌ Set DATABASE_URL to the database to fill")
+    counts = generate(args.scale, args.reset)
+    print(f"✅ Scale {args.scale}: " + ", ".join(f"{name} {count}" for name, count in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
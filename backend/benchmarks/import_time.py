@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold-start cost of `import app`, from `python -X importtime`, with a budget.
+
+Runs a fresh interpreter per round without DATABASE_URL (the app must start without
+one), reports the median cumulative import time of app.py and the heaviest imports,
+and exits 1 when the median is over budget or when a module that should load on
+first use (admin panel, Cloudinary, Flask-Login, the database driver) was imported.
+
+Usage (from backend/):  python benchmarks/import_time.py [--rounds 7] [--budget-ms 1000] [--top 15]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ~750 ms measured on the dev machine with the admin panel and engine lazy (~850 ms before);
+# most of what is left is Flask and SQLAlchemy themselves. Headroom for slower CI machines.
+BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "1000"))
+
+# Must not be imported by `import app`; see routes/admin_app.py and database.get_engine()
+LAZY_MODULES = ("routes.admin_routes", "flask_login", "cloudinary", "psycopg2", "psycopg")
+
+
+def import_times(module="app"):
+    """{module: (self µs, cumulative µs)} for one cold `import module`"""
+    # Empty rather than unset, so load_dotenv() does not pick one up from backend/.env either
+    env = dict(os.environ, DATABASE_URL="")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"❌ import {module} failed:\n{result.stderr[-2000:]}")
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS, help="fail above this median (IMPORT_BUDGET_MS)")
+    parser.add_argument("--top", type=int, default=15, help="how many of the heaviest imports to list")
+    args = parser.parse_args()
+
+    rounds = [import_times() for _ in range(args.rounds)]
+    totals = [times["app"][1] / 1000 for times in rounds]
+    median = statistics.median(totals)
+    last = rounds[-1]
+
+    print(f"import app: median {median:.0f} ms over {args.rounds} rounds (min {min(totals):.0f}, max {max(totals):.0f})")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    heaviest = sorted(last.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (self_us, cumulative_us) in heaviest[:args.top]:
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {name}")
+
+    failed = False
+    eager = [name for name in LAZY_MODULES if name in last]
+    if eager:
+        print(f"❌ Imported at startup, should load on first use: {', '.join(eager)}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"❌ Over budget: {median:.0f} ms > {args.budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print(f"✅ Within budget ({args.budget_ms:.0f} ms)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: jsonify cost per public endpoint, Flask's stock provider vs FastJSONProvider.
+
+Usage (from backend/):  python benchmarks/json_provider.py [--rounds 2000]
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from utils import json_provider
+from utils.json_provider import FastJSONProvider
+
+IMG = "https://res.cloudinary.com/dae3rpnmg/image/upload/v1769247203/swimming-pool_hk8isg.jpg"
+
+
+def _rooms(n=4, images=6):
+    return [{
+        "id": i,
+        "name": f"Room {i}",
+        "slug": f"room-{i}",
+        "description": "Comfortable room surrounded by nature with a private terrace " * 3,
+        "capacity": "2 adults",
+        "features": ["Comfortable beds", "Private bathroom", "Farm view", "Wi-Fi", "Mosquito nets"],
+        "images": [{"id": i * 100 + j, "image_url": IMG, "caption": "", "order": j} for j in range(images)],
+    } for i in range(n)]
+
+
+def _flat(n, **fields):
+    return [dict(id=i, order=i, **fields) for i in range(n)]
+
+
+def build_payloads():
+    """Synthetic payloads shaped like each endpoint, sized like the seeded site"""
+    facilities = _flat(6, name="Swimming Pool", description="Relax and cool off in our pool", image_url=IMG)
+    reviews = _flat(8, customer_name="Guest", image_url=IMG, quote="Great experience at Kalongo Farm!", rating=5)
+    hero = _flat(5, image_url=IMG, title="Welcome to Kalongo Farm", subtitle="Eco lodge in the Southern Highlands")
+    settings = {k: "value" for k in ("phone", "whatsapp", "email", "address", "instagram", "facebook", "logo_url", "about_text")}
+    return {
+        "/api/rooms": _rooms(),
+        "/api/facilities": facilities,
+        "/api/reviews": reviews,
+        "/api/gallery-images": _flat(120, image_url=IMG, caption="Farm life", section="gallery"),
+        "/api/pricing": [dict(id=c, name="Accommodation (Bed & Breakfast)", description="Rooms with breakfast",
+                              category_type="accommodation", order=c,
+                              items=_flat(9, name="A-Cabin", price_label="Couple", price_value="TZS 180,000",
+                                          description=None, featured=False)) for c in range(3)],
+        "/api/restaurant-menu": [dict(id=c, name="Main Course", subtitle="Hearty meals", image_url=IMG, icon_key="main",
+                                      order=c, items=_flat(200, name="Beef burger", price="TZS 15,000"))
+                                 for c in range(14)],
+        "/api/homepage-data": {"hero_slides": hero, "rooms": _rooms(), "facilities": facilities,
+                               "reviews": reviews, "settings": settings},
+        "datetime columns (admin)": _flat(50, name="Item", created_at=datetime.utcnow(), updated_at=datetime.utcnow()),
+    }
+
+
+def time_provider(app, provider, payload, rounds):
+    app.json = provider
+    with app.app_context():
+        best = min(timeit.repeat(lambda: app.json.response(payload).get_data(), number=rounds, repeat=5))
+    return best / rounds * 1e6  # µs per response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    stock = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+    orjson_module = json_provider.orjson
+
+    print(f"orjson installed: {'yes' if orjson_module else 'no'}")
+    print(f"{'endpoint':28} {'stock µs':>10} {'stdlib µs':>10} {'fast µs':>10} {'saved':>8}")
+    for name, payload in build_payloads().items():
+        stock_us = time_provider(app, stock, payload, args.rounds)
+        json_provider.orjson = None
+        stdlib_us = time_provider(app, fast, payload, args.rounds)
+        json_provider.orjson = orjson_module
+        fast_us = time_provider(app, fast, payload, args.rounds)
+        saved = (1 - fast_us / stock_us) * 100 if stock_us else 0
+        print(f"{name:28} {stock_us:10.1f} {stdlib_us:10.1f} {fast_us:10.1f} {saved:7.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Query budgets: drive every GET route of app.py and the admin panel against a seeded
+throwaway SQLite database and count the SQL statements each one runs.
+
+A route fails when it runs more statements than its budget (BUDGETS, else
+DEFAULT_BUDGET), or when one statement template repeats more than --max-repeats
+times in a single request - the shape of an N+1 (a missed joinedload behind a
+template loop over room.images or cat.items). Response caches and read models are
+off, so every request reaches the database. Exits 1 on any failure.
+
+Usage (from backend/):  python benchmarks/query_budget.py [--scale 3] [--max-repeats 3] [--route /admin/rooms]
+"""
+import argparse
+import contextvars
+import os
+import re
+import sys
+import tempfile
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_db_path = os.path.join(tempfile.mkdtemp(prefix="kalongo-budget-"), "budget.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_path}"
+# Every request must reach the database
+for _flag in ("RESPONSE_CACHE", "HOMEPAGE_READ_MODEL", "SHARED_SNAPSHOT", "INVALIDATION_BUS"):
+    os.environ[_flag] = "off"
+os.environ["JSON_DOCUMENT_ENGINE"] = "python"
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from database import Base, SessionLocal, get_engine
+from models import Admin, Activity, FoodItem, HeroSlide, SiteSettings, Video
+from benchmarks.read_queries import seed, IMG
+
+ADMIN_USERNAME, ADMIN_PASSWORD = "budget", "budget-password"
+
+# Statements per request. Admin pages include the Flask-Login user lookup.
+DEFAULT_BUDGET = 4
+BUDGETS = {
+    "/api/homepage-data": 6,  # one per section
+    "/api/batch": 4,  # rooms + pricing, one by one on SQLite (a single statement on Postgres)
+    "/admin/": 10,  # nine counts
+    "/admin/dashboard": 10,
+}
+# Routes the harness cannot drive meaningfully here
+SKIP = {
+    "/admin/logout",  # ends the session the other admin routes need
+    "/api/db/test",  # Postgres-only SQL
+}
+QUERY_ARGS = {"/api/batch": "?resources=rooms,pricing"}
+
+_statements = contextvars.ContextVar("query_budget_statements", default=None)
+
+
+def _count(conn, cursor, statement, parameters, context, executemany):
+    statements = _statements.get()
+    if statements is not None:
+        statements.append(statement)
+
+
+def template(statement):
+    """Statement with whitespace and expanded IN lists collapsed, so repeats compare equal"""
+    statement = re.sub(r"\s+", " ", statement).strip()
+    return re.sub(r"\((?:\s*(?:\?|%s|%\(\w+\)s)\s*,?)+\)", "(?)", statement)
+
+
+def seed_all(scale):
+    with SessionLocal() as s:
+        seed(s, scale)
+        admin = Admin(username=ADMIN_USERNAME)
+        admin.set_password(ADMIN_PASSWORD)
+        s.add(admin)
+        s.add_all(HeroSlide(image_url=IMG, title=f"Slide {i}", order=i) for i in range(3 * scale))
+        s.add_all(Activity(name=f"Activity {i}", description="Guided walk", image_url=IMG, order=i)
+                  for i in range(4 * scale))
+        s.add_all(FoodItem(name=f"Food {i}", price="TZS 10,000", order=i) for i in range(4 * scale))
+        s.add_all(Video(url=f"https://example.com/v{i}.mp4", section="gallery", order=i) for i in range(4 * scale))
+        s.add_all(SiteSettings(key=key, value=value) for key, value in
+                  [("phone", "+255 000 000"), ("email", "info@example.com"), ("show_prices", "true")])
+        s.commit()
+
+
+def routes(flask_app, prefix=""):
+    """[(path, rule)] for every GET rule; URL parameters get id 1, which every seeded table has"""
+    found = []
+    for rule in flask_app.url_map.iter_rules():
+        if "GET" not in rule.methods or rule.endpoint == "static":
+            continue
+        path = prefix + rule.build({name: 1 for name in rule.arguments}, append_unknown=False)[1]
+        if (prefix + rule.rule) not in SKIP:
+            found.append((path, prefix + rule.rule))
+    return sorted(found)
+
+
+def run(client, path, rule, max_repeats):
+    statements = []
+    token = _statements.set(statements)
+    try:
+        response = client.get(path + QUERY_ARGS.get(rule, ""))
+    finally:
+        _statements.reset(token)
+    budget = BUDGETS.get(rule, DEFAULT_BUDGET)
+    repeats = Counter(template(s) for s in statements).most_common(1)
+    problems = []
+    if len(statements) > budget:
+        problems.append(f"{len(statements)} statements > budget {budget}")
+    if repeats and repeats[0][1] > max_repeats:
+        problems.append(f"same statement {repeats[0][1]}x: {repeats[0][0][:160]}")
+    return response.status_code, len(statements), budget, problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=int, default=3, help="multiplier on the seeded row counts")
+    parser.add_argument("--max-repeats", type=int, default=3, help="most times one statement may run per request")
+    parser.add_argument("--route", action="append", help="only these rules (repeatable)")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(get_engine())
+    seed_all(args.scale)
+
+    from app import app
+    admin_app = app.extensions["kalongo_admin"].load()
+    event.listen(Engine, "before_cursor_execute", _count)
+
+    client = app.test_client()
+    login = client.post("/admin/login", data={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+    if login.status_code != 302 or "/login" in login.headers.get("Location", ""):
+        sys.exit("❌ Could not log in to the admin panel")
+
+    failed = 0
+    print(f"SQLite, scale {args.scale}, at most {args.max_repeats} repeats of one statement")
+    print(f"{'route':52} {'status':>6} {'queries':>7} {'budget':>6}")
+    for path, rule in routes(app) + routes(admin_app, prefix="/admin"):
+        if args.route and rule not in args.route:
+            continue
+        status, count, budget, problems = run(client, path, rule, args.max_repeats)
+        mark = "❌" if problems else "  "
+        print(f"{mark}{rule:50} {status:>6} {count:>7} {budget:>6}")
+        for problem in problems:
+            print(f"      {problem}")
+        failed += bool(problems)
+    if failed:
+        print(f"❌ {failed} route(s) over their query budget")
+        sys.exit(1)
+    print("✅ Every route within its query budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ORM entity loading vs the Core column-projected read path in queries.py.
+
+Seeds a throwaway SQLite database and reports, per endpoint, time per call and the
+peak memory allocated while building one payload.
+
+Usage (from backend/):  python benchmarks/read_queries.py [--scale 10] [--rounds 200]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_db_path = os.path.join(tempfile.mkdtemp(prefix="kalongo-bench-"), "bench.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_path}")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, joinedload
+from database import Base
+from models import (
+    Room, RoomImage, Facility, PricingCategory, PricingItem, Review, GalleryImage,
+    RestaurantMenuCategory, RestaurantMenuItem,
+)
+import queries
+
+IMG = "https://res.cloudinary.com/dae3rpnmg/image/upload/v1769247203/swimming-pool_hk8isg.jpg"
+
+
+def seed(session, scale):
+    for i in range(4 * scale):
+        room = Room(name=f"Room {i}", slug=f"room-{i}", description="Cosy farm room", capacity="2 adults",
+                    features=["Comfortable beds", "Private bathroom", "Farm view"], order=i)
+        room.images = [RoomImage(image_url=IMG if j % 5 else " ", caption=None, order=j) for j in range(6)]
+        session.add(room)
+    session.add_all(Facility(name=f"Facility {i}", description="Relax and unwind", image_url=IMG, order=i)
+                    for i in range(6 * scale))
+    session.add_all(Review(customer_name=None if i % 3 else "Ann", quote="Lovely stay", image_url=IMG, rating=5, order=i)
+                    for i in range(8 * scale))
+    session.add_all(GalleryImage(image_url=IMG, caption="Farm life", section="gallery", order=i % 7)
+                    for i in range(30 * scale))
+    for c in range(3):
+        cat = PricingCategory(name=f"Category {c}", description="Rooms with breakfast", category_type="accommodation", order=c)
+        cat.items = [PricingItem(name="A-Cabin", price_label="Couple", price_value="TZS 180,000", order=j)
+                     for j in range(3 * scale)]
+        session.add(cat)
+    for c in range(14):
+        cat = RestaurantMenuCategory(name=f"Menu {c}", subtitle="Hearty meals", order=c)
+        cat.items = [RestaurantMenuItem(name="Beef burger", price="TZS 15,000", order=j) for j in range(5 * scale)]
+        session.add(cat)
+    session.commit()
+
+
+# ---------- The ORM serializers app.py used before queries.py ----------
+
+
+def orm_facilities(s):
+    return [{"id": f.id, "name": f.name, "description": f.description, "image_url": f.image_url, "order": f.order}
+            for f in s.query(Facility).order_by(Facility.order, Facility.id).all()]
+
+
+def orm_reviews(s):
+    result = []
+    for r in s.query(Review).order_by(Review.order, Review.id).all():
+        if r.customer_name or r.quote:
+            result.append({
+                "id": r.id,
+                "customer_name": r.customer_name or "Guest",
+                "image_url": r.image_url if r.image_url and r.image_url.strip() else None,
+                "quote": r.quote or "",
+                "rating": r.rating if r.rating else 5,
+                "order": r.order or 0,
+            })
+    return result
+
+
+def orm_gallery_images(s):
+    return [{"id": i.id, "image_url": i.image_url, "caption": i.caption, "section": i.section, "order": i.order}
+            for i in s.query(GalleryImage).order_by(GalleryImage.order, GalleryImage.id).all()]
+
+
+def orm_rooms(s):
+    result = []
+    for room in s.query(Room).options(joinedload(Room.images)).order_by(Room.order, Room.id).all():
+        images = [{"id": img.id, "image_url": img.image_url, "caption": img.caption or "", "order": img.order or 0}
+                  for img in room.images if img.image_url and img.image_url.strip()]
+        result.append({
+            "id": room.id, "name": room.name, "slug": room.slug, "description": room.description or "",
+            "capacity": room.capacity or "", "features": room.features or [],
+            "images": sorted(images, key=lambda x: (x["order"], x["id"])),
+        })
+    return result
+
+
+def orm_pricing(s):
+    categories = s.query(PricingCategory).options(joinedload(PricingCategory.items)).order_by(
+        PricingCategory.order, PricingCategory.id).all()
+    return [{
+        "id": c.id, "name": c.name, "description": c.description, "category_type": c.category_type, "order": c.order,
+        "items": sorted([{"id": i.id, "name": i.name, "price_label": i.price_label, "price_value": i.price_value,
+                          "description": i.description, "featured": i.featured, "order": i.order}
+                         for i in c.items], key=lambda x: (x["order"], x["id"])),
+    } for c in categories]
+
+
+def orm_restaurant_menu(s):
+    categories = s.query(RestaurantMenuCategory).options(joinedload(RestaurantMenuCategory.items)).order_by(
+        RestaurantMenuCategory.order, RestaurantMenuCategory.id).all()
+    return [{
+        "id": c.id, "name": c.name, "subtitle": c.subtitle or "", "image_url": c.image_url or "",
+        "icon_key": c.icon_key or "", "order": c.order,
+        "items": sorted([{"id": i.id, "name": i.name, "price": i.price, "order": i.order} for i in c.items],
+                        key=lambda x: (x["order"], x["id"])),
+    } for c in categories]
+
+
+CASES = [
+    ("/api/facilities", orm_facilities, queries.facilities),
+    ("/api/reviews", orm_reviews, queries.reviews),
+    ("/api/gallery-images", orm_gallery_images, queries.gallery_images),
+    ("/api/rooms", orm_rooms, queries.rooms),
+    ("/api/pricing", orm_pricing, queries.pricing),
+    ("/api/restaurant-menu", orm_restaurant_menu, queries.restaurant_menu),
+]
+
+
+def measure(call, rounds):
+    """(µs per call, peak KiB allocated during one call)"""
+    call()  # warm statement caches
+    start = time.perf_counter()
+    for _ in range(rounds):
+        call()
+    elapsed = (time.perf_counter() - start) / rounds * 1e6
+    tracemalloc.start()
+    call()
+    peak = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=int, default=10, help="multiplier on the seeded row counts")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{_db_path}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as s:
+        seed(s, args.scale)
+
+    print(f"SQLite, scale {args.scale}, {args.rounds} rounds")
+    print(f"{'endpoint':22} {'orm µs':>9} {'core µs':>9} {'orm KiB':>9} {'core KiB':>9}")
+    for name, orm_fn, core_fn in CASES:
+        def orm_call():
+            with Session() as s:
+                return orm_fn(s)
+
+        def core_call():
+            with engine.connect() as conn:
+                return core_fn(conn)
+
+        assert orm_call() == core_call(), f"{name}: ORM and Core payloads differ"
+        orm_us, orm_kib = measure(orm_call, args.rounds)
+        core_us, core_kib = measure(core_call, args.rounds)
+        print(f"{name:22} {orm_us:9.0f} {core_us:9.0f} {orm_kib:9.0f} {core_kib:9.0f}")
+
+
+if __name__ == "__main__":
+    main()
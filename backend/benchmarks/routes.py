@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Route benchmark: every GET route of app.py and the admin panel, on generated data.
+
+For each backend and scale, a child process fills a database with datagen.py and
+drives each route through the Flask test client (in process, one client, no
+network): a few warm-up requests, then --requests timed ones. It records p50, p95
+and p99 latency, mean, throughput (requests per second over the timed loop), and
+the peak and retained memory of one request traced by tracemalloc. Response caches
+stay as configured; --cold turns them off so every request reaches the database.
+
+SQLite runs on a temporary file. Postgres needs --postgres-url (or
+BENCH_POSTGRES_URL) naming a throwaway database, plus --reset: its tables are
+dropped and recreated for every scale.
+
+Results go to benchmarks/results/<commit>.json (--output). Compare two of them
+with --compare; it exits 1 when a route's p95 grew by more than --threshold.
+
+Usage (from backend/):  python benchmarks/routes.py [--scale 10 100 1000] [--backend sqlite|postgres|all] [--requests 200] [--cold]
+                        python benchmarks/routes.py --compare results/abc1234.json results/def5678.json [--threshold 0.2]
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+WARMUP = 3
+MIN_DELTA_MS = 0.2  # --compare ignores p95 changes smaller than this (timer noise)
+CACHE_FLAGS = ("RESPONSE_CACHE", "HOMEPAGE_READ_MODEL", "SHARED_SNAPSHOT", "INVALIDATION_BUS")
+# Routes the harness cannot drive meaningfully here
+SKIP = {
+    "/admin/logout",  # ends the session the other admin routes need
+    "/api/db/test",  # Postgres-only SQL
+}
+QUERY_ARGS = {"/api/batch": "?resources=rooms,pricing"}
+
+
+# ---------- Child: one backend, one scale ----------
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an ascending list"""
+    return sorted_values[max(math.ceil(p / 100 * len(sorted_values)) - 1, 0)]
+
+
+def routes(flask_app, prefix=""):
+    """[(path, rule)] for every GET rule; URL parameters get id 1, which every generated table has"""
+    found = []
+    for rule in flask_app.url_map.iter_rules():
+        if "GET" not in rule.methods or rule.endpoint == "static" or (prefix + rule.rule) in SKIP:
+            continue
+        found.append((prefix + rule.build({name: 1 for name in rule.arguments}, append_unknown=False)[1],
+                      prefix + rule.rule))
+    return sorted(found)
+
+
+def measure(client, url, requests):
+    for _ in range(WARMUP):
+        status = client.get(url).status_code
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        t = time.perf_counter()
+        client.get(url)
+        latencies.append((time.perf_counter() - t) * 1000)
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    client.get(url)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    latencies.sort()
+    return {
+        "status": status,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(sum(latencies) / requests, 3),
+        "rps": round(requests / elapsed, 1),
+        "peak_kib": round(peak / 1024, 1),
+        "retained_kib": round(retained / 1024, 1),
+    }
+
+
+def run_child(args):
+    """Generate data at args.scale in args.run's database, measure every route, write args.child_output"""
+    os.environ["DATABASE_URL"] = args.run
+    if args.cold:
+        for flag in CACHE_FLAGS:
+            os.environ[flag] = "off"
+    from benchmarks.datagen import ADMIN_PASSWORD, ADMIN_USERNAME, generate
+
+    rows = generate(args.scale, reset=True)
+    from app import app
+    admin_app = app.extensions["kalongo_admin"].load()
+    client = app.test_client()
+    login = client.post("/admin/login", data={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+    if login.status_code != 302 or "/login" in login.headers.get("Location", ""):
+        sys.exit("❌ Could not log in to the admin panel")
+
+    results = {}
+    print(f"{args.backend}, scale {args.scale}, {args.requests} requests per route" + (", caches off" if args.cold else ""))
+    print(f"{'route':50} {'status':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'peak KiB':>9}")
+    for path, rule in routes(app) + routes(admin_app, prefix="/admin"):
+        r = results[rule] = measure(client, path + QUERY_ARGS.get(rule, ""), args.requests)
+        print(f"{rule:50} {r['status']:>6} {r['p50_ms']:8.2f} {r['p95_ms']:8.2f} {r['p99_ms']:8.2f} "
+              f"{r['rps']:8.0f} {r['peak_kib']:9.0f}")
+    with open(args.child_output, "w") as f:
+        json.dump({"backend": args.backend, "scale": args.scale, "rows": rows, "routes": results}, f)
+
+
+# ---------- Parent: every backend and scale, one results file ----------
+
+
+def git_commit():
+    """Short HEAD hash, with -dirty when the tree has uncommitted changes"""
+    def git(*argv):
+        return subprocess.run(["git", *argv], cwd=BACKEND_DIR, capture_output=True, text=True).stdout.strip()
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    return commit + ("-dirty" if git("status", "--porcelain", "--untracked-files=no") else "")
+
+
+def run_all(args):
+    postgres_url = args.postgres_url or os.getenv("BENCH_POSTGRES_URL")
+    backends = ["sqlite", "postgres"] if args.backend == "all" else [args.backend]
+    if "postgres" in backends and not (postgres_url and args.reset):
+        sys.exit("❌ Postgres needs --postgres-url (or BENCH_POSTGRES_URL) of a throwaway database, and --reset")
+
+    import sqlalchemy
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "platform": platform.platform(),
+        "requests": args.requests,
+        "cold": args.cold,
+        "runs": [],
+    }
+    workdir = tempfile.mkdtemp(prefix="kalongo-routes-")
+    for backend in backends:
+        for scale in args.scale:
+            url = f"sqlite:///{os.path.join(workdir, f'{scale}.db')}" if backend == "sqlite" else postgres_url
+            child_output = os.path.join(workdir, f"{backend}-{scale}.json")
+            argv = [sys.executable, os.path.abspath(__file__), "--run", url, "--backend", backend,
+                    "--scale", str(scale), "--requests", str(args.requests), "--child-output", child_output]
+            if args.cold:
+                argv.append("--cold")
+            # A process per run: the engine, caches and read models belong to the process
+            if subprocess.run(argv, cwd=BACKEND_DIR).returncode != 0:
+                sys.exit(f"❌ {backend} at scale {scale} failed")
+            with open(child_output) as f:
+                report["runs"].append(json.load(f))
+            print()
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {output}")
+
+
+# ---------- Comparing two results files ----------
+
+
+def compare(base_path, new_path, threshold):
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    base_runs = {(run["backend"], run["scale"]): run["routes"] for run in base["runs"]}
+    regressions = 0
+    if base["cold"] != new["cold"] or base["platform"] != new["platform"]:
+        print("⚠️ The two files differ in --cold or platform; their numbers are not comparable")
+    print(f"p95 latency, {base['commit']} -> {new['commit']} (regression: > +{threshold:.0%} and > +{MIN_DELTA_MS} ms)")
+    for run in new["runs"]:
+        old_routes = base_runs.get((run["backend"], run["scale"]))
+        if old_routes is None:
+            continue
+        print(f"\n{run['backend']}, scale {run['scale']}")
+        print(f"{'route':50} {'before':>8} {'after':>8} {'change':>8}")
+        for rule, r in sorted(run["routes"].items()):
+            if rule not in old_routes:
+                continue
+            before, after = old_routes[rule]["p95_ms"], r["p95_ms"]
+            change = (after - before) / before if before else 0.0
+            regressed = change > threshold and after - before > MIN_DELTA_MS
+            regressions += regressed
+            print(f"{'❌' if regressed else '  '}{rule:48} {before:8.2f} {after:8.2f} {change:+8.0%}")
+    if regressions:
+        print(f"\n❌ {regressions} route(s) slower than {base['commit']}")
+        sys.exit(1)
+    print(f"\n✅ No route regressed against {base['commit']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, nargs="+", default=[10], help="datagen.py scale factors (10 to 1000)")
+    parser.add_argument("--backend", choices=("sqlite", "postgres", "all"), default="sqlite")
+    parser.add_argument("--postgres-url", help="throwaway Postgres database (default: BENCH_POSTGRES_URL)")
+    parser.add_argument("--reset", action="store_true", help="allow dropping the Postgres database's tables")
+    parser.add_argument("--requests", type=int, default=200, help="timed requests per route")
+    parser.add_argument("--cold", action="store_true", help="response caches and read models off")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="compare two results files")
+    parser.add_argument("--threshold", type=float, default=0.2, help="p95 growth counted as a regression")
+    parser.add_argument("--run", help=argparse.SUPPRESS)  # child: database URL
+    parser.add_argument("--child-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare, args.threshold)
+    elif args.run:
+        args.scale = args.scale[0]
+        run_child(args)
+    else:
+        run_all(args)
+
+
+if __name__ == "__main__":
+    main()
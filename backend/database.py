@@ -2,33 +2,155 @@
 Database configuration and connection setup
 """
 import os
+import threading
 from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
+from utils import db_pool
 
 load_dotenv()
 
 # Get database URL from environment
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL environment variable is not set")
-
-# Create SQLAlchemy engine with connection pooling
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,      # Verify connections before using
-    pool_recycle=300,        # Recycle connections after 5 minutes
-    pool_size=10,            # Number of connections to maintain
-    max_overflow=20,         # Max connections beyond pool_size
-    pool_timeout=30,         # Timeout for getting connection
-    echo=False,              # Set to True for SQL query logging
-    connect_args={"connect_timeout": 5}  # Connection timeout
-)
+_engine = None
+_engine_lock = threading.Lock()
+
+
+HOMEPAGE_SECTIONS = 5  # len(queries.HOMEPAGE_SECTIONS); queries imports this module
+
+
+def _on(name, default="off"):
+    return os.getenv(name, default).lower() in ("1", "true", "on")
+
+
+def background_connections():
+    """Connections this process's own threads may hold at once, besides requests.
+
+    The health probe always runs; pool liveness (POOL_LIVENESS=background), the
+    homepage read-model refresh (HOMEPAGE_READ_MODEL=on) and slow-query EXPLAIN
+    (SLOW_QUERY_MS with SLOW_QUERY_EXPLAIN) each add one thread.
+    """
+    count = 1
+    count += db_pool.LIVENESS == "background"
+    count += _on("HOMEPAGE_READ_MODEL")
+    count += float(os.getenv("SLOW_QUERY_MS", "0")) > 0 and _on("SLOW_QUERY_EXPLAIN", "on")
+    return count
+
+
+def homepage_workers(threads):
+    """Threads of the HOMEPAGE_FETCH=parallel section pool: one per section for each request thread"""
+    return int(os.getenv("HOMEPAGE_WORKERS") or 0) or threads * HOMEPAGE_SECTIONS
+
+
+def connection_demand():
+    """Connections one worker can have checked out at once: its request threads, the homepage
+    section pool when HOMEPAGE_FETCH=parallel, and its background threads"""
+    threads = int(os.getenv("GUNICORN_THREADS", "4"))
+    demand = threads + background_connections()
+    if os.getenv("HOMEPAGE_FETCH", "serial").lower() == "parallel":
+        demand += homepage_workers(threads)
+    return demand
+
+
+def pool_sizing(warn=True):
+    """(pool_size, max_overflow) for each process.
+
+    DB_POOL_SIZE / DB_MAX_OVERFLOW set them directly. Otherwise DB_MAX_CONNECTIONS -
+    the part of Postgres' max_connections this app may use, summed over every worker -
+    is split between WEB_CONCURRENCY workers: each keeps one connection per
+    GUNICORN_THREADS thread and background thread, and may overflow up to its share
+    (the homepage section pool lives in the overflow). Without any of them, 10 + 20
+    per process. Either way a pool smaller than connection_demand() is reported.
+    """
+    threads = int(os.getenv("GUNICORN_THREADS", "4"))
+    if os.getenv("DB_POOL_SIZE") or not os.getenv("DB_MAX_CONNECTIONS"):
+        pool_size, max_overflow = int(os.getenv("DB_POOL_SIZE", "10")), int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    else:
+        workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+        share = max(int(os.getenv("DB_MAX_CONNECTIONS")) // workers, 1)
+        pool_size = min(threads + background_connections(), share)
+        max_overflow = share - pool_size
+    demand = connection_demand()
+    if warn and pool_size + max_overflow < demand:
+        print(f"⚠️ The pool lends {pool_size + max_overflow} connection(s) per worker, which can need {demand} "
+              f"({threads} threads, homepage sections, background threads); requests will queue for a connection")
+    return pool_size, max_overflow
+
+
+def pool_capacity():
+    """Connections one process's pool can lend at once"""
+    return sum(pool_sizing(warn=False))
+
+
+def _engine_options(url):
+    pool_size, max_overflow = pool_sizing()
+    options = dict(
+        poolclass=db_pool.InstrumentedQueuePool,     # QueuePool + checkout/wait stats (/internal/pool-stats)
+        pool_pre_ping=db_pool.LIVENESS != "background",  # Verify connections before using
+        pool_recycle=300,        # Recycle connections after 5 minutes
+        pool_size=pool_size,     # Number of connections to maintain
+        max_overflow=max_overflow,  # Max connections beyond pool_size
+        pool_timeout=30,         # Timeout for getting connection
+        echo=False,              # Set to True for SQL query logging
+    )
+    if url.startswith("postgres"):
+        options["connect_args"] = {"connect_timeout": 5}  # Connection timeout
+    return options
+
+
+def get_engine():
+    """The SQLAlchemy engine, created on first use.
+
+    Importing this module neither needs DATABASE_URL nor loads the database driver,
+    so a process without one still starts (and reports the error when it queries).
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                if not DATABASE_URL:
+                    raise ValueError("DATABASE_URL environment variable is not set")
+                _engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
+                db_pool.install(_engine)
+    return _engine
+
+
+class LazyEngine:
+    """Stands in for the engine: every attribute is looked up on get_engine()"""
+
+    def __getattr__(self, name):
+        return getattr(get_engine(), name)
+
+    @property
+    def created(self):
+        """True once get_engine() has run (checking does not create it)"""
+        return _engine is not None
+
+    def __repr__(self):
+        return repr(_engine) if _engine is not None else "<LazyEngine (not created yet)>"
+
+
+# Create SQLAlchemy engine with connection pooling (on first use)
+engine = LazyEngine()
+
+
+class LazySessionmaker(sessionmaker):
+    """sessionmaker bound to the real engine when the first session is made.
+
+    Sessions key their connections by engine, so they must not be bound to the
+    LazyEngine stand-in (each lookup would miss and check out another connection).
+    """
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
 
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = LazySessionmaker(autocommit=False, autoflush=False)
 
 # Base class for models
 Base = declarative_base()
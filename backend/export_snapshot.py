@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Export every public API endpoint as a versioned static JSON file for CDN serving.
+
+Writes frontend/data/api/<endpoint>.<hash>.json plus frontend/data/manifest.json,
+which frontend/js/api.js falls back to when the live API fails or is slow.
+
+Run: python export_snapshot.py                 # every endpoint (unchanged files are kept)
+     python export_snapshot.py --tables rooms  # only endpoints that read these tables
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+SNAPSHOT_DIR = os.getenv(
+    "SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "frontend", "data"),
+)
+MANIFEST = "manifest.json"
+API_PREFIX = "/api"
+
+
+def public_endpoints(app):
+    """{path: tables} for every cached, argument-free GET route"""
+    endpoints = {}
+    for rule in app.url_map.iter_rules():
+        view = app.view_functions.get(rule.endpoint)
+        tables = getattr(view, "cache_tables", None)
+        if tables and not rule.arguments and "GET" in rule.methods:
+            endpoints[rule.rule] = tables
+    return endpoints
+
+
+def render(app, tables=None):
+    """{path: (tables, body, mimetype)} for every public endpoint answering 200.
+
+    With tables, only endpoints reading one of them are rendered.
+    """
+    wanted = set(tables) if tables else None
+    rendered = {}
+    client = app.test_client()
+    for path, endpoint_tables in sorted(public_endpoints(app).items()):
+        if wanted is not None and not wanted.intersection(endpoint_tables):
+            continue
+        response = client.get(path)
+        if response.status_code != 200:
+            print(f"  ⚠️  {path}: HTTP {response.status_code}, skipped (previous snapshot kept)")
+            continue
+        rendered[path] = (endpoint_tables, response.get_data(), response.mimetype)
+    return rendered
+
+
+def _load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"endpoints": {}}
+
+
+def _write_atomic(path, data):
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def export(app, tables=None, out_dir=None):
+    """Render endpoints into out_dir; returns the list of endpoints whose file changed.
+
+    With tables, only endpoints reading one of them are rendered. Bodies whose hash
+    matches the manifest are left alone, so repeated runs rewrite nothing.
+    """
+    out_dir = out_dir or SNAPSHOT_DIR
+    os.makedirs(os.path.join(out_dir, "api"), exist_ok=True)
+    manifest = _load_manifest(out_dir)
+    entries = manifest.setdefault("endpoints", {})
+    changed = []
+    for path, (endpoint_tables, body, _) in render(app, tables).items():
+        digest = hashlib.sha1(body).hexdigest()
+        key = path[len(API_PREFIX):] if path.startswith(API_PREFIX) else path
+        previous = entries.get(key)
+        if previous and previous.get("sha1") == digest:
+            continue
+        name = key.strip("/").replace("/", "-") or "index"
+        filename = f"api/{name}.{digest[:12]}.json"
+        _write_atomic(os.path.join(out_dir, filename), body)
+        if previous and previous.get("file") != filename:
+            try:
+                os.remove(os.path.join(out_dir, previous["file"]))
+            except OSError:
+                pass
+        entries[key] = {"file": filename, "sha1": digest, "bytes": len(body), "tables": list(endpoint_tables)}
+        changed.append(key)
+    if changed:
+        manifest["generated_at"] = int(time.time())
+        _write_atomic(os.path.join(out_dir, MANIFEST), json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+    return changed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export public API payloads as static JSON")
+    parser.add_argument("--tables", help="comma-separated table names; only endpoints reading them are exported")
+    parser.add_argument("--out", help=f"output directory (default {SNAPSHOT_DIR})")
+    args = parser.parse_args()
+
+    from app import app
+
+    tables = [t.strip() for t in args.tables.split(",") if t.strip()] if args.tables else None
+    print("Exporting public API snapshot...")
+    changed = export(app, tables=tables, out_dir=args.out)
+    print(f"  ✅ {len(changed)} endpoint(s) written" + (f": {', '.join(changed)}" if changed else " (all up to date)"))
+    print("Done.")
@@ -0,0 +1,80 @@
+"""
+gunicorn settings - run from backend/: gunicorn -c gunicorn.conf.py app:app
+
+With GUNICORN_PRELOAD=on (default) the master imports the app and warms it up
+(warmup.py: mappers, admin panel and templates, public caches) before forking, then freezes
+the garbage collector so workers share those pages instead of copying them when
+the collector walks them. Each worker drops the master's pooled connections, opens
+its own pool and starts its invalidation bus listener (and pool liveness thread)
+before it accepts requests. database.pool_sizing() sizes each worker's pool from
+workers, threads and DB_MAX_CONNECTIONS.
+"""
+import gc
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5001')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "on").lower() in ("1", "true", "on")
+accesslog = "-"
+
+if preload_app:
+    # No collections while the app loads: objects created now go straight to gc.freeze()
+    gc.disable()
+
+
+def on_starting(server):
+    """Master, before anything loads: forget the metrics files of the previous run"""
+    from utils import metrics
+    metrics.reset_directory()
+
+
+def when_ready(server):
+    """Master, app loaded (preload): warm up once for every worker"""
+    if not preload_app:
+        return
+    import warmup
+    from app import app
+    from database import engine
+    from utils import metrics
+
+    server.log.info("Warming up the preloaded app")
+    warmup.warm_up(app, engine, steps=("mappers", "admin", "caches"), ready=False)
+    if engine.created:
+        engine.dispose()  # connections opened for the warm-up must not be shared with workers
+    metrics.discard()  # the warm-up requests are not traffic
+
+
+def pre_fork(server, worker):
+    if preload_app:
+        # Move everything allocated so far to the permanent generation; the collector never
+        # touches it again, so its pages stay shared with the master
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if preload_app:
+        gc.enable()
+        from database import engine
+        if engine.created:
+            engine.dispose(close=False)  # forget pooled connections inherited from the master, without closing them
+
+
+def post_worker_init(worker):
+    """Worker, before it accepts requests"""
+    import warmup
+    from app import app, ADMIN_LOAD
+    from database import engine
+    from utils import db_pool, health, invalidation_bus
+
+    invalidation_bus.start()
+    db_pool.start_liveness(engine)  # POOL_LIVENESS=background
+    health.start(engine)  # /health/ready reads its result
+    if preload_app:
+        steps = ("pool",)
+    elif ADMIN_LOAD == "lazy":
+        steps = tuple(step for step in warmup.STEPS if step != "admin")  # first /admin request loads it
+    else:
+        steps = warmup.STEPS
+    warmup.warm_up(app, engine, steps=steps)
@@ -0,0 +1,160 @@
+"""
+Homepage read model - the assembled /api/homepage-data body kept in the
+homepage_documents table, so the public endpoint is a single primary-key read.
+
+The row carries two counters. Every transaction that writes a homepage table
+(hero slides, rooms and their images, facilities, reviews, settings) adds one to
+source_version in the same transaction, from any process. A rebuild records the
+source_version it started from as built_version. Any process can then trust the
+row when the two are equal, with the one read it serves from; no per-process
+state is involved.
+
+A stale or missing row is served by the live query and rebuilt on a background
+thread, as is the row after a commit in this process, so neither a request nor
+the admin's save waits for a rebuild. The rebuild is one UPDATE of one row:
+readers keep seeing the previous body until it commits. A row older than
+RESPONSE_CACHE_TTL (writes made outside the app, e.g. scripts) is still served
+and refreshed in the background.
+
+Enable with HOMEPAGE_READ_MODEL=on (see app.py).
+"""
+import os
+import threading
+from datetime import datetime
+from sqlalchemy import event, inspect, select, update, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from models import HomepageDocument
+import queries
+from utils import content_version, invalidation_bus
+from utils import response_cache
+from utils.response_cache import tables_for
+
+KEY = "homepage"
+TABLES = tables_for(queries.HOMEPAGE_MODELS)
+MAX_AGE = response_cache.CACHE_TTL
+
+_table = HomepageDocument.__table__
+_table_exists = False  # checked on writes to a homepage table until it exists
+_lock = threading.Lock()
+_refreshing = False
+_again = False
+
+
+def build(app, engine):
+    """Encoded homepage body, straight from the source tables"""
+    with engine.connect() as conn:
+        data = queries.homepage_data(conn)
+    with app.app_context():
+        return app.json.response(data).get_data()
+
+
+def refresh(app, engine):
+    """Rebuild the stored document; returns the new body"""
+    with engine.connect() as conn:
+        version = conn.execute(select(_table.c.source_version).where(_table.c.key == KEY)).scalar() or 0
+    # Read after the version: a write committing from here on leaves source_version ahead of it
+    body = build(app, engine)
+    values = {"body": body.decode("utf-8"), "built_version": version, "built_at": datetime.utcnow()}
+    with engine.begin() as conn:
+        updated = conn.execute(update(_table).where(_table.c.key == KEY).values(**values)).rowcount
+        if not updated:
+            try:
+                with conn.begin_nested():
+                    conn.execute(insert(_table).values(key=KEY, source_version=version, **values))
+            except IntegrityError:
+                # Another process inserted it first
+                conn.execute(update(_table).where(_table.c.key == KEY).values(**values))
+    return body
+
+
+def _refresh_loop(app, engine):
+    global _refreshing, _again
+    while True:
+        try:
+            refresh(app, engine)
+        except Exception as e:
+            print(f"⚠️ Homepage read model refresh failed: {e}")
+        with _lock:
+            if not _again:
+                _refreshing = False
+                return
+            _again = False
+
+
+def request_refresh(app, engine):
+    """Rebuild the row on a background thread; requests made meanwhile add one more rebuild"""
+    global _refreshing, _again
+    with _lock:
+        if _refreshing:
+            _again = True
+            return
+        _refreshing = True
+    threading.Thread(target=_refresh_loop, args=(app, engine), name="homepage-document", daemon=True).start()
+
+
+def read(app, engine):
+    """Stored body when it is current; None (serve the live query) while it is stale, missing or unavailable"""
+    if response_cache.bypassing():
+        return None  # a snapshot build wants the source tables
+    try:
+        with engine.connect() as conn:
+            row = conn.execute(
+                select(_table.c.body, _table.c.source_version, _table.c.built_version, _table.c.built_at)
+                .where(_table.c.key == KEY)
+            ).first()
+    except Exception as e:
+        print(f"⚠️ Homepage read model unavailable, serving the live query: {e}")
+        return None
+    if row is None or row.built_version != row.source_version:
+        request_refresh(app, engine)
+        return None
+    if row.built_at is None or (datetime.utcnow() - row.built_at).total_seconds() > MAX_AGE:
+        request_refresh(app, engine)
+    return row.body.encode("utf-8")
+
+
+def _mark_stale(session, flush_context):
+    """Bump source_version in the transaction that writes a homepage table (once per transaction)"""
+    global _table_exists
+    changed = session.info.get("changed_tables")
+    if not changed or session.info.get("homepage_document_marked") or not set(TABLES) & changed:
+        return
+    conn = session.connection()
+    if not _table_exists:  # until migrate.py has created it
+        _table_exists = inspect(conn).has_table(_table.name)
+    if not _table_exists:
+        return
+    session.info["homepage_document_marked"] = True
+    conn.execute(update(_table).where(_table.c.key == KEY).values(source_version=_table.c.source_version + 1))
+
+
+def _end_transaction(session, *args):
+    session.info.pop("homepage_document_marked", None)
+
+
+def _after_fork():
+    # The refresh thread does not survive fork
+    global _lock, _refreshing, _again
+    _lock = threading.Lock()
+    _refreshing = _again = False
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def install(app, engine):
+    """Mark the row stale in every transaction writing a homepage table; rebuild it after this process's commits"""
+    event.listen(Session, "after_flush_postexec", _mark_stale)
+    event.listen(Session, "after_commit", _end_transaction)
+    event.listen(Session, "after_soft_rollback", _end_transaction)
+
+    def on_bump(tables):
+        if not set(TABLES) & set(tables):
+            return
+        if invalidation_bus.receiving():
+            return  # the committing process rebuilds it
+        request_refresh(app, engine)
+
+    content_version.subscribe(on_bump)
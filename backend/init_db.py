@@ -11,7 +11,7 @@ load_dotenv()
 # Add parent to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from database import engine, Base
+from database import get_engine, Base
 from models import (
     Admin,
     SiteSettings,
@@ -30,6 +30,8 @@ from models import (
     GalleryImage,
 )
 
+engine = get_engine()
+
 
 def create_tables():
     """Create all tables"""
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations.
+
+Applied versions are recorded in the schema_migrations table, so each migration
+runs once per database. Index migrations take their definitions from models.py
+(the single source of truth) and are created with CREATE INDEX CONCURRENTLY on
+Postgres, so they never lock the tables against live reads or admin writes.
+
+Every run prints the query plan of each hot public read (queries.py) before and
+after the pending migrations.
+
+Run: python migrate.py              # apply pending migrations
+     python migrate.py --status     # list applied / pending versions
+     python migrate.py --explain    # only print the plans
+     python migrate.py --analyze    # plans with EXPLAIN ANALYZE (executes the reads)
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+from sqlalchemy.schema import CreateIndex, CreateTable
+from database import engine, Base
+import models  # registers every table and index on Base.metadata
+import queries  # noqa: F401 - declares the resources whose reads are explained
+from resources import REGISTRY
+
+# (version, description, index names from models.py, extra SQL statements or DDL constructs)
+MIGRATIONS = [
+    ("0001", "Composite (order, id) indexes for the public list and child queries", [
+        "ix_hero_slides_active_order_id",
+        "ix_rooms_order_id",
+        "ix_facilities_order_id",
+        "ix_activities_order_id",
+        "ix_food_items_order_id",
+        "ix_reviews_order_id",
+        "ix_pricing_categories_order_id",
+        "ix_restaurant_menu_categories_order_id",
+        "ix_room_images_room_id_order_id",
+        "ix_pricing_items_category_id_order_id",
+        "ix_restaurant_menu_items_category_id_order_id",
+    ], []),
+    ("0002", "Section + keyset indexes for paged videos and gallery images", [
+        "ix_videos_section_order_id",
+        "ix_gallery_images_section_order_id",
+    ], []),
+    ("0003", "homepage_documents read model for /api/homepage-data", [], [
+        CreateTable(models.HomepageDocument.__table__, if_not_exists=True),
+    ]),
+    # Derived data only: dropped and recreated, then rebuilt by the first request
+    ("0004", "homepage_documents source/built versions, shared by every process", [], [
+        "DROP TABLE IF EXISTS homepage_documents",
+        CreateTable(models.HomepageDocument.__table__, if_not_exists=True),
+    ]),
+]
+
+# Query args of the paged reads the frontend makes, explained next to the plain lists
+HOT_QUERY_ARGS = {
+    "videos": {"section": "our-kalongo,none", "limit": "12"},
+    "gallery_images": {"section": "our-kalongo", "limit": "12"},
+}
+
+MIGRATIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version VARCHAR(32) PRIMARY KEY,
+    description VARCHAR(300) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    duration_ms INTEGER
+)
+"""
+ADVISORY_LOCK_ID = 4_801_202  # one migrate.py at a time per database
+
+
+def _is_postgres():
+    return engine.dialect.name == "postgresql"
+
+
+def _autocommit():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    return engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+
+
+def applied_versions(conn):
+    conn.execute(text(MIGRATIONS_TABLE))
+    return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def _find_index(name):
+    for table in Base.metadata.tables.values():
+        for index in table.indexes:
+            if index.name == name:
+                return index
+    raise KeyError(f"Index {name} is not declared in models.py")
+
+
+def index_ddl(index):
+    """CREATE INDEX [CONCURRENTLY] IF NOT EXISTS ... for this database"""
+    ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=engine.dialect)).strip()
+    if _is_postgres():
+        ddl = ddl.replace("CREATE INDEX ", "CREATE INDEX CONCURRENTLY ", 1)
+    return ddl
+
+
+def _drop_invalid_index(conn, name):
+    """A failed CONCURRENTLY build leaves an INVALID index behind; IF NOT EXISTS would keep it"""
+    valid = conn.execute(text(
+        "SELECT i.indisvalid FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid WHERE c.relname = :name"
+    ), {"name": name}).scalar()
+    if valid is False:
+        print(f"    ⚠️  {name} is INVALID (interrupted build) - dropping and rebuilding")
+        conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+
+
+def apply(version, description, index_names, statements, dry_run=False):
+    started = time.time()
+    print(f"  ▶ {version}: {description}")
+    ddl = [(name, index_ddl(_find_index(name))) for name in index_names]
+    ddl += [(None, sql if isinstance(sql, str) else str(sql.compile(dialect=engine.dialect)).strip())
+            for sql in statements]
+    if dry_run:
+        for _, sql in ddl:
+            print(f"    {sql}")
+        return
+    with _autocommit() as conn:
+        for name, sql in ddl:
+            if name and _is_postgres():
+                _drop_invalid_index(conn, name)
+            step_started = time.time()
+            conn.execute(text(sql))
+            print(f"    ✅ {name or sql.split()[0]} ({(time.time() - step_started) * 1000:.0f} ms)")
+        conn.execute(
+            text("INSERT INTO schema_migrations (version, description, duration_ms) VALUES (:v, :d, :ms)"),
+            {"v": version, "d": description, "ms": int((time.time() - started) * 1000)},
+        )
+
+
+def hot_queries():
+    """(label, statement) for every read the public API runs"""
+    result = []
+    for resource in REGISTRY.values():
+        for i, (stmt, _) in enumerate(resource.statements):
+            label = resource.name if i == 0 else f"{resource.name} [{i}]"
+            result.append((label, stmt))
+        args = HOT_QUERY_ARGS.get(resource.name)
+        if args:
+            stmt, _ = resource.statement_for(args)
+            result.append((f"{resource.name} ?{'&'.join(f'{k}={v}' for k, v in args.items())}", stmt))
+        if resource.children and _is_postgres():
+            result.append((f"{resource.name} [json document]", resource.document))
+    return result
+
+
+def explain(conn, stmt, analyze=False):
+    sql = str(stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    if _is_postgres():
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+        return [row[0] for row in conn.execute(text(prefix + sql))]
+    if engine.dialect.name == "sqlite":
+        return [row[-1] for row in conn.execute(text("EXPLAIN QUERY PLAN " + sql))]
+    return [row[0] for row in conn.execute(text("EXPLAIN " + sql))]
+
+
+def report_plans(title, analyze=False):
+    print(f"\n📋 Query plans {title}")
+    with engine.connect() as conn:
+        for label, stmt in hot_queries():
+            try:
+                plan = explain(conn, stmt, analyze)
+            except Exception as e:
+                conn.rollback()
+                plan = [f"(explain failed: {e.__class__.__name__}: {str(e).splitlines()[0]})"]
+            print(f"  {label}")
+            for line in plan:
+                print(f"      {line}")
+
+
+def migrate(dry_run=False, analyze=False):
+    lock = None
+    if _is_postgres() and not dry_run:
+        lock = _autocommit()
+        lock.execute(text("SELECT pg_advisory_lock(:id)"), {"id": ADVISORY_LOCK_ID})
+    try:
+        with engine.begin() as conn:
+            done = applied_versions(conn)
+        pending = [m for m in MIGRATIONS if m[0] not in done]
+        if not pending:
+            print("✅ Schema is up to date")
+            return []
+        report_plans("before", analyze)
+        print(f"\n🔧 Applying {len(pending)} migration(s)")
+        for migration in pending:
+            apply(*migration, dry_run=dry_run)
+        if not dry_run:
+            report_plans("after", analyze)
+        return [m[0] for m in pending]
+    finally:
+        if lock is not None:
+            lock.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": ADVISORY_LOCK_ID})
+            lock.close()
+
+
+def status():
+    with engine.begin() as conn:
+        done = applied_versions(conn)
+    for version, description, _, _ in MIGRATIONS:
+        print(f"  {'✅' if version in done else '⏳'} {version}  {description}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply versioned schema migrations")
+    parser.add_argument("--status", action="store_true", help="list applied and pending migrations")
+    parser.add_argument("--explain", action="store_true", help="only print the hot query plans")
+    parser.add_argument("--analyze", action="store_true", help="use EXPLAIN ANALYZE on Postgres (runs the reads)")
+    parser.add_argument("--dry-run", action="store_true", help="print the DDL of pending migrations without running it")
+    args = parser.parse_args()
+
+    if args.status:
+        status()
+    elif args.explain:
+        report_plans("(current)", args.analyze)
+    else:
+        print("Running migrations...")
+        migrate(dry_run=args.dry_run, analyze=args.analyze)
+        print("Done.")
@@ -2,14 +2,24 @@
 Database models for Kalongo Farm
 """
 from datetime import datetime
-from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, ForeignKey, DateTime, JSON, Index, func
 from sqlalchemy.orm import relationship
 from database import Base
+from utils.content_version import track_content_changes
 
 
-class Admin(UserMixin, Base):
+class LoginUserMixin:
+    """What Flask-Login needs from a user (as flask_login.UserMixin), without importing Flask-Login"""
+
+    is_active = True
+    is_authenticated = True
+    is_anonymous = False
+
+    def get_id(self):
+        return str(self.id)
+
+
+class Admin(LoginUserMixin, Base):
     __tablename__ = "admins"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -18,9 +28,11 @@ class Admin(UserMixin, Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     def set_password(self, password):
+        from werkzeug.security import generate_password_hash  # only the admin panel hashes passwords
         self.password_hash = generate_password_hash(password)
 
     def check_password(self, password):
+        from werkzeug.security import check_password_hash
         return check_password_hash(self.password_hash, password)
 
 
@@ -213,3 +225,52 @@ class GalleryImage(Base):
     order = Column(Integer, default=0)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class HomepageDocument(Base):
+    """Assembled /api/homepage-data body, rebuilt by homepage_document.py after admin commits"""
+    __tablename__ = "homepage_documents"
+
+    key = Column(String(50), primary_key=True)  # "homepage"
+    body = Column(Text, nullable=False)  # encoded JSON, served as-is
+    source_version = Column(Integer, nullable=False, default=0)  # +1 by every transaction writing a source table
+    built_version = Column(Integer, nullable=False, default=0)  # source_version the body was built from
+    built_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+# ---------- Indexes for the public read paths (queries.py) ----------
+# Every list is ordered by ("order", id); children are read per parent in that order.
+# Existing databases get these through migrate.py (CREATE INDEX CONCURRENTLY), new ones from create_all.
+
+Index("ix_hero_slides_active_order_id", HeroSlide.active, HeroSlide.order, HeroSlide.id)
+Index("ix_rooms_order_id", Room.order, Room.id)
+Index("ix_facilities_order_id", Facility.order, Facility.id)
+Index("ix_activities_order_id", Activity.order, Activity.id)
+Index("ix_food_items_order_id", FoodItem.order, FoodItem.id)
+Index("ix_reviews_order_id", Review.order, Review.id)
+Index("ix_pricing_categories_order_id", PricingCategory.order, PricingCategory.id)
+Index("ix_restaurant_menu_categories_order_id", RestaurantMenuCategory.order, RestaurantMenuCategory.id)
+Index(
+    "ix_room_images_room_id_order_id", RoomImage.room_id, func.coalesce(RoomImage.order, 0), RoomImage.id,
+    postgresql_include=["image_url", "caption", "order"],
+)
+Index("ix_pricing_items_category_id_order_id", PricingItem.category_id, PricingItem.order, PricingItem.id)
+Index(
+    "ix_restaurant_menu_items_category_id_order_id",
+    RestaurantMenuItem.category_id, RestaurantMenuItem.order, RestaurantMenuItem.id,
+    postgresql_include=["name", "price"],  # covering: the menu is served by index-only scans
+)
+# Section reads of /api/videos and /api/gallery-images: one range scan per section value,
+# WHERE section = ? ORDER BY coalesce("order", 0), id
+Index(
+    "ix_videos_section_order_id", Video.section, func.coalesce(Video.order, 0), Video.id,
+    postgresql_include=["url", "caption", "order"],
+)
+Index(
+    "ix_gallery_images_section_order_id", GalleryImage.section, func.coalesce(GalleryImage.order, 0), GalleryImage.id,
+    postgresql_include=["image_url", "caption", "order"],
+)
+
+
+# Bump content versions (and so invalidate cached API responses) on every write
+track_content_changes(Base)
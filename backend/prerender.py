@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Pre-render database content into the static frontend pages.
+
+Fills the regions between <!-- prerender:NAME --> and <!-- /prerender:NAME -->
+in frontend/index.html and frontend/pricing.html with real markup, and embeds the
+API payloads the page needs as a JSON island (<script id="kalongo-data">), which
+frontend/js/api.js reads for its first render. The page paints without a
+round trip to the backend; api.js then asks the API once in the background and
+re-renders a section whose data changed since this script ran.
+
+Fixed copy both sides render (facility catalog, room prices, review placeholders)
+lives in frontend/data/site-content.json. This script reads it and writes it out
+as frontend/js/site-content.js, which the pages load before api.js.
+
+The markup mirrors the Render.* functions in frontend/js/api.js; api.js still
+renders from the island on load, so the two only need to agree closely enough
+that nothing visibly jumps.
+
+Run: python prerender.py            # rewrite pages whose content changed
+     python prerender.py --check    # exit 1 if any page is out of date
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from html import escape
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+FRONTEND_DIR = os.getenv(
+    "PRERENDER_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "frontend"),
+)
+
+MARKER = re.compile(r"(<!-- prerender:([\w-]+) -->)(.*?)(<!-- /prerender:\2 -->)", re.S)
+
+# Copy shared with the frontend: facility catalog, room prices, review placeholders.
+# The browser gets it as js/site-content.js, written from the same file below.
+CONTENT_PATH = os.path.join(FRONTEND_DIR, "data", "site-content.json")
+CONTENT_SCRIPT = os.path.join("js", "site-content.js")
+
+
+def load_content(path=CONTENT_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+CONTENT = load_content()
+FACILITY_CATALOG = [(f["key"], f["name"], f["description"]) for f in CONTENT["facilities"]]
+ROOM_PRICES = {slug: (p["amount"], p["label"]) for slug, p in CONTENT["room_prices"].items()}
+DEFAULT_AMENITIES = CONTENT["default_amenities"]
+REVIEW_META = [(m["name"], m["location"], m["date"]) for m in CONTENT["review_meta"]]
+DEFAULT_QUOTE = CONTENT["default_review_quote"]
+
+# ---------- Helpers mirrored from frontend/js/api.js ----------
+
+FACILITY_ICONS = {
+    "pool": '<svg viewBox="0 0 24 24" aria-hidden="true"><path d="M2 12c2-4 4-4 6 0s4 4 6 0 4-4 6 0"/><path d="M2 16c2-4 4-4 6 0s4 4 6 0 4-4 6 0"/><circle cx="18" cy="6" r="2"/></svg>',
+    "farm": '<svg viewBox="0 0 24 24" aria-hidden="true"><path d="M12 3c-4 4-6 8-6 12a6 6 0 0 0 12 0c0-4-2-8-6-12z"/><path d="M12 10v8"/></svg>',
+    "animals": '<svg viewBox="0 0 24 24" aria-hidden="true"><circle cx="8" cy="8" r="2"/><circle cx="16" cy="8" r="2"/><path d="M5 14c1.5 3 4 4 7 4s5.5-1 7-4"/><path d="M9 12h6"/></svg>',
+    "food": '<svg viewBox="0 0 24 24" aria-hidden="true"><path d="M4 11h16v2H4z"/><path d="M8 7v10M16 7v10"/><path d="M6 4h12v3H6z"/></svg>',
+    "trails": '<svg viewBox="0 0 24 24" aria-hidden="true"><path d="M4 20L10 8l4 4 6-12"/></svg>',
+    "activities": '<svg viewBox="0 0 24 24" aria-hidden="true"><circle cx="6" cy="17" r="3"/><circle cx="18" cy="17" r="3"/><path d="M9 17h6M6 14l3-7h6l3 7"/></svg>',
+}
+
+
+def optimize_cloudinary_url(url, width=None, height=None):
+    """Same transformation string as optimizeCloudinaryUrl()"""
+    if not url or "cloudinary.com" not in url:
+        return url
+    if "/upload/w_" in url or "/upload/c_" in url or "/upload/" not in url:
+        return url
+    parts = ([f"w_{width}"] if width else []) + ([f"h_{height}"] if height else []) + ["q_auto", "f_auto", "c_limit"]
+    return url.replace("/upload/", f"/upload/{','.join(parts)}/", 1)
+
+
+def _normalize(name):
+    return re.sub(r"[^a-z0-9]+", " ", (name or "").lower()).strip()
+
+
+def merge_facilities(api_list):
+    """FACILITY_CATALOG order and copy, with images/descriptions from the API"""
+    by_name = {_normalize(f.get("name")): f for f in api_list or []}
+    merged = []
+    for key, name, description in FACILITY_CATALOG:
+        api = by_name.get(_normalize(name)) or {}
+        merged.append({
+            "name": name,
+            "description": api.get("description") or description,
+            "image_url": api.get("image_url") or "",
+            "icon_key": key,
+        })
+    return merged
+
+
+def feature_icon(text):
+    t = (text or "").lower()
+    if "wifi" in t or "wi-fi" in t or "internet" in t:
+        return "⌁"
+    if "bath" in t or "shower" in t:
+        return "◇"
+    if "bed" in t or "sleep" in t:
+        return "☾"
+    if "view" in t or "garden" in t or "farm" in t:
+        return "❋"
+    if "food" in t or "dining" in t or "kitchen" in t:
+        return "◎"
+    if "air" in t or "ac" in t:
+        return "◈"
+    return "◆"
+
+
+# ---------- Section renderers ----------
+
+
+def render_hero_slides(slides):
+    html = []
+    for idx, slide in enumerate(slides):
+        style = ""
+        if slide.get("image_url"):
+            url = escape(optimize_cloudinary_url(slide["image_url"], 1920, 1080))
+            style = (f' style="background-image: url(&quot;{url}&quot;); background-size: cover; '
+                     'background-position: center; background-repeat: no-repeat;"')
+        html.append(f'<div class="hero-slide" data-slide-index="{idx}"{style}></div>')
+    return "".join(html)
+
+
+def render_room_card(room):
+    name = escape(room.get("name") or "")
+    slug = escape(room.get("slug") or "")
+    images = [img for img in room.get("images") or [] if (img.get("image_url") or "").strip()]
+    if images:
+        images_html = "".join(
+            f'<div class="room-slide" data-slide-index="{idx}">'
+            f'<img src="{escape(optimize_cloudinary_url(img["image_url"], 800, 600))}" '
+            f'alt="{escape(img.get("caption") or room.get("name") or "")}" class="room-slide-image" '
+            f'loading="{"eager" if idx == 0 else "lazy"}"></div>'
+            for idx, img in enumerate(images)
+        )
+    else:
+        images_html = '<div class="room-slide eco-room-slide--empty"><p>No image available</p></div>'
+    amenities = (room.get("features") or [])[:4] or DEFAULT_AMENITIES
+    features_html = "".join(
+        f'<li><span class="lux-amenity-icon" aria-hidden="true">{feature_icon(f)}</span><span>{escape(str(f))}</span></li>'
+        for f in amenities
+    )
+    price = ROOM_PRICES.get(room.get("slug"))
+    price_html = f"<strong>From TZS {price[0]:,}</strong> {price[1]}" if price else "<strong>Contact for rates</strong>"
+    capacity = escape(room.get("capacity") or "") or "View details"
+    return (
+        f'<article class="room-card lux-room-card" data-room-slug="{slug}" tabindex="0" role="button" aria-label="View {name} details">'
+        '<div class="lux-room-media">'
+        f'<div class="room-slider-container" data-room="{slug}"><div class="room-slider" data-room="{slug}">{images_html}</div></div>'
+        '<div class="lux-room-shade" aria-hidden="true"></div>'
+        '<span class="lux-room-badge">LUXURY STAY</span>'
+        '</div>'
+        '<div class="lux-room-body">'
+        f'<h3 class="lux-room-title">{name}</h3>'
+        f'<div class="lux-room-mobile-row"><p class="lux-room-capacity">{capacity}</p>'
+        '<span class="lux-room-chevron" aria-hidden="true">→</span></div>'
+        f'<ul class="lux-room-amenities" aria-label="Room features">{features_html}</ul>'
+        f'<div class="lux-room-footer"><p class="lux-room-price">{price_html}</p>'
+        f'<button type="button" class="lux-room-view-btn" aria-label="View {name} details">View Details</button></div>'
+        '</div>'
+        '</article>'
+    )
+
+
+def render_rooms(rooms):
+    return "".join(render_room_card(room) for room in rooms)
+
+
+def render_facilities(facilities):
+    html = []
+    for fac in merge_facilities(facilities):
+        name = escape(fac["name"])
+        img_url = optimize_cloudinary_url(fac["image_url"], 640, 620) if fac["image_url"] else ""
+        media = (f'<img class="lux-facility-img" src="{escape(img_url)}" alt="{name}" loading="lazy">' if img_url
+                 else '<div class="lux-facility-img-placeholder" aria-hidden="true"></div>')
+        html.append(
+            '<article class="facility-item lux-facility-card">'
+            f'<div class="lux-facility-media{"" if img_url else " lux-facility-media--empty"}">{media}'
+            '<div class="lux-facility-img-overlay" aria-hidden="true"></div>'
+            f'<div class="lux-facility-icon-badge" aria-hidden="true">{FACILITY_ICONS.get(fac["icon_key"], FACILITY_ICONS["farm"])}</div>'
+            '</div>'
+            f'<div class="lux-facility-body"><h3 class="lux-facility-title">{name}</h3>'
+            f'<p class="lux-facility-desc">{escape(fac["description"] or "")}</p></div>'
+            '</article>'
+        )
+    return "".join(html)
+
+
+def render_reviews(reviews):
+    html = []
+    for idx, review in enumerate(reviews):
+        meta_name, location, date = REVIEW_META[idx % len(REVIEW_META)] if REVIEW_META else ("", "", "")
+        rating = min(5, max(1, review.get("rating") or 5))
+        stars = "".join(
+            f'<span class="lux-review-star" aria-hidden="true">{"★" if i < rating else "☆"}</span>' for i in range(5)
+        )
+        name = escape(review.get("customer_name") or meta_name)
+        image_url = review.get("image_url")
+        if image_url:
+            visual = (f'<img class="lux-review-photo" src="{escape(optimize_cloudinary_url(image_url, 720, 520))}" '
+                      f'alt="{name}" loading="{"eager" if idx == 0 else "lazy"}">')
+            avatar = f'<img class="lux-review-avatar" src="{escape(optimize_cloudinary_url(image_url, 112, 112))}" alt="" loading="lazy">'
+        else:
+            visual = '<div class="lux-review-photo lux-review-photo--empty" aria-hidden="true"></div>'
+            avatar = '<span class="lux-review-avatar lux-review-avatar--placeholder" aria-hidden="true"></span>'
+        html.append(
+            f'<div class="review-slide lux-review-slide" data-review-index="{idx}"><div class="lux-review-card">'
+            f'<div class="lux-review-visual">{visual}</div>'
+            '<div class="lux-review-panel">'
+            f'<div class="lux-review-stars" aria-label="Rating: {rating} out of 5 stars">{stars}</div>'
+            '<div class="lux-review-quote-wrap">'
+            '<span class="lux-review-q-mark lux-review-q-open" aria-hidden="true">"</span>'
+            f'<p class="lux-review-quote">{escape(review.get("quote") or DEFAULT_QUOTE)}</p>'
+            '<span class="lux-review-q-mark lux-review-q-close" aria-hidden="true">"</span>'
+            '</div>'
+            '<div class="lux-review-author-divider" aria-hidden="true">❋</div>'
+            f'<div class="lux-review-author">{avatar}<div>'
+            f'<h4 class="lux-review-name">{name}</h4>'
+            f'<p class="lux-review-location">{escape(location)}</p><p class="lux-review-date">{escape(date)}</p>'
+            '</div></div>'
+            '</div></div></div>'
+        )
+    return "".join(html)
+
+
+def content_script(content):
+    """js/site-content.js: the shared copy as window.KALONGO_CONTENT, for api.js and eco-rooms-ui.js"""
+    body = json.dumps(content, ensure_ascii=False, indent=2)
+    return ("// Generated by backend/prerender.py from data/site-content.json - edit that file and re-run it\n"
+            f"window.KALONGO_CONTENT = {body};\n")
+
+
+def data_island(payloads):
+    """<script type="application/json"> holding {endpoint: payload}; safe to inline in HTML"""
+    body = json.dumps(payloads, ensure_ascii=False, separators=(",", ":"))
+    body = body.replace("<", "\\u003c").replace(">", "\\u003e").replace("&", "\\u0026")
+    return f'<script type="application/json" id="kalongo-data">{body}</script>'
+
+
+# ---------- Pages ----------
+
+
+def load_data():
+    """Everything the pre-rendered pages need, read with the same queries the API serves"""
+    import queries
+    from database import engine
+
+    with engine.connect() as conn:
+        return {"homepage": queries.homepage_data(conn), "settings": queries.settings(conn)}
+
+
+def page_regions(data):
+    """{page file: {region name: html}}"""
+    home = data["homepage"]
+    # initializeDataLoading() requests /settings first, then /homepage-data
+    return {
+        "index.html": {
+            "hero-slides": render_hero_slides(home["hero_slides"]),
+            "rooms": render_rooms(home["rooms"]),
+            "facilities": render_facilities(home["facilities"]),
+            "reviews": render_reviews(home["reviews"]),
+            "data": data_island({"/settings": data["settings"], "/homepage-data": home}),
+        },
+        # pricing.html has static rate cards only; the island saves its settings request
+        "pricing.html": {
+            "data": data_island({"/settings": data["settings"]}),
+        },
+    }
+
+
+def fill(html, regions):
+    """Replace the content of each marker region; unknown regions are left as they are"""
+    def replace(match):
+        name = match.group(2)
+        if name not in regions:
+            return match.group(0)
+        return f"{match.group(1)}{regions[name]}{match.group(4)}"
+    return MARKER.sub(replace, html)
+
+
+def _write(path, text):
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def prerender(data=None, out_dir=None, write=True):
+    """Fill every page and write js/site-content.js; returns the files whose content changed"""
+    out_dir = out_dir or FRONTEND_DIR
+    data = data if data is not None else load_data()
+    changed = []
+    script_path = os.path.join(out_dir, CONTENT_SCRIPT)
+    script = content_script(CONTENT)
+    try:
+        with open(script_path, encoding="utf-8") as f:
+            current = f.read()
+    except FileNotFoundError:
+        current = None
+    if current != script:
+        changed.append(CONTENT_SCRIPT)
+        if write:
+            _write(script_path, script)
+    for page, regions in page_regions(data).items():
+        path = os.path.join(out_dir, page)
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        missing = [name for name in regions if f"<!-- prerender:{name} -->" not in html]
+        if missing:
+            print(f"  ⚠️  {page}: no marker for {', '.join(missing)}")
+        rendered = fill(html, regions)
+        if rendered == html:
+            continue
+        changed.append(page)
+        if write:
+            _write(path, rendered)
+    return changed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-render database content into the static frontend pages")
+    parser.add_argument("--check", action="store_true", help="report out-of-date pages without writing; exit 1 if any")
+    parser.add_argument("--out", help=f"frontend directory (default {FRONTEND_DIR})")
+    args = parser.parse_args()
+
+    print("Pre-rendering pages...")
+    changed = prerender(out_dir=args.out, write=not args.check)
+    if args.check:
+        print(f"  {'❌' if changed else '✅'} {len(changed)} page(s) out of date" + (f": {', '.join(changed)}" if changed else ""))
+        sys.exit(1 if changed else 0)
+    print(f"  ✅ {len(changed)} page(s) written" + (f": {', '.join(changed)}" if changed else " (all up to date)"))
+    print("Done.")
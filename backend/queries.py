@@ -0,0 +1,349 @@
+"""
+Read queries for the public API - each resource is declared once here (fields,
+filters, ordering) and served through the registry in resources.py as a Core
+select of exactly those columns, turned into dicts by a compiled serializer
+"""
+import contextvars
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from sqlalchemy import func, case, and_, or_, text
+from models import (
+    HeroSlide,
+    Room,
+    RoomImage,
+    Facility,
+    Activity,
+    PricingCategory,
+    PricingItem,
+    FoodItem,
+    Video,
+    Review,
+    SiteSettings,
+    RestaurantMenuCategory,
+    RestaurantMenuItem,
+    GalleryImage,
+)
+from resources import Resource, Child, register
+from database import background_connections, homepage_workers, pool_capacity
+from utils.db_pool import read_with_retry
+
+DEFAULT_REVIEW_QUOTE = "Great experience at Kalongo Farm!"
+
+# Parallel homepage fan-out (HOMEPAGE_FETCH=parallel)
+HOMEPAGE_SECTION_TIMEOUT = float(os.getenv("HOMEPAGE_SECTION_TIMEOUT", "3"))
+_executor = None
+
+
+def _present(col):
+    """SQL for Python truthiness of a string column"""
+    return and_(col.isnot(None), col != "")
+
+
+# Every character str.strip() removes (all of them sit below U+3001); SQL trim(col) alone strips only spaces
+_WHITESPACE = "".join(filter(str.isspace, map(chr, range(0x3001))))
+
+
+def _non_blank(col):
+    """SQL for `col and col.strip()`"""
+    return and_(col.isnot(None), func.trim(col, _WHITESPACE) != "")
+
+
+def _or_default(col, default, falsy=""):
+    """SQL for `col or default`"""
+    return func.coalesce(func.nullif(col, falsy), default)
+
+
+def _blank_to_none(col):
+    """SQL for `col if col and col.strip() else None`"""
+    return case((_non_blank(col), col), else_=None)
+
+
+# ---------- Flat lists ----------
+
+
+HERO_SLIDES = register(Resource(
+    "hero_slides", HeroSlide,
+    fields=(HeroSlide.id, HeroSlide.image_url, HeroSlide.title, HeroSlide.subtitle, HeroSlide.order),
+    where=(HeroSlide.active.is_(True),),
+    order_by=(HeroSlide.order, HeroSlide.id),
+    limit=50,
+    fallback=True,
+    path="/hero-slides",
+    doc="Active hero slides - every slide when none is active",
+))
+
+FACILITIES = register(Resource(
+    "facilities", Facility,
+    fields=(Facility.id, Facility.name, Facility.description, Facility.image_url, Facility.order),
+    order_by=(Facility.order, Facility.id),
+    path="/facilities",
+    doc="All facilities",
+))
+
+ACTIVITIES = register(Resource(
+    "activities", Activity,
+    fields=(
+        Activity.id,
+        Activity.name,
+        _or_default(Activity.description, "").label("description"),
+        _blank_to_none(Activity.image_url).label("image_url"),
+        func.coalesce(Activity.order, 0).label("order"),
+    ),
+    where=(_present(Activity.name),),
+    order_by=(Activity.order, Activity.id),
+    path="/activities",
+    doc="Activities with a name; blank image URLs become null",
+))
+
+FOOD = register(Resource(
+    "food", FoodItem,
+    fields=(FoodItem.id, FoodItem.name, FoodItem.description, FoodItem.price, FoodItem.featured, FoodItem.order),
+    order_by=(FoodItem.order, FoodItem.id),
+    path="/food",
+    doc="All food items",
+))
+
+VIDEOS = register(Resource(
+    "videos", Video,
+    fields=(Video.id, Video.url, Video.caption, Video.section, Video.order),
+    filters={"section": Video.section},
+    page_keys=(func.coalesce(Video.order, 0), Video.id),
+    path="/videos",
+    doc="Videos; ?section= filters, ?limit=&cursor= pages",
+))
+
+GALLERY_IMAGES = register(Resource(
+    "gallery_images", GalleryImage,
+    fields=(GalleryImage.id, GalleryImage.image_url, GalleryImage.caption, GalleryImage.section, GalleryImage.order),
+    filters={"section": GalleryImage.section},
+    page_keys=(func.coalesce(GalleryImage.order, 0), GalleryImage.id),
+    path="/gallery-images",
+    doc="Gallery images; ?section= filters, ?limit=&cursor= pages",
+    empty_on_error=True,  # table might not exist yet on older databases
+))
+
+
+def _review_fields(default_quote):
+    return (
+        Review.id,
+        _or_default(Review.customer_name, "Guest").label("customer_name"),
+        _blank_to_none(Review.image_url).label("image_url"),
+        _or_default(Review.quote, default_quote).label("quote"),
+        _or_default(Review.rating, 5, falsy=0).label("rating"),
+        func.coalesce(Review.order, 0).label("order"),
+    )
+
+
+REVIEWS = register(Resource(
+    "reviews", Review,
+    fields=_review_fields(""),
+    where=(or_(_present(Review.customer_name), _present(Review.quote)),),
+    order_by=(Review.order, Review.id),
+    path="/reviews",
+    doc="Reviews that have a name or a quote",
+))
+
+SETTINGS = register(Resource(
+    "settings", SiteSettings,
+    fields=(SiteSettings.key, SiteSettings.value),
+    mapping=True,
+    path="/settings",
+    doc="All site settings as {key: value}",
+))
+
+
+# ---------- Nested documents ----------
+
+
+_room_image_order = func.coalesce(RoomImage.order, 0)
+
+ROOMS = register(Resource(
+    "rooms", Room,
+    fields=(
+        Room.id,
+        Room.name,
+        Room.slug,
+        func.coalesce(Room.description, "").label("description"),
+        func.coalesce(Room.capacity, "").label("capacity"),
+        Room.features,
+    ),
+    order_by=(Room.order, Room.id),
+    defaults={"features": []},
+    children=(Child("images", Resource(
+        "room_images", RoomImage,
+        fields=(
+            RoomImage.id,
+            RoomImage.image_url,
+            func.coalesce(RoomImage.caption, "").label("caption"),
+            _room_image_order.label("order"),
+        ),
+        where=(_non_blank(RoomImage.image_url),),
+        order_by=(_room_image_order, RoomImage.id),
+    ), RoomImage.room_id),),
+    path="/rooms",
+    doc="Rooms with their non-blank images, both ordered by (order, id)",
+))
+
+PRICING = register(Resource(
+    "pricing", PricingCategory,
+    fields=(
+        PricingCategory.id,
+        PricingCategory.name,
+        PricingCategory.description,
+        PricingCategory.category_type,
+        PricingCategory.order,
+    ),
+    order_by=(PricingCategory.order, PricingCategory.id),
+    children=(Child("items", Resource(
+        "pricing_items", PricingItem,
+        fields=(
+            PricingItem.id,
+            PricingItem.name,
+            PricingItem.price_label,
+            PricingItem.price_value,
+            PricingItem.description,
+            PricingItem.featured,
+            PricingItem.order,
+        ),
+        order_by=(PricingItem.order, PricingItem.id),
+    ), PricingItem.category_id),),
+    path="/pricing",
+    doc="Pricing categories with their items",
+))
+
+RESTAURANT_MENU = register(Resource(
+    "restaurant_menu", RestaurantMenuCategory,
+    fields=(
+        RestaurantMenuCategory.id,
+        RestaurantMenuCategory.name,
+        func.coalesce(RestaurantMenuCategory.subtitle, "").label("subtitle"),
+        func.coalesce(RestaurantMenuCategory.image_url, "").label("image_url"),
+        func.coalesce(RestaurantMenuCategory.icon_key, "").label("icon_key"),
+        RestaurantMenuCategory.order,
+    ),
+    order_by=(RestaurantMenuCategory.order, RestaurantMenuCategory.id),
+    children=(Child("items", Resource(
+        "restaurant_menu_items", RestaurantMenuItem,
+        fields=(RestaurantMenuItem.id, RestaurantMenuItem.name, RestaurantMenuItem.price, RestaurantMenuItem.order),
+        order_by=(RestaurantMenuItem.order, RestaurantMenuItem.id),
+    ), RestaurantMenuItem.category_id),),
+    path="/restaurant-menu",
+    doc="Restaurant menu categories with their items",
+))
+
+# Plain functions of a connection, for callers outside the generated endpoints
+hero_slides = HERO_SLIDES.fetch
+facilities = FACILITIES.fetch
+activities = ACTIVITIES.fetch
+food = FOOD.fetch
+videos = VIDEOS.fetch
+gallery_images = GALLERY_IMAGES.fetch
+reviews = REVIEWS.fetch
+settings = SETTINGS.fetch
+rooms = ROOMS.fetch
+pricing = PRICING.fetch
+restaurant_menu = RESTAURANT_MENU.fetch
+
+
+# Every model whose rows end up in /api/homepage-data (cache invalidation, read model refresh)
+HOMEPAGE_MODELS = (HeroSlide, Room, RoomImage, Facility, Review, SiteSettings)
+
+# section name -> (loader, value served when the section fails or times out)
+HOMEPAGE_SECTIONS = {  # database.HOMEPAGE_SECTIONS counts these for pool sizing
+    "hero_slides": (HERO_SLIDES.replace(limit=20, fallback=False, path=None).fetch, []),
+    "rooms": (rooms, []),
+    "facilities": (facilities, []),
+    "reviews": (REVIEWS.replace(fields=_review_fields(DEFAULT_REVIEW_QUOTE), where=(), path=None).fetch, []),
+    "settings": (settings, {}),
+}
+
+
+def homepage_data(conn):
+    """All homepage sections, one after another on a single connection"""
+    return {name: loader(conn) for name, (loader, _) in HOMEPAGE_SECTIONS.items()}
+
+
+def _reset_executor():
+    # A forked worker inherits the executor object but none of its threads
+    global _executor
+    _executor = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_executor)
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        # No more section threads than the pool can lend next to the background threads,
+        # so a section never spends its timeout waiting for a connection
+        workers = homepage_workers(int(os.getenv("GUNICORN_THREADS", "4")))
+        workers = max(min(workers, pool_capacity() - background_connections()), 1)
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="homepage")
+    return _executor
+
+
+def _started(started, name, fn, *args):
+    started[name] = time.monotonic()
+    return fn(*args)
+
+
+def _load_section(engine, loader, timeout):
+    # Each section runs on its own pooled connection
+    def load(conn):
+        if conn.dialect.name == "postgresql":
+            # Let Postgres cancel the statement too, so a timed-out section frees its connection
+            conn.execute(text(f"SET LOCAL statement_timeout = {int(timeout * 1000)}"))
+        return loader(conn)
+    return read_with_retry(engine, load)
+
+
+def homepage_data_parallel(engine, timeout=None):
+    """Fetch the homepage sections concurrently.
+
+    Returns (data, failed_sections). A section that raises or runs past the timeout
+    (counted from when a pool thread starts it) is served as its empty value instead
+    of failing the whole response; degraded sections are logged with the reason.
+    """
+    timeout = HOMEPAGE_SECTION_TIMEOUT if timeout is None else timeout
+    executor = _get_executor()
+    submitted = time.monotonic()
+    started = {}  # name -> when a pool thread picked the section up
+
+    def deadline(name):
+        # A section's timeout runs from its start; time queued behind other requests' sections
+        # does not count, up to one more timeout
+        return started[name] + timeout if name in started else submitted + 2 * timeout
+
+    # Each section runs in a copy of the request's context, so its SQL counts towards the request's timing
+    futures = {
+        name: executor.submit(contextvars.copy_context().run, _started, started, name,
+                              _load_section, engine, loader, timeout)
+        for name, (loader, _) in HOMEPAGE_SECTIONS.items()
+    }
+    pending = dict(futures)
+    while pending:
+        wait(pending.values(), timeout=max(min(map(deadline, pending)) - time.monotonic(), 0),
+             return_when=FIRST_COMPLETED)
+        now = time.monotonic()
+        pending = {name: f for name, f in pending.items() if not f.done() and now < deadline(name)}
+
+    data, failed, reasons = {}, [], []
+    for name, future in futures.items():
+        if not future.done():
+            if future.cancel():  # still queued: it never starts
+                reasons.append(f"{name} (queued {time.monotonic() - submitted:.1f}s, not started)")
+            else:
+                reasons.append(f"{name} (timed out after {timeout}s)")
+        elif future.exception() is not None:
+            reasons.append(f"{name} (failed: {future.exception()})")
+        else:
+            data[name] = future.result()
+            continue
+        data[name] = type(HOMEPAGE_SECTIONS[name][1])()
+        failed.append(name)
+    if failed:
+        print(f"⚠️ Homepage data degraded, sections served empty: {', '.join(reasons)}")
+    return data, failed
@@ -0,0 +1,525 @@
+"""
+Declarative registry for the public API.
+
+A Resource declares a model's public fields, default filters and ordering once.
+From that the registry builds the Core select, a row -> dict function compiled
+for exactly those fields, and the GET endpoint serving it. Declarations live in
+queries.py; routes/api_routes.py turns them into the /api blueprint.
+"""
+import base64
+import json
+import os
+from functools import lru_cache
+from flask import jsonify, request, current_app, Response
+from sqlalchemy import select, func, cast, literal_column, tuple_, case, true, union_all, Text
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.sql.elements import Label
+from utils import response_cache, shared_snapshot
+from utils.content_version import get_versions as content_versions
+from utils.response_cache import cached_response
+from utils.json_provider import FastJSONProvider
+from utils.db_pool import read_with_retry
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional - see utils/json_provider.py
+    _json_loads = json.loads
+
+REGISTRY = {}  # name -> Resource with an endpoint, in declaration order
+BATCH_PARAM = "resources"
+
+# Keyset pagination (?limit=&cursor=) for resources declared with page_keys
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+NONE_VALUE = "none"  # filter value matching rows where the column is NULL or empty
+
+# How nested endpoints (resources with children) are serialized:
+#   python    two queries, rows assembled and encoded by the app (default)
+#   postgres  one query; Postgres builds the JSON text and the app passes it through
+#   verify    build both, serve the app's bytes and log any difference (for rollout)
+DOCUMENT_ENGINE = os.getenv("JSON_DOCUMENT_ENGINE", "python").lower()
+_EMPTY_JSON_ARRAY = literal_column("'[]'::json")
+
+
+class QueryArgError(ValueError):
+    """Invalid filter or paging argument - answered with 400"""
+
+
+def compile_row_serializer(name, keys, offset=0, defaults=None):
+    """Build `lambda row: {key: row[i], ...}` as real source, so each field is one index.
+
+    defaults maps a key to a literal served when the column value is falsy (e.g. [] for JSON lists).
+    """
+    defaults = defaults or {}
+    items = []
+    for i, key in enumerate(keys, start=offset):
+        value = f"row[{i}]"
+        if key in defaults:
+            value = f"({value} or {defaults[key]!r})"
+        items.append(f"{key!r}: {value}")
+    fn_name = f"serialize_{name}"
+    source = f"def {fn_name}(row):\n    return {{{', '.join(items)}}}\n"
+    namespace = {}
+    exec(compile(source, f"<resource {name}>", "exec"), namespace)
+    return namespace[fn_name]
+
+
+def encode_cursor(values):
+    """Opaque, URL-safe cursor for the keyset position after a row"""
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor, size):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise QueryArgError("Invalid cursor")
+    # Page keys are integer columns (order, id) - anything else was not issued by us
+    if not isinstance(values, list) or len(values) != size or not all(
+        isinstance(v, int) and not isinstance(v, bool) for v in values
+    ):
+        raise QueryArgError("Invalid cursor")
+    return values
+
+
+def json_rows(stmt, order_by):
+    """Scalar subquery returning stmt's rows as one JSON array of arrays, in order (Postgres).
+
+    Rows travel as arrays so the compiled serializers can index them like result rows.
+    """
+    numbered = stmt.add_columns(func.row_number().over(order_by=order_by).label("_n")).subquery()
+    columns = [c for c in numbered.c if c.key != "_n"]
+    rows = func.json_agg(aggregate_order_by(func.json_build_array(*columns), numbered.c._n))
+    return select(cast(func.coalesce(rows, literal_column("'[]'::json")), Text)).scalar_subquery()
+
+
+def json_string_list(column):
+    """SQL for `column or []` on a JSON list of strings, encoded compactly (Postgres).
+
+    json columns keep the text they were written with (spaces after commas, \\u escapes),
+    so the elements are re-encoded instead of passing the stored text through.
+    """
+    elements = func.json_array_elements_text(column).table_valued("value", with_ordinality="n").render_derived()
+    encoded = select(func.coalesce(
+        func.array_to_json(func.array_agg(aggregate_order_by(elements.c.value, elements.c.n))),
+        _EMPTY_JSON_ARRAY,
+    )).scalar_subquery()
+    return case((func.json_typeof(column) == "array", encoded), else_=_EMPTY_JSON_ARRAY)
+
+
+def _unlabelled(field):
+    return field.element if isinstance(field, Label) else field
+
+
+class Child:
+    """Nested list of child rows, attached to each parent dict under `key`"""
+
+    def __init__(self, key, resource, parent_column, parent_key="id"):
+        self.key = key
+        self.resource = resource
+        self.parent_column = parent_column
+        self.parent_key = parent_key
+        # The parent id rides along as column 0 and is not serialized
+        self.order_by = (parent_column, *resource.order_by)
+        self.stmt = select(parent_column, *resource.fields).where(*resource.where).order_by(*self.order_by)
+        self.serialize = compile_row_serializer(
+            f"{resource.name}_child", resource.keys, offset=1, defaults=resource.defaults
+        )
+
+    def group(self, rows):
+        grouped = {}
+        serialize = self.serialize
+        for row in rows:
+            grouped.setdefault(row[0], []).append(serialize(row))
+        return grouped
+
+
+class Resource:
+    """One public collection.
+
+    fields    column attributes or labelled SQL expressions, in output order
+    where     default filters
+    order_by  ordering (also used for children within their parent)
+    limit     row cap
+    fallback  serve the unfiltered rows when the filters match nothing
+    defaults  {key: literal} for falsy values the serializer replaces
+    children  [Child, ...] nested lists
+    mapping   serve {first field: second field} instead of a list
+    path      URL below /api; None for resources that are only composed into others
+    empty_on_error  serve an empty list when the query fails (e.g. table not created yet)
+    filters   {query param: column} equality filters, e.g. ?section=gallery,our-kalongo
+    page_keys unique integer sort key for keyset pages (?limit=&cursor=), also the order of
+              every other read of the list (in place of order_by); flat lists only
+    """
+
+    def __init__(self, name, model, fields, where=(), order_by=(), limit=None, fallback=False,
+                 defaults=None, children=(), mapping=False, path=None, doc=None, empty_on_error=False,
+                 filters=None, page_keys=()):
+        if page_keys and (children or mapping or fallback):
+            raise ValueError(f"Resource {name!r}: page_keys need a flat list without fallback")
+        if page_keys and order_by:
+            raise ValueError(f"Resource {name!r}: page_keys are its ordering; drop order_by")
+        self._options = dict(
+            name=name, model=model, fields=fields, where=where, order_by=order_by, limit=limit,
+            fallback=fallback, defaults=defaults, children=children, mapping=mapping, path=path,
+            doc=doc, empty_on_error=empty_on_error, filters=filters, page_keys=page_keys,
+        )
+        self.name = name
+        self.model = model
+        self.fields = tuple(fields)
+        self.where = tuple(where)
+        self.order_by = tuple(page_keys or order_by)
+        self.limit = limit
+        self.fallback = fallback
+        self.defaults = dict(defaults or {})
+        self.children = tuple(children)
+        self.mapping = mapping
+        self.path = path
+        self.doc = doc
+        self.empty_on_error = empty_on_error
+        self.filters = dict(filters or {})
+        self.page_keys = tuple(page_keys)
+
+        base = select(*self.fields)
+        self.keys = tuple(base.selected_columns.keys())
+        self.stmt = self._limited(base.where(*self.where).order_by(*self.order_by))
+        self.unfiltered_stmt = self._limited(base.order_by(*self.order_by)) if fallback else None
+        self.serialize = compile_row_serializer(name, self.keys, defaults=self.defaults)
+        # (statement, ordering) for every query fetch() may run, in the order assemble() reads them
+        self.statements = [(self.stmt, self.order_by)]
+        if self.unfiltered_stmt is not None:
+            self.statements.append((self.unfiltered_stmt, self.order_by))
+        self.statements.extend((child.stmt, child.order_by) for child in self.children)
+        self._document = None
+
+    def _limited(self, stmt):
+        return stmt.limit(self.limit) if self.limit is not None else stmt
+
+    @property
+    def models(self):
+        """Every model whose rows end up in the payload (for cache invalidation)"""
+        models = [self.model]
+        for child in self.children:
+            models.extend(m for m in child.resource.models if m not in models)
+        return tuple(models)
+
+    def replace(self, **options):
+        """Copy of this declaration with some options changed (e.g. a smaller limit)"""
+        return Resource(**{**self._options, **options})
+
+    def empty(self):
+        return {} if self.mapping else []
+
+    def assemble(self, rows):
+        """Build the JSON-ready payload; rows(i) returns the rows of self.statements[i]"""
+        if self.mapping:
+            return {row[0]: row[1] for row in rows(0)}
+        serialize = self.serialize
+        items = [serialize(row) for row in rows(0)]
+        first_child = 1
+        if self.unfiltered_stmt is not None:
+            if not items:
+                items = [serialize(row) for row in rows(1)]
+            first_child = 2
+        for i, child in enumerate(self.children, start=first_child):
+            grouped = child.group(rows(i))
+            for item in items:
+                item[child.key] = grouped.get(item[child.parent_key], [])
+        return items
+
+    def fetch(self, conn):
+        """Run the queries on conn and return the JSON-ready payload"""
+        return self.assemble(lambda i: conn.execute(self.statements[i][0]))
+
+    def json_array(self, *where):
+        """SELECT of this list as one compact JSON array, children nested (Postgres).
+
+        row_to_json/array_to_json emit no whitespace and keep column order, so the text
+        matches what the app's JSON provider encodes from fetch(). where narrows the rows
+        (a child's link to its parent).
+        """
+        if self.mapping or self.fallback or self.limit is not None:
+            raise ValueError(f"Resource {self.name!r}: only plain lists have a JSON document")
+        columns = []
+        for field, key in zip(self.fields, self.keys):
+            if key in self.defaults:
+                if self.defaults[key] != []:
+                    raise ValueError(f"Resource {self.name!r}: no SQL default for {key!r}")
+                field = json_string_list(_unlabelled(field)).label(key)
+            columns.append(field)
+        fields = dict(zip(self.keys, self.fields))
+        for child in self.children:
+            nested = child.resource.json_array(child.parent_column == _unlabelled(fields[child.parent_key]))
+            columns.append(nested.correlate(self.model.__table__).scalar_subquery().label(child.key))
+        obj = select(*columns).correlate(self.model.__table__).lateral(f"{self.name}_json")
+        rows = func.array_agg(aggregate_order_by(func.row_to_json(literal_column(obj.name)), *self.order_by))
+        return (
+            select(func.coalesce(func.array_to_json(rows), _EMPTY_JSON_ARRAY))
+            .select_from(self.model.__table__.join(obj, true()))
+            .where(*self.where, *where)
+        )
+
+    @property
+    def document(self):
+        """SELECT returning the endpoint's JSON body as text (Postgres, nested resources)"""
+        if self._document is None:
+            self._document = select(cast(self.json_array().scalar_subquery(), Text))
+        return self._document
+
+    @property
+    def endpoint_path(self):
+        return f"/api{self.path}" if self.path else None
+
+    @property
+    def query_params(self):
+        """The query args this resource's endpoint reads"""
+        return (*self.filters, *(("limit", "cursor") if self.page_keys else ()))
+
+    def _paged(self, args):
+        return bool(self.page_keys) and ("limit" in args or "cursor" in args)
+
+    def empty_for(self, args=None):
+        """What to serve when the query fails (empty_on_error)"""
+        return {"items": [], "next": None} if args and self._paged(args) else self.empty()
+
+    def _branches(self, args):
+        """Filter conditions as alternatives, one equality per filter value.
+
+        A value list (?section=a,none) is answered as one index range scan per value
+        rather than an IN (...) OR IS NULL predicate, which no index can return in order.
+        """
+        branches = [()]
+        for param, column in self.filters.items():
+            raw = args.get(param)
+            if raw is None:
+                continue
+            values = {v.strip() for v in raw.split(",")}
+            conditions = [column == v for v in sorted(v for v in values if v and v != NONE_VALUE)]
+            if NONE_VALUE in values:
+                conditions.extend((column.is_(None), column == ""))
+            if conditions:
+                branches = [(*branch, condition) for branch in branches for condition in conditions]
+        return branches
+
+    def _page_size(self, args):
+        raw = args.get("limit")
+        if raw is None:
+            return DEFAULT_PAGE_SIZE
+        try:
+            size = int(raw)
+        except ValueError:
+            raise QueryArgError("limit must be an integer")
+        if not 1 <= size <= MAX_PAGE_SIZE:
+            raise QueryArgError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        return size
+
+    def statement_for(self, args):
+        """(stmt, page size) for a request's filter/paging args.
+
+        stmt is None when no filter or paging arg applies (fetch() serves those);
+        page size is None for unpaged results. Raises QueryArgError for invalid args.
+        """
+        paged = self._paged(args)
+        if not paged and not any(param in args for param in self.filters):
+            return None, None
+        keys = self.order_by  # the page keys, for resources that have them
+        size = self._page_size(args) if paged else None
+        limit = size + 1 if paged else self.limit
+        extra = ()
+        cursor = args.get("cursor") if paged else None
+        if cursor:
+            extra = (tuple_(*keys) > tuple_(*decode_cursor(cursor, len(keys))),)
+        branches = self._branches(args)
+        if len(branches) == 1:
+            stmt = select(*self.fields).where(*self.where, *branches[0], *extra)
+            if paged:
+                stmt = stmt.add_columns(*keys)  # key values ride after the serialized fields
+            stmt = stmt.order_by(*keys)
+            return (stmt.limit(limit) if limit is not None else stmt), size
+        # One index range scan per value, merged in key order: the scans stop after limit rows
+        labels = [f"_k{i}" for i in range(len(keys))]
+        labelled = [key.label(label) for key, label in zip(keys, labels)]
+        merged = union_all(*(
+            select(*self.fields, *labelled).where(*self.where, *branch, *extra) for branch in branches
+        ))
+        stmt = merged.order_by(*(merged.selected_columns[label] for label in labels))
+        return (stmt.limit(limit) if limit is not None else stmt), size
+
+    def fetch_for(self, conn, args):
+        """Payload for a request's query args.
+
+        Without filters or paging args this is fetch(). With limit/cursor (resources with
+        page_keys) it is {"items": [...], "next": cursor or null}; the cursor encodes the
+        last row's page key, so pages stay stable while rows are added or removed.
+        Raises QueryArgError for invalid args.
+        """
+        stmt, size = self.statement_for(args)
+        if stmt is None:
+            return self.fetch(conn)
+        serialize = self.serialize
+        if size is None:
+            return [serialize(row) for row in conn.execute(stmt)]
+        rows = conn.execute(stmt).all()
+        items = [serialize(row) for row in rows[:size]]
+        keys = len(self.page_keys)
+        next_cursor = encode_cursor(rows[size - 1][-keys:]) if len(rows) > size else None
+        return {"items": items, "next": next_cursor}
+
+
+def register(resource):
+    """Add resource to the registry; resources with a path get an endpoint"""
+    if resource.name in REGISTRY:
+        raise ValueError(f"Resource {resource.name!r} is already registered")
+    REGISTRY[resource.name] = resource
+    return resource
+
+
+def fetch_safely(resource, engine, args=None):
+    """resource.fetch (or fetch_for with query args) on its own connection, honouring empty_on_error"""
+    try:
+        return read_with_retry(engine, lambda conn: resource.fetch_for(conn, args) if args else resource.fetch(conn))
+    except QueryArgError:
+        raise
+    except Exception as e:
+        if not resource.empty_on_error:
+            raise
+        print(f"⚠️ {resource.name} query failed, serving empty list: {e}")
+        return resource.empty_for(args)
+
+
+@lru_cache(maxsize=64)
+def _batch_statement(names):
+    columns = []
+    for name in names:
+        for stmt, order_by in REGISTRY[name].statements:
+            columns.append(json_rows(stmt, order_by).label(f"r{len(columns)}"))
+    return select(*columns)
+
+
+def fetch_many(engine, resources):
+    """Payloads for several resources.
+
+    On Postgres every query of every resource is a scalar subquery of one SELECT,
+    so the whole batch is a single round trip. Elsewhere, or if that statement
+    fails (e.g. a table that does not exist yet), each resource is fetched on its own.
+    """
+    if engine.dialect.name == "postgresql":
+        try:
+            statement = _batch_statement(tuple(r.name for r in resources))
+            row = read_with_retry(engine, lambda conn: conn.execute(statement).one())
+        except Exception as e:
+            print(f"⚠️ Batch statement failed, fetching resources one by one: {e}")
+        else:
+            decoded = [_json_loads(value) for value in row]
+            payloads, start = [], 0
+            for resource in resources:
+                part = decoded[start:start + len(resource.statements)]
+                payloads.append(resource.assemble(part.__getitem__))
+                start += len(resource.statements)
+            return payloads
+    return [fetch_safely(resource, engine) for resource in resources]
+
+
+def _passthrough_json():
+    """True when the app's JSON responses are compact and unsorted, like Postgres' JSON text"""
+    provider = current_app.json
+    return isinstance(provider, FastJSONProvider) and provider.response_indent() is None
+
+
+def _document_response(resource, engine):
+    """Serve the Postgres-built JSON text as the body, without decoding it (JSON_DOCUMENT_ENGINE)"""
+    try:
+        json_text = read_with_retry(engine, lambda conn: conn.execute(resource.document).scalar_one())
+        body = json_text.encode("utf-8") + b"\n"
+    except Exception as e:
+        print(f"⚠️ {resource.name} JSON document failed, serializing in the app: {e}")
+        return None
+    if DOCUMENT_ENGINE == "verify":
+        expected = current_app.json.response(fetch_safely(resource, engine)).get_data()
+        if body != expected:
+            at = next((i for i, (a, b) in enumerate(zip(body, expected)) if a != b), min(len(body), len(expected)))
+            print(f"⚠️ {resource.name} JSON document differs at byte {at}: "
+                  f"{body[at:at + 40]!r} != {expected[at:at + 40]!r}")
+        body = expected
+    return Response(body, mimetype="application/json")
+
+
+def make_view(resource, engine):
+    document = bool(resource.children) and DOCUMENT_ENGINE in ("postgres", "verify")
+
+    def view():
+        filtered = any(param in request.args for param in resource.query_params)
+        if document and not filtered and engine.dialect.name == "postgresql" and _passthrough_json():
+            response = _document_response(resource, engine)
+            if response is not None:
+                return response
+        try:
+            return jsonify(fetch_safely(resource, engine, request.args))
+        except QueryArgError as e:
+            return jsonify({"error": str(e)}), 400
+
+    view.__name__ = f"get_{resource.name}"
+    view.__doc__ = resource.doc
+    return cached_response(*resource.models, params=resource.query_params)(view)
+
+
+def _batch_response(resources, engine):
+    """{name: payload, ...} spliced from each resource's cached body where there is one"""
+    bodies, missing = {}, []
+    for resource in resources:
+        tables = response_cache.tables_for(resource.models)
+        entry = None
+        if response_cache.ENABLED:
+            entry = response_cache.lookup(resource.endpoint_path, tables=tables)
+            if entry is None and shared_snapshot.ENABLED:
+                entry = shared_snapshot.lookup((resource.endpoint_path, b""), tables)
+        if entry is not None:
+            bodies[resource.name] = bytes(entry.body)  # spliced into one body below: copied either way
+        else:
+            missing.append((resource, tables, content_versions(tables)))
+    if missing:
+        payloads = fetch_many(engine, [resource for resource, _, _ in missing])
+        for (resource, tables, version), payload in zip(missing, payloads):
+            body = current_app.json.response(payload).get_data()
+            if response_cache.ENABLED:
+                # Same bytes the resource's own endpoint would cache, so it can serve them too
+                response_cache.ENDPOINT_TABLES.setdefault(resource.endpoint_path, tables)
+                response_cache.store((resource.endpoint_path, b""), version, body, "application/json")
+            bodies[resource.name] = body
+    dumps = current_app.json.dumps
+    parts = [f"{dumps(resource.path.lstrip('/'))}:".encode("utf-8") + bodies[resource.name].rstrip(b"\n")
+             for resource in resources]
+    return Response(b"{" + b",".join(parts) + b"}\n", mimetype="application/json")
+
+
+def make_batch_view(engine):
+    def batch():
+        """Several resources in one response: /api/batch?resources=pricing,settings,rooms"""
+        by_path = {r.path.lstrip("/"): r for r in REGISTRY.values() if r.path}
+        names = [n.strip() for n in request.args.get(BATCH_PARAM, "").split(",") if n.strip()]
+        unknown = [n for n in names if n not in by_path]
+        if not names or unknown:
+            return jsonify({
+                "error": f"Unknown resource(s): {', '.join(unknown)}" if unknown else f"'{BATCH_PARAM}' is required",
+                "available": sorted(by_path),
+            }), 400
+        resources = [by_path[n] for n in dict.fromkeys(names)]
+        if not response_cache.ENABLED:
+            return _batch_response(resources, engine)
+        models = [m for r in resources for m in r.models]
+        return response_cache.serve_cached(
+            response_cache.cache_key((BATCH_PARAM,)), response_cache.tables_for(models), lambda: _batch_response(resources, engine)
+        )
+    return batch
+
+
+def register_endpoints(target, engine):
+    """Add a GET rule to target (app or blueprint) for every registered resource with a path, plus /batch"""
+    for resource in REGISTRY.values():
+        if resource.path:
+            target.add_url_rule(resource.path, view_func=make_view(resource, engine), methods=["GET"])
+    target.add_url_rule("/batch", view_func=make_batch_view(engine), methods=["GET"])
+    return target
@@ -0,0 +1,74 @@
+"""
+Admin panel mounted under /admin as its own Flask app, imported on first use
+
+Workers that only serve the public JSON API never import the admin blueprint,
+Flask-Login, the Cloudinary SDK or password hashing. Flask does not allow
+blueprints to be registered once the app has served a request, so the panel is
+a separate WSGI app behind werkzeug's DispatcherMiddleware instead; it shares
+the public app's config (SECRET_KEY, so the session cookie) and templates.
+"""
+import threading
+
+
+def create_admin_app(parent):
+    """Flask app serving the admin blueprint at the mount point's root"""
+    from flask import Flask
+    from flask_login import LoginManager
+    from database import SessionLocal, engine
+    from models import Admin
+    from routes.admin_routes import admin_bp
+    from utils import metrics, request_timing
+    from utils.json_provider import init_json
+
+    app = Flask(parent.import_name, template_folder=parent.template_folder, static_folder=None)
+    app.config.from_mapping(parent.config)
+    init_json(app)
+    request_timing.install(app)
+    metrics.install(app, engine)
+
+    login_manager = LoginManager()
+    login_manager.init_app(app)
+    login_manager.login_view = "admin.login"
+    login_manager.login_message = "Please log in to access the admin panel."
+    login_manager.session_protection = "basic"  # Use basic to avoid redirect loops
+
+    @login_manager.user_loader
+    def load_user(user_id):
+        """Load user from database - must return None if user doesn't exist"""
+        s = SessionLocal()
+        try:
+            if not user_id:
+                return None
+            admin = s.query(Admin).get(int(user_id))
+            return admin
+        except (ValueError, TypeError, Exception):
+            return None
+        finally:
+            s.close()
+
+    # SCRIPT_NAME carries /admin, so url_for("admin.login") still builds /admin/login
+    app.register_blueprint(admin_bp, url_prefix="")
+    return app
+
+
+class LazyAdmin:
+    """WSGI app for /admin that builds the admin panel on its first request"""
+
+    def __init__(self, parent):
+        self.parent = parent
+        self._app = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._app is not None
+
+    def load(self):
+        if self._app is None:
+            with self._lock:
+                if self._app is None:
+                    self._app = create_admin_app(self.parent)
+        return self._app
+
+    def __call__(self, environ, start_response):
+        return self.load()(environ, start_response)
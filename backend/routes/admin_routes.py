@@ -25,6 +25,7 @@ from models import (
     GalleryImage,
 )
 from utils.cloudinary_upload import upload_image, upload_video
+from utils import content_version, slow_queries
 
 ALLOWED_IMAGE = {"image/jpeg", "image/png", "image/gif", "image/webp"}
 ALLOWED_VIDEO = {"video/mp4", "video/webm", "video/quicktime"}
@@ -67,6 +68,13 @@ def clear_settings_cache():
     _settings_cache_time = 0
 
 
+@content_version.subscribe
+def _clear_settings_cache_on_bump(tables):
+    # Also runs for bumps replayed from other workers (utils/invalidation_bus.py)
+    if SiteSettings.__tablename__ in tables:
+        clear_settings_cache()
+
+
 # ---------- Auth ----------
 
 
@@ -943,6 +951,27 @@ def settings():
         s.close()
 
 
+# ---------- Slow queries ----------
+
+
+@admin_bp.route("/slow-queries", methods=["GET", "POST"])
+@login_required
+def slow_queries_list():
+    """Statements over SLOW_QUERY_MS recorded by this worker (utils/slow_queries.py)"""
+    if request.method == "POST":
+        slow_queries.clear()
+        flash("Slow query log cleared.", "success")
+        return redirect(url_for("admin.slow_queries_list"))
+    return render_template(
+        "admin/slow_queries.html",
+        entries=slow_queries.entries(),
+        enabled=slow_queries.ENABLED,
+        threshold=slow_queries.THRESHOLD_MS,
+        buffer_size=slow_queries.BUFFER_SIZE,
+        pid=os.getpid(),
+    )
+
+
 # ---------- Rooms (list + images) ----------
 
 
@@ -0,0 +1,141 @@
+"""
+Public API through the Flask test client, on a throwaway SQLite database: keyset
+paging across the per-value UNION ALL branches of a filter, argument errors, and
+the cached payload's encodings and validators.
+
+Run from backend/:  python -m pytest tests  (or python -m unittest discover tests)
+"""
+import gzip
+import os
+import sys
+import tempfile
+import unittest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Before app (and database) are imported: they read these once
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="kalongo-api-test-"), "api.db")
+os.environ["RESPONSE_CACHE"] = "on"
+
+import database
+
+database.DATABASE_URL = os.environ["DATABASE_URL"]  # in case another test module imported it first
+
+from app import app
+from database import Base, SessionLocal, get_engine
+from models import GalleryImage
+from resources import MAX_PAGE_SIZE, encode_cursor
+from utils import response_cache
+from utils.compression import brotli
+
+SECTIONS = ["gallery", "our-kalongo", None, ""]
+
+
+def setUpModule():
+    Base.metadata.create_all(get_engine())
+    s = SessionLocal()
+    try:
+        # Orders repeat and skip, so pages break inside runs of equal order values
+        s.add_all([
+            GalleryImage(image_url=f"/img/{i}.jpg", caption=f"Photo {i} " + "x" * 80,
+                         section=SECTIONS[i % len(SECTIONS)], order=(i * 7) % 5 if i % 6 else None)
+            for i in range(40)
+        ])
+        s.commit()
+    finally:
+        s.close()
+
+
+def expected(sections):
+    """The rows ?section= should return, in (coalesce(order, 0), id) order"""
+    s = SessionLocal()
+    try:
+        rows = s.query(GalleryImage).all()
+    finally:
+        s.close()
+    keep = [row for row in rows if (row.section or "none") in sections]
+    return [row.id for row in sorted(keep, key=lambda row: (row.order or 0, row.id))]
+
+
+class KeysetPagingTest(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+
+    def traverse(self, query, limit):
+        ids, cursor, pages = [], None, 0
+        while True:
+            url = f"/api/gallery-images?{query}&limit={limit}" + (f"&cursor={cursor}" if cursor else "")
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            page = response.get_json()
+            self.assertLessEqual(len(page["items"]), limit)
+            ids.extend(item["id"] for item in page["items"])
+            pages += 1
+            cursor = page["next"]
+            if cursor is None:
+                return ids, pages
+
+    def test_every_row_once_across_branches(self):
+        for sections in (["gallery"], ["gallery", "our-kalongo"], ["none"], ["gallery", "none"],
+                         ["our-kalongo", "none", "gallery"]):
+            want = expected(sections)
+            for limit in (1, 3, 7, MAX_PAGE_SIZE):
+                with self.subTest(sections=sections, limit=limit):
+                    ids, pages = self.traverse("section=" + ",".join(sections), limit)
+                    self.assertEqual(ids, want)  # same order, no duplicates, no gaps
+                    self.assertEqual(pages, max(-(-len(want) // limit), 1))  # no trailing empty page
+
+    def test_unfiltered_pages_match_the_full_list(self):
+        ids, _ = self.traverse("", 9)
+        full = [item["id"] for item in self.client.get("/api/gallery-images").get_json()]
+        self.assertEqual(ids, full)
+
+    def test_bad_limit_or_cursor_is_400(self):
+        for query in ("limit=0", f"limit={MAX_PAGE_SIZE + 1}", "limit=ten", "limit=",
+                      "cursor=not-a-cursor", "limit=5&cursor=" + encode_cursor([1]),
+                      "cursor=" + encode_cursor(["1", 2]), "section=gallery&cursor=" + encode_cursor([True, 1])):
+            with self.subTest(query=query):
+                response = self.client.get(f"/api/gallery-images?{query}")
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("error", response.get_json())
+
+
+class EncodingTest(unittest.TestCase):
+    ENCODINGS = ["gzip", "br"] if brotli is not None else ["gzip"]
+
+    def setUp(self):
+        response_cache.clear()
+        self.client = app.test_client()
+        self.plain = self.client.get("/api/gallery-images", headers={"Accept-Encoding": "identity"})
+
+    def get(self, encoding, **headers):
+        return self.client.get("/api/gallery-images", headers={"Accept-Encoding": encoding, **headers})
+
+    def test_variants_decode_to_the_plain_body(self):
+        self.assertEqual(self.plain.status_code, 200)
+        self.assertIsNone(self.plain.headers.get("Content-Encoding"))
+        self.assertIn("Accept-Encoding", self.plain.vary)
+        decode = {"gzip": gzip.decompress, "br": brotli and brotli.decompress}
+        for encoding in self.ENCODINGS:
+            with self.subTest(encoding=encoding):
+                response = self.get(encoding)
+                self.assertEqual(response.headers.get("Content-Encoding"), encoding)
+                self.assertIn("Accept-Encoding", response.vary)
+                self.assertNotEqual(response.headers["ETag"], self.plain.headers["ETag"])
+                self.assertEqual(decode[encoding](response.get_data()), self.plain.get_data())
+
+    def test_matching_etag_is_304_for_each_encoding(self):
+        for encoding in ["identity", *self.ENCODINGS]:
+            with self.subTest(encoding=encoding):
+                etag = self.get(encoding).headers["ETag"]
+                response = self.get(encoding, **{"If-None-Match": etag})
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.get_data(), b"")
+                self.assertEqual(response.headers["ETag"], etag)
+                self.assertIn("Accept-Encoding", response.vary)
+                self.assertEqual(self.get(encoding, **{"If-None-Match": '"other"'}).status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
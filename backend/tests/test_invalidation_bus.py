@@ -0,0 +1,91 @@
+"""
+Invalidation bus across two real processes: LocalSocketBus instances in a shared
+directory, each with its own content versions.
+
+Run from backend/:  python -m pytest tests  (or python -m unittest discover tests)
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from utils import content_version, invalidation_bus
+
+# The peer: installs the local bus, then answers "state" on stdin with its versions and counters
+PEER = """
+import json, sys
+from utils import content_version, invalidation_bus
+invalidation_bus.install(None, backend="local")
+print("ready", flush=True)
+for line in sys.stdin:
+    state = {"versions": content_version.get_versions(["rooms", "reviews"]), **invalidation_bus.stats()}
+    print(json.dumps(state), flush=True)
+"""
+
+
+class LocalSocketBusTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="kalongo-bus-test-")
+        env = {**os.environ, "INVALIDATION_BUS_DIR": self.directory, "PYTHONPATH": BACKEND_DIR}
+        self.peer = subprocess.Popen([sys.executable, "-c", PEER], cwd=BACKEND_DIR, env=env, text=True,
+                                     stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self.assertEqual(self.peer.stdout.readline().strip(), "ready")
+        self.bus = invalidation_bus.LocalSocketBus(directory=self.directory)
+        self.bus.start()
+
+    def tearDown(self):
+        self.bus.stop()
+        self.peer.stdin.close()
+        self.peer.wait(timeout=10)
+
+    def peer_state(self):
+        self.peer.stdin.write("state\n")
+        self.peer.stdin.flush()
+        return json.loads(self.peer.stdout.readline())
+
+    def wait_for(self, condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while True:
+            state = self.peer_state()
+            if condition(state) or time.monotonic() > deadline:
+                return state
+            time.sleep(0.02)
+
+    def test_bump_reaches_the_peer(self):
+        before = self.peer_state()["versions"]
+        local_before = content_version.get_versions(["rooms"])
+        self.bus.publish({"rooms"})
+        state = self.wait_for(lambda s: s["received"] >= 1)
+
+        self.assertEqual(state["received"], 1)
+        self.assertEqual(state["versions"], [before[0] + 1, before[1]])
+        # Publishing does not bump the publisher: its own commit already did
+        self.assertEqual(content_version.get_versions(["rooms"]), local_before)
+        self.assertEqual(self.bus.counters["published"], 1)
+
+    def test_replay_is_not_published_again(self):
+        self.bus.publish({"rooms", "reviews"})
+        self.wait_for(lambda s: s["received"] >= 1)
+        time.sleep(0.2)  # room for an echo to arrive
+        state = self.peer_state()
+
+        # The peer applied the bump once and sent nothing back
+        self.assertEqual(state["received"], 1)
+        self.assertEqual(state["published"], 0)
+        self.assertEqual(self.bus.counters["received"], 0)
+
+    def test_own_messages_are_ignored(self):
+        before = content_version.get_versions(["rooms"])
+        self.bus.deliver(json.dumps({"origin": self.bus.origin, "tables": ["rooms"]}))
+        self.assertEqual(content_version.get_versions(["rooms"]), before)
+        self.assertEqual(self.bus.counters["received"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
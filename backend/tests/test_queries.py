@@ -0,0 +1,59 @@
+"""
+Read queries against SQLite: the SQL spellings of Python string checks in
+queries.py agree with the Python they stand for.
+
+Run from backend/:  python -m pytest tests  (or python -m unittest discover tests)
+"""
+import os
+import sys
+import unittest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from sqlalchemy import create_engine, insert
+
+import queries
+from database import Base
+from models import Activity, Review, Room, RoomImage
+
+# Blank to str.strip(), but not to SQL trim() without a character set
+BLANKS = ["", " ", "\t", "\n", " \t\r\n ", "\x0b\x0c", "\xa0", " "]
+URLS = ["/img/a.jpg", " /img/b.jpg\n"]
+
+
+class BlankStringTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine("sqlite://")
+        Base.metadata.create_all(cls.engine)
+        values = BLANKS + URLS
+        with cls.engine.begin() as conn:
+            conn.execute(insert(Room), [{"id": 1, "name": "Cabin", "slug": "cabin"}])
+            conn.execute(insert(RoomImage), [
+                {"room_id": 1, "image_url": url, "order": i} for i, url in enumerate(values)
+            ])
+            conn.execute(insert(Activity), [
+                {"name": f"a{i}", "image_url": url, "order": i} for i, url in enumerate(values + [None])
+            ])
+            conn.execute(insert(Review), [
+                {"customer_name": f"r{i}", "image_url": url, "order": i} for i, url in enumerate(values + [None])
+            ])
+
+    def fetch(self, loader):
+        with self.engine.connect() as conn:
+            return loader(conn)
+
+    def test_blank_image_urls_become_null(self):
+        for loader in (queries.activities, queries.reviews):
+            urls = [row["image_url"] for row in self.fetch(loader)]
+            expected = [url if url and url.strip() else None for url in BLANKS + URLS + [None]]
+            self.assertEqual(urls, expected)
+
+    def test_blank_room_images_are_skipped(self):
+        [room] = self.fetch(queries.rooms)
+        self.assertEqual([image["image_url"] for image in room["images"]], URLS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,9 +2,30 @@
 Cloudinary upload helpers for images and videos
 """
 import os
+import time
+from functools import wraps
 import cloudinary
 import cloudinary.uploader
 from flask import current_app
+from utils import metrics
+
+
+def _measured(kind):
+    """Record the upload's duration and outcome (kalongo_upload_* in /metrics)"""
+    def decorate(upload):
+        @wraps(upload)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = upload(*args, **kwargs)
+            except Exception:
+                metrics.inc("kalongo_upload_failures_total", kind=kind)
+                metrics.observe("kalongo_upload_duration_seconds", time.perf_counter() - started, kind=kind, outcome="error")
+                raise
+            metrics.observe("kalongo_upload_duration_seconds", time.perf_counter() - started, kind=kind, outcome="ok")
+            return result
+        return wrapper
+    return decorate
 
 
 def config_cloudinary():
@@ -16,6 +37,7 @@ def config_cloudinary():
     )
 
 
+@_measured("image")
 def upload_image(file, folder="kalongo"):
     """Upload image file to Cloudinary. Returns dict with 'url' or raises."""
     config_cloudinary()
@@ -28,6 +50,7 @@ def upload_image(file, folder="kalongo"):
     return result.get("secure_url")
 
 
+@_measured("video")
 def upload_video(file, folder="kalongo/videos"):
     """Upload video file to Cloudinary. Returns dict with 'url' or raises."""
     config_cloudinary()
@@ -40,6 +63,7 @@ def upload_video(file, folder="kalongo/videos"):
     return result.get("secure_url")
 
 
+@_measured("image_url")
 def upload_image_url(url, folder="kalongo"):
     """Upload from URL (e.g. form pasted URL). Returns secure_url."""
     config_cloudinary()
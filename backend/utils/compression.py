@@ -0,0 +1,46 @@
+"""
+Precompression of cached payloads (gzip always, brotli when installed)
+"""
+import gzip
+import hashlib
+import os
+
+try:
+    import brotli
+except ImportError:  # brotli is optional - gzip alone still covers every browser
+    brotli = None
+
+MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))  # bytes; smaller bodies go out as-is
+GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "9"))
+BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "9"))
+
+# Suffix appended to the ETag of each encoded variant (RFC 9110: distinct bytes, distinct tag)
+ETAG_SUFFIX = {"br": "-br", "gzip": "-gz"}
+
+
+def make_etag(body):
+    """Strong validator from the payload bytes: the same in every worker, different for every body"""
+    return hashlib.sha1(body).hexdigest()[:20]
+
+
+def compress_variants(body):
+    """Return {encoding: bytes} for every encoding worth sending for this body"""
+    if len(body) < MIN_SIZE:
+        return {}
+    variants = {"gzip": gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+    # Keep only variants that actually shrink the payload
+    return {enc: data for enc, data in variants.items() if len(data) < len(body)}
+
+
+def negotiate(accept_encodings, variants):
+    """Pick the encoding to send from the request's Accept-Encoding, or None for identity"""
+    best, best_q = None, 0
+    for enc in ("br", "gzip"):
+        if enc not in variants:
+            continue
+        q = accept_encodings.quality(enc)
+        if q > best_q:
+            best, best_q = enc, q
+    return best
@@ -0,0 +1,75 @@
+"""
+Content versions for public tables - bumped on every commit that writes to a table
+"""
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+_lock = threading.Lock()
+_versions = {}  # table name -> int, starts at 0
+_bumped_at = {}  # table name -> time.time() of the last bump
+_subscribers = []
+
+
+def get_versions(tables):
+    """Current version tuple for the given table names"""
+    return tuple(_versions.get(t, 0) for t in tables)
+
+
+def bumped_at(tables):
+    """Epoch seconds of the last bump of any of the tables in this process, 0 if never"""
+    return max([_bumped_at.get(t, 0) for t in tables] or [0])
+
+
+def bump(tables):
+    """Advance the version of each table and notify subscribers"""
+    tables = set(tables)
+    if not tables:
+        return
+    now = time.time()
+    with _lock:
+        for t in tables:
+            _versions[t] = _versions.get(t, 0) + 1
+            _bumped_at[t] = now
+    for callback in list(_subscribers):
+        try:
+            callback(tables)
+        except Exception as e:
+            print(f"⚠️ Content version subscriber failed: {e}")
+
+
+def subscribe(callback):
+    """Call callback(tables) after every bump"""
+    _subscribers.append(callback)
+    return callback
+
+
+def snapshot():
+    """Copy of all table versions (for stats endpoints)"""
+    with _lock:
+        return dict(_versions)
+
+
+def _record_write(mapper, connection, target):
+    s = object_session(target)
+    if s is not None:
+        s.info.setdefault("changed_tables", set()).add(str(mapper.local_table.name))
+
+
+def track_content_changes(base):
+    """Install write listeners on every model derived from base"""
+    for name in ("after_insert", "after_update", "after_delete"):
+        event.listen(base, name, _record_write, propagate=True)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_after_commit(session):
+    changed = session.info.pop("changed_tables", None)
+    if changed:
+        bump(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("changed_tables", None)
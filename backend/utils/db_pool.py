@@ -0,0 +1,171 @@
+"""
+Connection pool instrumentation, background liveness checks and retry on disconnect
+
+InstrumentedQueuePool times every checkout (pre-ping included) and the part of it
+spent waiting in _do_get for a free or new connection, and keeps the peaks of
+connections in use and overflow. install() adds counters for pre-ping failures,
+disconnects and invalidations; stats() backs /internal/pool-stats.
+
+POOL_LIVENESS=pre_ping   ping every connection on checkout (one extra round trip per checkout)
+POOL_LIVENESS=background no pre-ping; a thread runs SELECT 1 every POOL_LIVENESS_INTERVAL
+                         seconds, and a disconnect error invalidates the whole pool, so a
+                         database restart is noticed before requests hit dead connections.
+                         A read that still gets one is retried once (read_with_retry).
+"""
+import os
+import threading
+import time
+from sqlalchemy import event, exc, text
+from sqlalchemy.pool import QueuePool
+from utils import metrics, request_timing
+
+LIVENESS = os.getenv("POOL_LIVENESS", "pre_ping").lower()
+LIVENESS_INTERVAL = float(os.getenv("POOL_LIVENESS_INTERVAL", "10"))
+SLOW_WAIT_MS = 1.0  # checkouts that waited longer than this count as waited
+
+_INITIAL = {
+    "checkouts": 0, "checkout_ms_total": 0.0, "checkout_ms_max": 0.0,
+    "waited": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0,
+    "connects": 0, "connect_ms_total": 0.0, "timeouts": 0,
+    "peak_checked_out": 0, "peak_overflow": 0,
+    "pre_ping_failures": 0, "disconnects": 0, "invalidations": 0, "retries": 0,
+    "liveness_checks": 0, "liveness_failures": 0, "liveness_last_ok": None,
+}
+_lock = threading.Lock()
+_stats = dict(_INITIAL)
+_liveness_pid = None
+
+
+def _add(**values):
+    with _lock:
+        for key, value in values.items():
+            _stats[key] += value
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records checkout latency, wait time and peak usage"""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            _add(timeouts=1)
+            raise
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            request_timing.add("pool", elapsed)
+            metrics.observe("kalongo_db_pool_checkout_seconds", elapsed / 1000)
+            checked_out, overflow = self.checkedout(), max(self.overflow(), 0)
+            with _lock:
+                _stats["checkouts"] += 1
+                _stats["checkout_ms_total"] += elapsed
+                _stats["checkout_ms_max"] = max(_stats["checkout_ms_max"], elapsed)
+                _stats["peak_checked_out"] = max(_stats["peak_checked_out"], checked_out)
+                _stats["peak_overflow"] = max(_stats["peak_overflow"], overflow)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            if elapsed > SLOW_WAIT_MS:
+                with _lock:
+                    _stats["waited"] += 1
+                    _stats["wait_ms_total"] += elapsed
+                    _stats["wait_ms_max"] = max(_stats["wait_ms_max"], elapsed)
+
+    def _create_connection(self):
+        started = time.perf_counter()
+        record = super()._create_connection()
+        _add(connects=1, connect_ms_total=(time.perf_counter() - started) * 1000)
+        return record
+
+
+@event.listens_for(InstrumentedQueuePool, "invalidate")
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    _add(invalidations=1)
+
+
+def _on_error(context):
+    if getattr(context, "is_pre_ping", False):
+        _add(pre_ping_failures=1)
+    elif context.is_disconnect:
+        _add(disconnects=1)
+
+
+def _check_liveness(engine):
+    while True:
+        time.sleep(LIVENESS_INTERVAL)
+        _add(liveness_checks=1)
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            _stats["liveness_last_ok"] = time.time()
+        except Exception as e:
+            # A disconnect has already invalidated the pool; the next checkout reconnects
+            _add(liveness_failures=1)
+            print(f"⚠️ Pool liveness check failed: {e}")
+
+
+def start_liveness(engine):
+    """Start the liveness thread in this process (again after a fork); POOL_LIVENESS=background only"""
+    global _liveness_pid
+    if LIVENESS != "background" or _liveness_pid == os.getpid():
+        return
+    _liveness_pid = os.getpid()
+    threading.Thread(target=_check_liveness, args=(engine,), name="pool-liveness", daemon=True).start()
+
+
+def install(engine):
+    """Count pre-ping failures and disconnects on engine; start the liveness thread if configured"""
+    event.listen(engine, "handle_error", _on_error)
+    start_liveness(engine)
+
+
+def read_with_retry(engine, work):
+    """work(conn) on a pooled connection, run once more if that connection turned out to be dead.
+
+    Only for reads: the first attempt may have done part of its work before failing.
+    """
+    try:
+        with engine.connect() as conn:
+            return work(conn)
+    except exc.DBAPIError as e:
+        if not e.connection_invalidated:
+            raise
+    _add(retries=1)
+    with engine.connect() as conn:
+        return work(conn)
+
+
+def _after_fork():
+    # Counters are per process; a worker starts from zero and with a lock nobody holds
+    global _lock, _stats
+    _lock = threading.Lock()
+    _stats = dict(_INITIAL)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def stats(engine):
+    pool = engine.pool
+    with _lock:
+        counters = {key: round(value, 3) if isinstance(value, float) else value for key, value in _stats.items()}
+    checkouts, waited = counters["checkouts"], counters["waited"]
+    counters["checkout_ms_avg"] = round(counters["checkout_ms_total"] / checkouts, 3) if checkouts else None
+    counters["wait_ms_avg"] = round(counters["wait_ms_total"] / waited, 3) if waited else None
+    current = {"class": type(pool).__name__, "liveness": LIVENESS}
+    if isinstance(pool, QueuePool):
+        current.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            pre_ping=pool._pre_ping,
+        )
+    return {"pid": os.getpid(), **current, **counters}
@@ -0,0 +1,72 @@
+"""
+Background database probe behind /health, /health/ready
+
+A daemon thread runs SELECT 1 every HEALTH_PROBE_INTERVAL seconds and keeps the
+last result, so health checks read a dict instead of opening a connection (which
+can hang a request thread for connect_timeout when the database is slow). A probe
+result older than STALE_AFTER means the probe itself is stuck: not ready.
+"""
+import os
+import threading
+import time
+from sqlalchemy import text
+
+INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", "5"))
+STALE_AFTER = 3 * INTERVAL
+
+_last = {"ok": None, "checked_at": None, "latency_ms": None, "last_success": None, "error": None, "failures": 0}
+_pid = None
+
+
+def probe(engine):
+    """Run one SELECT 1 and record the result; True when it succeeded"""
+    global _last
+    started = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        error = None
+    except Exception as e:
+        error = str(e).splitlines()[0][:200] if str(e) else type(e).__name__
+    now = time.time()
+    latency = round((time.perf_counter() - started) * 1000, 1)
+    # One new dict per probe, so readers never see half an update
+    _last = {
+        "ok": error is None,
+        "checked_at": now,
+        "latency_ms": latency,
+        "last_success": now if error is None else _last["last_success"],
+        "error": error,
+        "failures": 0 if error is None else _last["failures"] + 1,
+    }
+    return error is None
+
+
+def _run(engine):
+    while True:
+        probe(engine)
+        time.sleep(INTERVAL)
+
+
+def start(engine):
+    """Start probing in this process (again after a fork); safe to call repeatedly"""
+    global _pid
+    if _pid == os.getpid():
+        return
+    _pid = os.getpid()
+    threading.Thread(target=_run, args=(engine,), name="health-probe", daemon=True).start()
+
+
+def database():
+    """Last probe result, plus whether it is current"""
+    last = _last
+    age = time.time() - last["checked_at"] if last["checked_at"] else None
+    return {**last, "age_s": round(age, 1) if age is not None else None, "stale": age is None or age > STALE_AFTER}
+
+
+def database_status():
+    """connected, disconnected or unknown (no current probe result yet)"""
+    db = database()
+    if db["stale"]:
+        return "unknown"
+    return "connected" if db["ok"] else "disconnected"
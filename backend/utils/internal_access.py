@@ -0,0 +1,51 @@
+"""
+Access to the operational endpoints (/internal/*, /metrics)
+
+They show per-route timings, pool state and content versions, so they are not
+public. A request passes with the admin panel's login (the panel shares the
+session cookie) or with `Authorization: Bearer <INTERNAL_TOKEN>`, which is what a
+Prometheus scrape job or a curl from the host sends. Without INTERNAL_TOKEN only
+a logged-in admin gets through.
+"""
+import hmac
+import os
+from functools import wraps
+from flask import jsonify, request, session
+
+TOKEN = os.getenv("INTERNAL_TOKEN", "")
+
+
+def _has_token():
+    header = request.headers.get("Authorization", "")
+    return bool(TOKEN) and hmac.compare_digest(header.encode(), f"Bearer {TOKEN}".encode())
+
+
+def _is_admin():
+    """Flask-Login's user id in the session, still naming an admin"""
+    user_id = session.get("_user_id")
+    if not user_id:
+        return False
+    from database import SessionLocal
+    from models import Admin
+
+    s = SessionLocal()
+    try:
+        return s.get(Admin, int(user_id)) is not None
+    except (ValueError, TypeError):
+        return False
+    finally:
+        s.close()
+
+
+def allowed():
+    return _has_token() or _is_admin()
+
+
+def internal(view):
+    """Serve view only to the admin or the INTERNAL_TOKEN holder; 403 otherwise"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not allowed():
+            return jsonify({"error": "Forbidden"}), 403
+        return view(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,267 @@
+"""
+Cross-process invalidation bus - broadcasts content-version bumps to every worker
+
+Each commit bumps the versions of the tables it wrote in its own process only
+(utils/content_version.py), so other gunicorn workers kept serving cached
+payloads until their TTL ran out. With the bus on, every bump is published and
+the other processes replay it, which invalidates their response cache, settings
+cache and read models within milliseconds.
+
+INVALIDATION_BUS=postgres  LISTEN/NOTIFY on INVALIDATION_BUS_CHANNEL (every host sharing the database)
+INVALIDATION_BUS=local     Unix datagram sockets in INVALIDATION_BUS_DIR (processes on one machine, tests)
+INVALIDATION_BUS=off       default
+"""
+import atexit
+import json
+import os
+import re
+import select
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from sqlalchemy import text
+from utils import content_version
+
+BACKEND = os.getenv("INVALIDATION_BUS", "off").lower()
+CHANNEL = os.getenv("INVALIDATION_BUS_CHANNEL", "kalongo_invalidate")
+LOCAL_DIR = os.getenv("INVALIDATION_BUS_DIR", os.path.join(tempfile.gettempdir(), "kalongo-bus"))
+RECONNECT_MAX_DELAY = 30  # seconds between LISTEN reconnect attempts, at most
+
+_state = threading.local()
+_bus = None
+
+
+def receiving():
+    """True while a bump received from another process is being applied on this thread"""
+    return getattr(_state, "receiving", False)
+
+
+def _zero_counters():
+    return {"published": 0, "received": 0, "publish_errors": 0, "reconnects": 0}
+
+
+def stats():
+    """This process's bus counters"""
+    return {"backend": _bus.name if _bus else "off", **(_bus.counters if _bus else _zero_counters())}
+
+
+class Bus:
+    """Publish this process's bumps, replay everyone else's"""
+
+    name = "base"
+
+    def __init__(self, all_tables=()):
+        self.all_tables = set(all_tables)
+        self.origin = None
+        self.counters = _zero_counters()
+        self._pid = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Start listening in this process (again after a fork); safe to call repeatedly"""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self.counters = _zero_counters()  # a forked worker counts its own messages
+        self.origin = f"{socket.gethostname()}:{self._pid}:{uuid.uuid4().hex[:8]}"
+        self._stopped.clear()
+        self._listen_setup()
+        threading.Thread(target=self._listen, name=f"invalidation-bus-{self.name}", daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def publish(self, tables):
+        payload = json.dumps({"origin": self.origin, "tables": sorted(tables)}, separators=(",", ":"))
+        try:
+            self._send(payload)
+            self.counters["published"] += 1
+        except Exception as e:
+            self.counters["publish_errors"] += 1
+            print(f"⚠️ Invalidation bus publish failed: {e}")
+
+    def deliver(self, payload):
+        try:
+            message = json.loads(payload)
+            origin, tables = message["origin"], set(message["tables"])
+        except (ValueError, KeyError, TypeError):
+            print(f"⚠️ Invalidation bus ignored a malformed message: {payload!r:.200}")
+            return
+        if origin != self.origin and tables:
+            self.counters["received"] += 1
+            apply_remote(tables)
+
+    def resync(self):
+        """Messages may have been missed (listener was down): treat every table as changed"""
+        self.counters["reconnects"] += 1
+        if self.all_tables:
+            apply_remote(self.all_tables)
+
+    def _listen_setup(self):
+        pass
+
+    def _listen(self):
+        raise NotImplementedError
+
+    def _send(self, payload):
+        raise NotImplementedError
+
+
+class PostgresBus(Bus):
+    """NOTIFY on publish; a dedicated connection outside the pool LISTENs"""
+
+    name = "postgres"
+
+    def __init__(self, engine, channel=CHANNEL, all_tables=()):
+        super().__init__(all_tables)
+        if not re.fullmatch(r"[a-z_][a-z0-9_]*", channel):
+            raise ValueError(f"INVALIDATION_BUS_CHANNEL must be a lowercase identifier, got {channel!r}")
+        self.engine = engine
+        self.channel = channel
+
+    def _send(self, payload):
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": self.channel, "payload": payload})
+            conn.commit()
+
+    def _connect(self):
+        cargs, cparams = self.engine.dialect.create_connect_args(self.engine.url)
+        conn = self.engine.dialect.connect(*cargs, **cparams)
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute(f"LISTEN {self.channel}")
+        return conn
+
+    def _listen(self):
+        delay, failed = 1, False
+        while not self._stopped.is_set():
+            conn = None
+            try:
+                conn = self._connect()
+                if failed:
+                    self.resync()
+                delay, failed = 1, False
+                while not self._stopped.is_set():
+                    if select.select([conn], [], [], 5.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self.deliver(conn.notifies.pop(0).payload)
+            except Exception as e:
+                failed = True
+                print(f"⚠️ Invalidation bus LISTEN failed, retrying in {delay}s: {e}")
+                self._stopped.wait(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+
+class LocalSocketBus(Bus):
+    """One Unix datagram socket per process in a shared directory; publish sends to all the others"""
+
+    name = "local"
+
+    def __init__(self, directory=LOCAL_DIR, all_tables=()):
+        super().__init__(all_tables)
+        self.directory = directory
+        self.path = None
+        self._sock = None
+
+    def _listen_setup(self):
+        os.makedirs(self.directory, exist_ok=True)
+        if self._sock is not None:
+            self._sock.close()  # inherited from the parent process
+        self.path = os.path.join(self.directory, f"{self._pid}.sock")
+        try:
+            os.unlink(self.path)  # left behind by an earlier process with the same pid
+        except FileNotFoundError:
+            pass
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(self.path)
+        atexit.register(self.stop)
+
+    def _listen(self):
+        sock = self._sock
+        while not self._stopped.is_set():
+            try:
+                data = sock.recv(65536)
+            except OSError:
+                if self._stopped.is_set() or sock is not self._sock:
+                    return
+                time.sleep(0.1)
+                continue
+            self.deliver(data.decode("utf-8"))
+
+    def _send(self, payload):
+        data = payload.encode("utf-8")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as out:
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                if not name.endswith(".sock") or path == self.path:
+                    continue
+                try:
+                    out.sendto(data, path)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # Process is gone; drop its socket file
+                    try:
+                        os.unlink(path)
+                    except OSError:
+                        pass
+
+    def stop(self):
+        super().stop()
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        if self.path:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
+def apply_remote(tables):
+    """Bump tables as if committed here; subscribers can tell with receiving()"""
+    _state.receiving = True
+    try:
+        content_version.bump(tables)
+    finally:
+        _state.receiving = False
+
+
+def _publish_bump(tables):
+    if _bus is not None and not receiving():
+        _bus.start()  # no-op unless this process was forked after install()
+        _bus.publish(tables)
+
+
+def install(engine, all_tables=(), backend=None):
+    """Create and start the configured bus (None when off); call once per app"""
+    global _bus
+    backend = (backend or BACKEND).lower()
+    if backend in ("off", "", "0", "false"):
+        return None
+    if backend == "postgres":
+        if engine.dialect.name != "postgresql":
+            print(f"⚠️ INVALIDATION_BUS=postgres needs a Postgres database, not {engine.dialect.name}; bus disabled")
+            return None
+        _bus = PostgresBus(engine, all_tables=all_tables)
+    elif backend == "local":
+        _bus = LocalSocketBus(all_tables=all_tables)
+    else:
+        raise ValueError(f"Unknown INVALIDATION_BUS {backend!r} (postgres, local or off)")
+    _bus.start()
+    content_version.subscribe(_publish_bump)
+    return _bus
+
+
+def start():
+    """Start the listener in this process - for servers that fork workers after install()"""
+    if _bus is not None:
+        _bus.start()
@@ -0,0 +1,83 @@
+"""
+JSON provider for jsonify - uses orjson when installed, stdlib json otherwise
+"""
+import json
+import os
+from datetime import date, datetime
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - stdlib json is the fallback
+    orjson = None
+
+# JSON_PROVIDER=stdlib forces Flask's stock behaviour (sorted keys, stdlib encoder)
+MODE = os.getenv("JSON_PROVIDER", "fast").lower()
+
+
+def _default(o):
+    # Same ISO 8601 output orjson produces for datetime/date, so both backends agree
+    if isinstance(o, (datetime, date)):
+        return o.isoformat()
+    return DefaultJSONProvider.default(o)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Compact, unsorted JSON for API responses.
+
+    orjson serializes dicts, lists (e.g. ``Room.features``), bools and datetimes
+    natively and returns bytes, so responses skip the str -> bytes round trip.
+    """
+
+    default = staticmethod(_default)
+    ensure_ascii = False
+    sort_keys = False
+
+    def _orjson_option(self, indent=None):
+        # stdlib json accepts str subclasses (e.g. SQLAlchemy's quoted_name) as keys; orjson only with this flag
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps_bytes(self, obj, indent=None):
+        """Serialize obj to UTF-8 JSON bytes"""
+        if orjson is not None:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_option(indent))
+        separators = None if indent else (",", ":")
+        return json.dumps(
+            obj, default=self.default, ensure_ascii=self.ensure_ascii,
+            sort_keys=self.sort_keys, indent=indent, separators=separators,
+        ).encode("utf-8")
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            kwargs.setdefault("default", self.default)
+            kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+            kwargs.setdefault("sort_keys", self.sort_keys)
+            return json.dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response_indent(self):
+        """Indent used by response(): 2 in debug mode (or compact=False), None for compact output"""
+        return 2 if (self.compact is None and self._app.debug) or self.compact is False else None
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            self.dumps_bytes(obj, indent=self.response_indent()) + b"\n", mimetype=self.mimetype
+        )
+
+
+def init_json(app):
+    """Install the JSON provider on app; blueprints' jsonify calls go through it too"""
+    if MODE != "stdlib":
+        app.json = FastJSONProvider(app)
+    return app.json
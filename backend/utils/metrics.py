@@ -0,0 +1,303 @@
+"""
+Prometheus metrics for /metrics, aggregated across gunicorn workers
+
+Each process records into its own registry (one short lock per observation) and a
+daemon thread writes it to METRICS_DIR/<pid>.json every FLUSH_INTERVAL seconds.
+The worker that answers /metrics adds up every file: counters and histograms of
+all workers, including exited ones (their totals must not go backwards), gauges
+only of live ones, labelled with their pid. gunicorn.conf.py empties the
+directory when the server starts.
+
+Recorded here: request latency per endpoint/method/status, statement count and
+duration per kind, pool checkout time and Cloudinary uploads. Collected at flush:
+response cache counters, pool events and pool gauges. Enable with METRICS=on;
+when off, observe()/inc() return at once and no hook is installed.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+ENABLED = os.getenv("METRICS", "off").lower() in ("1", "true", "on")
+DIRECTORY = os.getenv("METRICS_DIR", os.path.join(tempfile.gettempdir(), "kalongo-metrics"))
+FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+UPLOAD_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# name -> (type, help, buckets)
+METRICS = {
+    "kalongo_http_request_duration_seconds": ("histogram", "Request latency by endpoint, method and status", LATENCY_BUCKETS),
+    "kalongo_db_statement_duration_seconds": ("histogram", "SQL statement duration by kind", DB_BUCKETS),
+    "kalongo_db_pool_checkout_seconds": ("histogram", "Time to check a connection out of the pool", DB_BUCKETS),
+    "kalongo_upload_duration_seconds": ("histogram", "Cloudinary upload duration by kind and outcome", UPLOAD_BUCKETS),
+    "kalongo_upload_failures_total": ("counter", "Cloudinary uploads that raised", None),
+    "kalongo_response_cache_events_total": ("counter", "Response cache lookups and stores by event", None),
+    "kalongo_db_pool_events_total": ("counter", "Pool timeouts, pre-ping failures, disconnects, invalidations, retries", None),
+    "kalongo_db_pool_connections": ("gauge", "Pool connections by state, per worker", None),
+}
+
+_lock = threading.Lock()
+_counters = {}  # (name, labels) -> value
+_histograms = {}  # (name, labels) -> [count per bucket..., +Inf count, sum]
+_flusher_pid = None
+_quiet = False  # set by discard(): this process keeps no file
+_engine = None
+
+
+def _labels(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def inc(name, amount=1, **labels):
+    if not ENABLED:
+        return
+    _start_flusher()
+    key = (name, _labels(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def observe(name, seconds, **labels):
+    """Add one observation to histogram name"""
+    if not ENABLED:
+        return
+    _start_flusher()
+    buckets = METRICS[name][2]
+    key = (name, _labels(labels))
+    # Index of the first bucket the value fits in (len(buckets) is +Inf)
+    index = next((i for i, bound in enumerate(buckets) if seconds <= bound), len(buckets))
+    with _lock:
+        values = _histograms.get(key)
+        if values is None:
+            values = _histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+        values[index] += 1
+        values[-1] += seconds
+
+
+# ---------- Hooks ----------
+
+
+def _before_request():
+    g.metrics_started = time.perf_counter()
+
+
+def _after_request(response):
+    started = g.pop("metrics_started", None)
+    if started is not None:
+        observe("kalongo_http_request_duration_seconds", time.perf_counter() - started,
+                endpoint=request.endpoint or "unmatched", method=request.method, status=response.status_code)
+    return response
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["metrics_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("metrics_started", None)
+    if started is not None:
+        kind = statement.lstrip()[:6].lower()
+        if kind not in ("select", "insert", "update", "delete"):
+            kind = "other"
+        observe("kalongo_db_statement_duration_seconds", time.perf_counter() - started, kind=kind)
+
+
+def install(app, engine):
+    """Time app's requests and every engine's statements (METRICS=on).
+
+    Called for the public app and for the admin panel's app when it is built.
+    """
+    global _engine
+    if not ENABLED:
+        return
+    _engine = engine
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ---------- Per-process snapshot files ----------
+
+
+def _collected():
+    """(counters, gauges) read from the modules' own stats at flush time"""
+    from utils import db_pool, response_cache
+
+    counters, gauges = [], []
+    cache = response_cache.stats()
+    for name in ("hits", "shared_hits", "misses", "stores", "evictions", "not_modified"):
+        counters.append(("kalongo_response_cache_events_total", [["event", name]], cache[name]))
+    if _engine is not None and getattr(_engine, "created", True):  # stats must not create the lazy engine
+        pool = db_pool.stats(_engine)
+        for name in ("timeouts", "pre_ping_failures", "disconnects", "invalidations", "retries"):
+            counters.append(("kalongo_db_pool_events_total", [["event", name]], pool[name]))
+        for state in ("checked_out", "checked_in", "overflow"):
+            if state in pool:
+                gauges.append(("kalongo_db_pool_connections", [["state", state]], pool[state]))
+    return counters, gauges
+
+
+def snapshot():
+    """This process's metrics in the file format"""
+    with _lock:
+        counters = [[name, [list(pair) for pair in labels], value] for (name, labels), value in _counters.items()]
+        histograms = [[name, [list(pair) for pair in labels], list(values)] for (name, labels), values in _histograms.items()]
+    collected_counters, gauges = _collected()
+    counters.extend([name, labels, value] for name, labels, value in collected_counters)
+    return {
+        "pid": os.getpid(),
+        "written_at": time.time(),
+        "counters": counters,
+        "histograms": histograms,
+        "gauges": [[name, labels, value] for name, labels, value in gauges],
+    }
+
+
+def flush():
+    """Write this process's snapshot to METRICS_DIR/<pid>.json, atomically"""
+    os.makedirs(DIRECTORY, exist_ok=True)
+    path = os.path.join(DIRECTORY, f"{os.getpid()}.json")
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(snapshot(), f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def _flush_loop():
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        if _quiet:
+            continue
+        try:
+            flush()
+        except Exception as e:
+            print(f"⚠️ Metrics flush failed: {e}")
+
+
+def _start_flusher():
+    global _flusher_pid
+    if _flusher_pid == os.getpid():
+        return
+    _flusher_pid = os.getpid()
+    threading.Thread(target=_flush_loop, name="metrics-flush", daemon=True).start()
+
+
+def discard():
+    """Drop this process's metrics and file - the gunicorn master after its warm-up requests"""
+    global _quiet, _counters, _histograms
+    _quiet = True
+    with _lock:
+        _counters, _histograms = {}, {}
+    try:
+        os.unlink(os.path.join(DIRECTORY, f"{os.getpid()}.json"))
+    except OSError:
+        pass
+
+
+def _after_fork():
+    # A worker starts with an empty registry (its own pid file) and a lock nobody holds
+    global _lock, _counters, _histograms, _quiet
+    _lock = threading.Lock()
+    _counters, _histograms = {}, {}
+    _quiet = False
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def reset_directory():
+    """Remove every worker's file - call once when the server starts"""
+    if not ENABLED or not os.path.isdir(DIRECTORY):
+        return
+    for name in os.listdir(DIRECTORY):
+        if name.endswith(".json") or name.endswith(".tmp"):
+            try:
+                os.unlink(os.path.join(DIRECTORY, name))
+            except OSError:
+                pass
+
+
+# ---------- Exposition ----------
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+def _load_all():
+    """Every worker's snapshot; this process's is taken live"""
+    own = snapshot()
+    snapshots = [own]
+    if os.path.isdir(DIRECTORY):
+        for name in os.listdir(DIRECTORY):
+            if not name.endswith(".json") or name == f"{own['pid']}.json":
+                continue
+            try:
+                with open(os.path.join(DIRECTORY, name)) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # being replaced, or unreadable
+    return snapshots
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def render():
+    """Prometheus text exposition (version 0.0.4) of every worker's metrics"""
+    counters, histograms, gauges = {}, {}, {}
+    for snap in _load_all():
+        for name, labels, value in snap["counters"]:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, values in snap["histograms"]:
+            key = (name, tuple(map(tuple, labels)))
+            total = histograms.setdefault(key, [0] * len(values))
+            for i, value in enumerate(values):
+                total[i] += value
+        if _alive(snap["pid"]):
+            for name, labels, value in snap["gauges"]:
+                gauges[(name, tuple(map(tuple, labels)) + (("pid", str(snap["pid"])),))] = value
+
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "histogram":
+            for (metric, labels), values in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(list(buckets) + ["+Inf"], values[:-1]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', str(bound)),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {values[-1]}")
+                lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        else:
+            source = counters if kind == "counter" else gauges
+            for (metric, labels), value in sorted(source.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,162 @@
+"""
+Per-request timing: Server-Timing header, per-route latency, sampled log lines
+
+With REQUEST_TIMING=on every response carries
+
+  Server-Timing: pool;dur=0.2, db;dur=8.4, db_count;desc="5", serialize;dur=1.1, app;dur=3.0, total;dur=12.7
+
+pool is connection checkout (pre-ping included), db the time between SQLAlchemy's
+before/after_cursor_execute, serialize the JSON provider's response(), app the rest
+(view code, row processing, cache lookups). The numbers live on a context variable,
+so the homepage fan-out threads add to the request that started them when they run
+in a copy of its context (queries.homepage_data_parallel). Their times are summed,
+so pool + db can exceed total for that endpoint; app is then 0.
+
+Per-route totals are served by /internal/request-timings, the admin panel's
+routes under /admin. A request is logged with
+probability REQUEST_TIMING_LOG_SAMPLE, and always when slower than REQUEST_TIMING_SLOW_MS.
+Off by default: install() then registers nothing and add() finds no request.
+"""
+import contextvars
+import os
+import random
+import threading
+import time
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+ENABLED = os.getenv("REQUEST_TIMING", "off").lower() in ("1", "true", "on")
+LOG_SAMPLE = float(os.getenv("REQUEST_TIMING_LOG_SAMPLE", "0.01"))
+SLOW_MS = float(os.getenv("REQUEST_TIMING_SLOW_MS", "1000"))
+
+_current = contextvars.ContextVar("request_timing", default=None)
+_routes = {}  # (method, rule) -> RouteStats
+_routes_lock = threading.Lock()
+
+
+class Timing:
+    """Accumulated milliseconds for one request; fan-out threads add to it concurrently"""
+
+    __slots__ = ("started", "pool", "db", "db_count", "serialize", "_lock")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.pool = self.db = self.serialize = 0.0
+        self.db_count = 0
+        self._lock = threading.Lock()
+
+    def add(self, name, ms):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + ms)
+            if name == "db":
+                self.db_count += 1
+
+
+class RouteStats:
+    __slots__ = ("count", "total_ms", "max_ms", "db_ms", "db_count", "serialize_ms")
+
+    def __init__(self):
+        self.count = self.db_count = 0
+        self.total_ms = self.max_ms = self.db_ms = self.serialize_ms = 0.0
+
+
+def add(name, ms):
+    """Add ms to the current request's pool, db or serialize time (no-op outside a timed request)"""
+    timing = _current.get()
+    if timing is not None:
+        timing.add(name, ms)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info["request_timing_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("request_timing_started", None)
+    if started is not None:
+        add("db", (time.perf_counter() - started) * 1000)
+
+
+def _before_request():
+    g.request_timing_token = _current.set(Timing())
+
+
+def _after_request(response):
+    timing = _current.get()
+    if timing is None:
+        return response
+    total = (time.perf_counter() - timing.started) * 1000
+    other = max(total - timing.pool - timing.db - timing.serialize, 0.0)
+    response.headers["Server-Timing"] = (
+        f"pool;dur={timing.pool:.1f}, db;dur={timing.db:.1f}, db_count;desc=\"{timing.db_count}\", "
+        f"serialize;dur={timing.serialize:.1f}, app;dur={other:.1f}, total;dur={total:.1f}"
+    )
+    # script_root is /admin for the panel's app, so its rules do not merge with the API's
+    rule = request.script_root + request.url_rule.rule if request.url_rule else "(unmatched)"
+    with _routes_lock:
+        stats = _routes.get((request.method, rule))
+        if stats is None:
+            stats = _routes[(request.method, rule)] = RouteStats()
+        stats.count += 1
+        stats.total_ms += total
+        stats.max_ms = max(stats.max_ms, total)
+        stats.db_ms += timing.db
+        stats.db_count += timing.db_count
+        stats.serialize_ms += timing.serialize
+    if total > SLOW_MS or random.random() < LOG_SAMPLE:
+        print(f"⏱️ {request.method} {request.full_path.rstrip('?')} {response.status_code} {total:.1f} ms "
+              f"(pool {timing.pool:.1f}, db {timing.db:.1f} in {timing.db_count} queries, "
+              f"serialize {timing.serialize:.1f})")
+    return response
+
+
+def _teardown_request(exc):
+    token = g.pop("request_timing_token", None)
+    if token is not None:
+        _current.reset(token)
+
+
+def _timed_response(response):
+    def timed(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return response(*args, **kwargs)
+        finally:
+            add("serialize", (time.perf_counter() - started) * 1000)
+    return timed
+
+
+def install(app):
+    """Time every request of app (REQUEST_TIMING=on); SQL is timed on every engine.
+
+    Called for the public app and for the admin panel's app when it is built.
+    """
+    if not ENABLED:
+        return
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.json.response = _timed_response(app.json.response)
+    # On the Engine class, so the lazily created engine (database.get_engine) needs no hook
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def route_stats():
+    """[{method, rule, count, avg_ms, max_ms, ...}], largest total time first"""
+    with _routes_lock:
+        rows = [{
+            "method": method,
+            "rule": rule,
+            "count": s.count,
+            "total_ms": round(s.total_ms, 1),
+            "avg_ms": round(s.total_ms / s.count, 2),
+            "max_ms": round(s.max_ms, 1),
+            "avg_db_ms": round(s.db_ms / s.count, 2),
+            "avg_db_count": round(s.db_count / s.count, 2),
+            "avg_serialize_ms": round(s.serialize_ms / s.count, 2),
+        } for (method, rule), s in _routes.items()]
+    return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
@@ -0,0 +1,269 @@
+"""
+In-process cache of serialized public API responses, keyed by content version
+"""
+import os
+import threading
+import time
+from functools import wraps
+from urllib.parse import urlencode
+from flask import request, current_app, Response
+from contextlib import contextmanager
+from utils import content_version, shared_snapshot
+from utils.compression import compress_variants, negotiate, make_etag, ETAG_SUFFIX
+
+MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+# Safety net for writes made outside this process (scripts, other workers)
+CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "300"))
+ENABLED = os.getenv("RESPONSE_CACHE", "on").lower() not in ("0", "off", "false")
+
+_cache = {}  # (path, query string) -> CachedPayload
+# (path, query string) -> Validator; outlives the payload's eviction, so a conditional
+# request for an unchanged version is answered without rebuilding the body
+_validators = {}
+_INITIAL = {
+    "hits": 0, "shared_hits": 0, "misses": 0, "stores": 0, "evictions": 0, "not_modified": 0,
+    "served_br": 0, "served_gzip": 0,
+}
+_stats = dict(_INITIAL)
+_stats_lock = threading.Lock()
+_local = threading.local()
+ENDPOINT_TABLES = {}  # URL path -> table names, filled in by @cached_response
+
+
+class Validator:
+    """What a conditional request is checked against: ETag and Last-Modified of one version"""
+
+    __slots__ = ("version", "etag", "modified", "stored_at")
+
+    def __init__(self, version, etag, modified, stored_at):
+        self.version = version
+        self.etag = etag
+        self.modified = modified
+        self.stored_at = stored_at
+
+
+class CachedPayload:
+    __slots__ = ("version", "body", "mimetype", "stored_at", "etag", "modified", "encoded")
+
+    def __init__(self, version, body, mimetype, etag=None, modified=None):
+        self.version = version
+        self.body = body
+        self.mimetype = mimetype
+        self.stored_at = time.time()
+        self.etag = etag or make_etag(body)
+        # When this body was first built: kept while rebuilds produce the same bytes
+        self.modified = modified or self.stored_at
+        # Compressed once here, when the content changes - never per request
+        self.encoded = compress_variants(body)
+
+    def response(self, encoding=None):
+        return Response(self.body if encoding is None else self.encoded[encoding], mimetype=self.mimetype)
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+@contextmanager
+def fresh():
+    """Build responses from the database on this thread, bypassing every cache (snapshot builders)"""
+    _local.fresh = True
+    try:
+        yield
+    finally:
+        _local.fresh = False
+
+
+def bypassing():
+    return getattr(_local, "fresh", False)
+
+
+def tables_for(models):
+    return tuple(sorted({m.__tablename__ for m in models}))
+
+
+def lookup(path, query_string=b"", tables=None):
+    """Return the fresh CachedPayload for path, or None"""
+    tables = tables or ENDPOINT_TABLES.get(path)
+    if tables is None:
+        return None
+    entry = _cache.get((path, query_string))
+    if entry is None or entry.version != content_version.get_versions(tables):
+        return None
+    if time.time() - entry.stored_at > CACHE_TTL:
+        return None
+    return entry
+
+
+def store(key, version, body, mimetype):
+    if len(_cache) >= MAX_ENTRIES and key not in _cache:
+        try:
+            _cache.pop(next(iter(_cache)))
+            _count("evictions")
+        except (StopIteration, KeyError):
+            pass
+    etag = make_etag(body)
+    known = _validators.get(key)
+    modified = known.modified if known is not None and known.etag == etag else None
+    entry = _cache[key] = CachedPayload(version, body, mimetype, etag, modified)
+    if len(_validators) >= 8 * MAX_ENTRIES and key not in _validators:
+        _validators.pop(next(iter(_validators)), None)
+    _validators[key] = Validator(version, etag, entry.modified, entry.stored_at)
+    _count("stores")
+    return entry
+
+
+def _held_etag(etag):
+    """The validator the client already holds for this payload (any encoding of it), or None"""
+    if request.if_none_match:
+        for tag in [etag] + [etag + suffix for suffix in ETAG_SUFFIX.values()]:
+            if request.if_none_match.contains_weak(tag):
+                return tag
+    return None
+
+
+def _not_modified(etag, modified):
+    """The tag for a 304 when the request's validators still match, else None.
+
+    If-None-Match takes precedence; If-Modified-Since is compared in whole seconds,
+    the resolution of the header.
+    """
+    if request.if_none_match:
+        return _held_etag(etag)
+    since = request.if_modified_since
+    if since is not None and int(modified) <= since.timestamp():
+        return etag
+    return None
+
+
+def _add_validators(response, etag, modified):
+    response.set_etag(etag)
+    response.last_modified = int(modified)
+    # Let browsers keep the body but revalidate every time - a 304 is nearly free
+    response.headers["Cache-Control"] = "no-cache"
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def _serve(entry):
+    held = _not_modified(entry.etag, entry.modified)
+    if held is not None:
+        _count("not_modified")
+        return _add_validators(Response(status=304), held, entry.modified)
+    etag = entry.etag
+    encoding = negotiate(request.accept_encodings, entry.encoded)
+    response = entry.response(encoding)
+    if encoding is not None:
+        _count("served_" + encoding)
+        response.headers["Content-Encoding"] = encoding
+        etag += ETAG_SUFFIX[encoding]
+    return _add_validators(response, etag, entry.modified)
+
+
+def _revalidate(key, version):
+    """304 for a conditional request whose version's payload was evicted, without rebuilding it"""
+    known = _validators.get(key)
+    if known is None or known.version != version or time.time() - known.stored_at > CACHE_TTL:
+        return None
+    held = _not_modified(known.etag, known.modified)
+    if held is None:
+        return None
+    _count("not_modified")
+    return _add_validators(Response(status=304), held, known.modified)
+
+
+def serve_cached(key, tables, build):
+    """Answer a GET for key (path, query string) whose payload reads tables.
+
+    The ETag is a hash of the payload, computed once when it is cached, so every
+    worker gives the same body the same tag; Last-Modified is when that body was
+    first built. A conditional request whose validators still match gets a 304
+    instead of the body, without a rebuild while the version it was cached under
+    is current. The version is read before build() runs,
+    so a commit that lands while the payload is being built leaves a stale version
+    behind and the next request rebuilds.
+    """
+    if bypassing():
+        return current_app.make_response(build())
+    version = content_version.get_versions(tables)
+    entry = lookup(*key, tables=tables)
+    if entry is not None:
+        _count("hits")
+        return _serve(entry)
+    if shared_snapshot.ENABLED:
+        entry = shared_snapshot.lookup(key, tables)
+        if entry is not None:
+            _count("shared_hits")
+            return _serve(entry)
+    if request.if_none_match or request.if_modified_since:
+        response = _revalidate(key, version)
+        if response is not None:
+            return response
+    _count("misses")
+    response = current_app.make_response(build())
+    if response.status_code != 200 or not response.is_json:
+        return response
+    if "no-store" in response.headers.get("Cache-Control", ""):
+        return response
+    entry = store(key, version, response.get_data(), response.mimetype)
+    return _serve(entry)
+
+
+def cache_key(params=()):
+    """(path, query string) of this request, keeping only the query args named in params.
+
+    Args the view does not read (?_=1712345678 cache busters, tracking tags) would each
+    store a copy of the same body and evict real entries, so they are left out of the key.
+    """
+    args = request.args
+    return request.path, urlencode([(name, args[name]) for name in sorted(params) if name in args]).encode("ascii")
+
+
+def cached_response(*models, params=()):
+    """Serve the view's JSON body from memory until one of the models' tables changes.
+
+    params names the query args the view reads; only those are part of the cache key.
+    """
+    tables = tables_for(models)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return view(*args, **kwargs)
+            ENDPOINT_TABLES.setdefault(request.path, tables)
+            return serve_cached(cache_key(params), tables, lambda: view(*args, **kwargs))
+        wrapper.cache_tables = tables
+        return wrapper
+    return decorator
+
+
+def clear():
+    _cache.clear()
+    _validators.clear()
+
+
+def _after_fork():
+    # Entries warmed up in the master are worth inheriting; its hit and miss counts are not,
+    # or every worker would report the warm-up again
+    global _stats, _stats_lock
+    _stats_lock = threading.Lock()
+    _stats = dict(_INITIAL)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def stats():
+    with _stats_lock:
+        result = dict(_stats)
+    lookups = result["hits"] + result["misses"]
+    result["hit_ratio"] = round(result["hits"] / lookups, 4) if lookups else 0.0
+    result["entries"] = len(_cache)
+    result["enabled"] = ENABLED
+    result["versions"] = content_version.snapshot()
+    if shared_snapshot.ENABLED:
+        result["shared_snapshot"] = shared_snapshot.stats()
+    return result
@@ -0,0 +1,361 @@
+"""
+Shared-memory snapshot of the public API - one file of encoded and precompressed
+payloads, memory-mapped read-only by every worker on the machine
+
+Layout: MAGIC, header (generation, build start time, index length), a JSON index
+{path: {tables, mimetype, body: [offset, length], etag, modified, encoded: {encoding: [offset, length]}}},
+then the payload bytes. A builder writes each generation to a temp file and renames
+it over the previous one; readers notice the new inode and map it, so pages are
+shared by the OS page cache instead of copied into every worker.
+
+Every process also records its bumps (its own commits and those from
+utils/invalidation_bus.py) in a changes file next to the snapshot, {since, tables:
+{table: last bump}}, so a worker that starts after a change still knows of it. A
+worker serves an entry only when the generation's build started after the last bump
+of the entry's tables in either record, after the changes file began recording, and
+less than MAX_AGE seconds ago. Anything else falls through to the in-process cache
+and the database, and asks for a rebuild. Rebuilds are debounced and elected with flock, so one process
+on the machine builds while the others keep serving.
+
+Enable with SHARED_SNAPSHOT=on (see app.py); Unix only (fcntl).
+"""
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from flask import Response, request
+from utils import content_version
+from utils.compression import compress_variants, make_etag
+
+try:
+    import fcntl
+except ImportError:  # Windows - no shared snapshot
+    fcntl = None
+
+ENABLED = os.getenv("SHARED_SNAPSHOT", "off").lower() in ("1", "true", "on") and fcntl is not None
+PATH = os.getenv("SHARED_SNAPSHOT_PATH", os.path.join(tempfile.gettempdir(), "kalongo-snapshot.bin"))
+BUILD_DELAY = float(os.getenv("SHARED_SNAPSHOT_DELAY", "1"))  # seconds; batches bumps into one build
+MAX_AGE = int(os.getenv("SHARED_SNAPSHOT_MAX_AGE", "300"))  # same safety net as RESPONSE_CACHE_TTL
+CHECK_INTERVAL = 0.5  # seconds between stat() calls looking for a new generation
+CHANGES_PATH = PATH + ".changes"
+
+MAGIC = b"KALSNAP1"
+HEADER = struct.Struct(">QdI")  # generation, build start (epoch seconds), index length
+
+_lock = threading.Lock()
+_generation = None  # the mapped Generation
+_checked_at = 0.0
+_timer = None
+_render = None
+_changes = None  # contents of CHANGES_PATH as last read, None when there is none
+_changes_stat = None
+_INITIAL = {"hits": 0, "stale": 0, "builds": 0, "build_errors": 0, "swaps": 0}
+_stats = dict(_INITIAL)
+
+
+class Generation:
+    """One mapped snapshot file"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.inode = os.fstat(f.fileno()).st_ino
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a snapshot file")
+        self.path = path
+        start = len(MAGIC)
+        self.number, self.started_at, index_length = HEADER.unpack_from(self.map, start)
+        start += HEADER.size
+        self.index = json.loads(self.map[start:start + index_length])
+        # Offsets in the index count from the end of the index
+        self.payloads_at = start + index_length
+        self.payloads = memoryview(self.map)[self.payloads_at:]
+
+    def entry(self, path):
+        meta = self.index.get(path)
+        return SharedEntry(self, meta) if meta is not None else None
+
+    def response(self, span, mimetype):
+        """Response for the payload at span [offset, length], without copying it into the worker.
+
+        gunicorn sends a wsgi.file_wrapper body with sendfile(), bounded by Content-Length,
+        so the bytes go from the page cache to the socket. Other servers (the dev server,
+        the test client) get a copy.
+        """
+        offset, length = span
+        environ = request.environ
+        if environ.get("SERVER_SOFTWARE", "").startswith("gunicorn") and "wsgi.file_wrapper" in environ:
+            f = self._open()
+            if f is not None:
+                f.seek(self.payloads_at + offset)
+                response = Response(environ["wsgi.file_wrapper"](f), mimetype=mimetype, direct_passthrough=True)
+                response.content_length = length
+                return response
+        return Response(bytes(self.payloads[offset:offset + length]), mimetype=mimetype)
+
+    def _open(self):
+        """This generation's file, opened for one response (its own offset); None once replaced"""
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return None
+        if os.fstat(f.fileno()).st_ino != self.inode:
+            f.close()
+            return None
+        return f
+
+    def fresh_for(self, tables):
+        if _changes is None or self.started_at < _changes["since"]:
+            return False  # built before bumps were recorded: whatever changed since is unknown
+        recorded = max([_changes["tables"].get(t, 0) for t in tables] or [0])
+        newest_change = max(content_version.bumped_at(tables), recorded)
+        return self.started_at > newest_change and time.time() - self.started_at < MAX_AGE
+
+
+class _Variants:
+    """{encoding: memoryview}, sliced out of the map on access (no copy)"""
+
+    def __init__(self, data, spans):
+        self._data = data
+        self.spans = spans
+
+    def __contains__(self, encoding):
+        return encoding in self.spans
+
+    def __getitem__(self, encoding):
+        offset, length = self.spans[encoding]
+        return self._data[offset:offset + length]
+
+
+class SharedEntry:
+    """Same attributes response_cache serves a CachedPayload by; body and variants are views of the map"""
+
+    __slots__ = ("mimetype", "_generation", "_body", "etag", "modified", "encoded")
+
+    def __init__(self, generation, meta):
+        self._generation = generation
+        self.mimetype = meta["mimetype"]
+        self._body = meta["body"]
+        self.etag = meta.get("etag") or make_etag(self.body)  # files written before etags were stored
+        self.modified = meta.get("modified") or generation.started_at
+        self.encoded = _Variants(generation.payloads, meta["encoded"])
+
+    @property
+    def body(self):
+        offset, length = self._body
+        return self._generation.payloads[offset:offset + length]
+
+    def response(self, encoding=None):
+        span = self._body if encoding is None else self.encoded.spans[encoding]
+        return self._generation.response(span, self.mimetype)
+
+
+def current():
+    """The newest generation on disk, mapped (None when there is none)"""
+    global _generation, _checked_at
+    now = time.time()
+    if now - _checked_at < CHECK_INTERVAL:
+        return _generation
+    with _lock:
+        _checked_at = now
+        _load_changes()
+        try:
+            inode = os.stat(PATH).st_ino
+        except FileNotFoundError:
+            _generation = None
+            return None
+        if _generation is None or _generation.inode != inode:
+            try:
+                # The old map is released once no request is slicing it any more
+                _generation = Generation(PATH)
+                _stats["swaps"] += 1
+            except (OSError, ValueError, struct.error) as e:
+                print(f"⚠️ Shared snapshot {PATH} unreadable: {e}")
+                _generation = None
+        return _generation
+
+
+def _read_changes():
+    try:
+        with open(CHANGES_PATH, "rb") as f:
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _load_changes():
+    """Re-read the changes file when it was replaced"""
+    global _changes, _changes_stat
+    try:
+        st = os.stat(CHANGES_PATH)
+        stat = (st.st_ino, st.st_mtime_ns)
+    except FileNotFoundError:
+        stat = None
+    if stat != _changes_stat:
+        _changes, _changes_stat = (_read_changes() if stat else None), stat
+
+
+def record_changes(tables):
+    """Merge this process's last bump of each table into the changes file (created when missing)"""
+    with open(CHANGES_PATH + ".lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            changes = _read_changes() or {"since": time.time(), "tables": {}}
+            for table in tables:
+                changes["tables"][table] = max(changes["tables"].get(table, 0), content_version.bumped_at([table]))
+            tmp = f"{CHANGES_PATH}.tmp{os.getpid()}"
+            with open(tmp, "w") as f:
+                json.dump(changes, f, separators=(",", ":"))
+            os.replace(tmp, CHANGES_PATH)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _on_bump(tables):
+    try:
+        record_changes(tables)
+    except OSError as e:
+        print(f"⚠️ Shared snapshot could not record changes to {', '.join(sorted(tables))}: {e}")
+    request_build()
+
+
+def lookup(key, tables):
+    """Shared entry for key (path, query string), or None to build it the usual way"""
+    path, query_string = key
+    if query_string:
+        return None
+    generation = current()
+    if generation is None or not generation.fresh_for(tables):
+        _stats["stale"] += 1
+        request_build()
+        return None
+    entry = generation.entry(path)
+    if entry is not None:
+        _stats["hits"] += 1
+    return entry
+
+
+def write(path, generation, started_at, payloads, previous=None):
+    """Write payloads {endpoint: (tables, body, mimetype)} as a new generation, atomically.
+
+    An endpoint whose body is unchanged from previous (a Generation) keeps its modified time
+    and its compressed variants, copied over instead of compressed again.
+    """
+    index, blobs, offset = {}, [], 0
+    for endpoint, (tables, body, mimetype) in payloads.items():
+        etag = make_etag(body)
+        old = previous.entry(endpoint) if previous is not None else None
+        if old is not None and old.etag == etag:
+            modified = old.modified
+            variants = {encoding: old.encoded[encoding] for encoding in old.encoded.spans}
+        else:
+            modified = started_at
+            variants = compress_variants(body)
+        spans = {}
+        for encoding, data in [("identity", body), *variants.items()]:
+            spans[encoding] = [offset, len(data)]
+            blobs.append(data)
+            offset += len(data)
+        index[endpoint] = {"tables": list(tables), "mimetype": mimetype, "body": spans.pop("identity"),
+                           "etag": etag, "modified": modified, "encoded": spans}
+    raw_index = json.dumps(index, separators=(",", ":")).encode("utf-8")
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(HEADER.pack(generation, started_at, len(raw_index)))
+        f.write(raw_index)
+        for blob in blobs:
+            f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def build():
+    """Render every public endpoint into a new generation (needs install())"""
+    from utils import response_cache
+
+    if _read_changes() is None:
+        record_changes(())  # start recording before the build starts, so this generation can be trusted
+    started_at = time.time()
+    previous = current()
+    with response_cache.fresh():  # straight from the database, not from any cache
+        payloads = _render()
+    write(PATH, (previous.number if previous else 0) + 1, started_at, payloads, previous)
+    _stats["builds"] += 1
+
+
+def _build_if_needed():
+    global _timer, _checked_at
+    with _lock:
+        _timer = None
+    try:
+        with open(PATH + ".lock", "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                request_build()  # another process is building; look again once it is done
+                return
+            try:
+                _checked_at = 0.0
+                generation = current()
+                # Skip when another process already built past every bump seen here
+                if generation is None or not generation.fresh_for(content_version.snapshot()):
+                    build()
+                    _checked_at = 0.0
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    except Exception as e:
+        _stats["build_errors"] += 1
+        print(f"⚠️ Shared snapshot build failed: {e}")
+
+
+def request_build():
+    """Build a new generation in BUILD_DELAY seconds, unless one is already scheduled"""
+    global _timer
+    if _render is None:
+        return
+    with _lock:
+        if _timer is not None:
+            return
+        _timer = threading.Timer(BUILD_DELAY, _build_if_needed)
+        _timer.daemon = True
+        _timer.start()
+
+
+def install(render):
+    """Serve from the shared snapshot and rebuild it after bumps; render() -> {endpoint: (tables, body, mimetype)}"""
+    global _render
+    if not ENABLED:
+        return
+    _render = render
+    content_version.subscribe(_on_bump)
+
+
+def _after_fork():
+    # Timer threads do not survive fork; a child must be able to schedule its own builds.
+    # Counters start from zero, as in the other per-process stats
+    global _lock, _timer, _stats
+    _lock = threading.Lock()
+    _timer = None
+    _stats = dict(_INITIAL)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def stats():
+    generation = _generation
+    return {
+        "enabled": ENABLED,
+        "path": PATH,
+        "generation": generation.number if generation else None,
+        "built_at": generation.started_at if generation else None,
+        "entries": len(generation.index) if generation else 0,
+        "bytes": len(generation.map) if generation else 0,
+        **_stats,
+    }
@@ -0,0 +1,141 @@
+"""
+Slow-query recorder: statements slower than SLOW_QUERY_MS, with their plan
+
+Opt in with SLOW_QUERY_MS (e.g. 200). Every statement on any engine is timed
+with SQLAlchemy's cursor events. One over the threshold is kept in a ring buffer
+of SLOW_QUERY_BUFFER entries, with its SQL, parameters, the route that issued it
+and a plan. A single background thread captures the plan on its own connection,
+so the request thread never waits for it:
+
+  Postgres  EXPLAIN (ANALYZE, BUFFERS) for SELECTs, run in a transaction that is
+            rolled back; plain EXPLAIN for anything else (ANALYZE would execute it)
+  SQLite    EXPLAIN QUERY PLAN
+
+A statement explained less than EXPLAIN_EVERY seconds ago reuses that plan, and
+explains are dropped while MAX_PENDING are queued. The buffer belongs to the
+process; the admin panel shows the worker that serves the page (/admin/slow-queries).
+"""
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from flask import has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+THRESHOLD_MS = float(os.getenv("SLOW_QUERY_MS", "0"))  # 0: off
+ENABLED = THRESHOLD_MS > 0
+BUFFER_SIZE = int(os.getenv("SLOW_QUERY_BUFFER", "100"))
+EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "on").lower() in ("1", "true", "on")
+EXPLAIN_EVERY = 300  # seconds a captured plan is reused for the same statement
+MAX_PENDING = 20
+
+_entries = deque(maxlen=BUFFER_SIZE)
+_plans = {}  # statement -> (captured at, plan)
+_pending = 0
+_lock = threading.Lock()
+_executor = None
+_explaining = threading.local()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["slow_query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("slow_query_started", None)
+    if started is None or getattr(_explaining, "active", False):
+        return
+    elapsed = (time.perf_counter() - started) * 1000
+    if elapsed >= THRESHOLD_MS:
+        record(conn.engine, statement, parameters, elapsed, executemany)
+
+
+def record(engine, statement, parameters, elapsed_ms, executemany=False):
+    """Add a slow statement to the buffer and queue its plan"""
+    entry = {
+        "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "duration_ms": round(elapsed_ms, 1),
+        "route": f"{request.method} {request.full_path.rstrip('?')}" if has_request_context() else None,
+        "statement": statement,
+        "parameters": repr(parameters)[:500],
+        "plan": None,
+    }
+    _entries.append(entry)
+    if not EXPLAIN or executemany:
+        return
+    cached = _plans.get(statement)
+    if cached and time.time() - cached[0] < EXPLAIN_EVERY:
+        entry["plan"] = cached[1]
+        return
+    _queue_explain(engine, entry, parameters)
+
+
+def _queue_explain(engine, entry, parameters):
+    global _executor, _pending
+    with _lock:
+        if _pending >= MAX_PENDING:
+            entry["plan"] = "(not captured: too many plans queued)"
+            return
+        _pending += 1
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+    entry["plan"] = "(capturing...)"
+    _executor.submit(_explain, engine, entry, parameters)
+
+
+def _explain(engine, entry, parameters):
+    global _pending
+    statement = entry["statement"]
+    _explaining.active = True
+    try:
+        with engine.connect() as conn:
+            if conn.dialect.name == "postgresql":
+                is_select = statement.lstrip().upper().startswith(("SELECT", "WITH"))
+                prefix = "EXPLAIN (ANALYZE, BUFFERS) " if is_select else "EXPLAIN "
+            elif conn.dialect.name == "sqlite":
+                prefix = "EXPLAIN QUERY PLAN "
+            else:
+                prefix = "EXPLAIN "
+            rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+            conn.rollback()  # EXPLAIN ANALYZE ran the statement
+        plan = "\n".join(str(row[-1]) for row in rows)  # Postgres: one line per row; SQLite: the detail column
+        _plans[statement] = (time.time(), plan)
+    except Exception as e:
+        plan = f"(plan failed: {e})"
+    finally:
+        _explaining.active = False
+        with _lock:
+            _pending -= 1
+    entry["plan"] = plan
+
+
+def _after_fork():
+    # A forked worker inherits the executor object but none of its threads
+    global _executor, _lock, _pending
+    _executor = None
+    _lock = threading.Lock()
+    _pending = 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def install():
+    """Time statements on every engine (SLOW_QUERY_MS > 0); the Engine class, so the lazy engine needs no hook"""
+    if not ENABLED:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def entries():
+    """Recorded slow statements, newest first"""
+    return list(reversed(_entries))
+
+
+def clear():
+    _entries.clear()
+    _plans.clear()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Warm-up before a process serves traffic - so the first requests after a deploy or
+cold start do not pay for it.
+
+  mappers     configure every SQLAlchemy mapper (relationships, backrefs)
+  admin       load the admin panel (routes/admin_app.py) and compile templates/admin/*.html
+  caches      render every public endpoint once, filling the response cache
+  pool        open pool_size connections and hand them back to the pool
+
+gunicorn.conf.py runs the first three in the master when the app is preloaded, so
+forked workers share the result, and opens the pool in each worker. Without
+preloading, each worker warms up before it accepts requests, leaving the admin
+panel to its first request when ADMIN_LOAD=lazy.
+
+Run: python warmup.py        # warm this process and print the timings
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+
+STEPS = ("mappers", "admin", "caches", "pool")
+
+_state = {"ready": False, "timings": {}}
+
+
+def configure_all_mappers():
+    configure_mappers()
+    return "ok"
+
+
+def load_admin(app):
+    admin_app = app.extensions["kalongo_admin"].load()
+    names = admin_app.jinja_env.list_templates(filter_func=lambda name: name.startswith("admin/"))
+    for name in names:
+        admin_app.jinja_env.get_template(name)
+    return f"{len(names)} templates"
+
+
+def prime_caches(app):
+    """GET every public endpoint once (response cache, homepage read model, shared snapshot)"""
+    from export_snapshot import public_endpoints
+
+    client = app.test_client()
+    failed = [path for path in sorted(public_endpoints(app)) if client.get(path).status_code != 200]
+    if failed:
+        print(f"  ⚠️  Warm-up: {', '.join(failed)} did not answer 200")
+    return f"{len(public_endpoints(app)) - len(failed)} endpoints"
+
+
+def open_pool(engine):
+    """Check out pool_size connections at once, so each one is really established"""
+    size = engine.pool.size() if hasattr(engine.pool, "size") else 1
+    connections = []
+    try:
+        for _ in range(size):
+            conn = engine.connect()
+            connections.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in connections:
+            conn.close()
+    return f"{len(connections)} connections"
+
+
+def warm_up(app, engine, steps=STEPS, ready=True):
+    """Run the warm-up steps in order; a failing step is reported and skipped.
+
+    ready=False leaves the process marked as not ready (the master warms up for its workers).
+    """
+    actions = {
+        "mappers": configure_all_mappers,
+        "admin": lambda: load_admin(app),
+        "caches": lambda: prime_caches(app),
+        "pool": lambda: open_pool(engine),
+    }
+    for step in steps:
+        started = time.time()
+        try:
+            result = actions[step]()
+        except Exception as e:
+            result = f"failed: {e}"
+        elapsed = (time.time() - started) * 1000
+        _state["timings"][step] = round(elapsed, 1)
+        print(f"  🔥 {step}: {result} ({elapsed:.0f} ms)")
+    if ready:
+        _state["ready"] = True
+    return dict(_state["timings"])
+
+
+def is_ready():
+    """True once this process has finished warming up"""
+    return _state["ready"]
+
+
+def state():
+    return {"ready": _state["ready"], "timings_ms": dict(_state["timings"])}
+
+
+if __name__ == "__main__":
+    from app import app
+    from database import engine
+
+    print(f"Warming up (pid {os.getpid()})...")
+    started = time.time()
+    warm_up(app, engine)
+    print(f"Done in {(time.time() - started) * 1000:.0f} ms.")
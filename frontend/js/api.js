@@ -44,15 +44,11 @@ const getTransparentLogoUrl = (url) => {
     return url.replace('/upload/', '/upload/e_background_removal,f_png,q_auto/').replace(/\.(jpg|jpeg|webp)$/i, '.png');
 };
 
+/** Copy shared with backend/prerender.py (data/site-content.json, loaded as js/site-content.js) */
+const SITE_CONTENT = window.KALONGO_CONTENT || {};
+
 /** Premium facilities catalog (order + copy); merged with API images */
-const FACILITY_CATALOG = [
-    { key: 'pool', name: 'Swimming Pool', description: 'Relax and cool off in our refreshing swimming pool surrounded by nature.' },
-    { key: 'farm', name: 'Natural Farm', description: 'Experience authentic farm life with our natural farming practices and organic produce.' },
-    { key: 'animals', name: 'Domestic Animals', description: 'Interact with our friendly domestic animals including cows, goats, chickens, and more.' },
-    { key: 'food', name: 'Farm-Fresh Food', description: 'Enjoy delicious meals made from fresh, locally sourced ingredients from our farm.' },
-    { key: 'trails', name: 'Nature Trails', description: 'Explore our beautiful surroundings through guided nature walks and trails.' },
-    { key: 'activities', name: 'Activities', description: 'Participate in various farm activities, animal feeding, and educational programs.' },
-];
+const FACILITY_CATALOG = SITE_CONTENT.facilities || [];
 
 const normalizeFacilityName = (name) => (name || '').toLowerCase().replace(/[^a-z0-9]+/g, ' ').trim();
 
@@ -129,7 +125,107 @@ const preloadImage = (url, optimize = true) => {
 const apiCache = new Map();
 const CACHE_TTL = 60000; // 60 seconds (increased for better performance)
 
+// Static snapshot of the API exported by backend/export_snapshot.py and deployed with the site.
+// Only a fallback: it is as old as the last deploy, so the live API is always asked first.
+const SNAPSHOT_BASE_URL = '/data';
+const SNAPSHOT_FALLBACK_MS = 3000; // an API slower than this (cold start) is replaced by the snapshot
+let snapshotManifest = null;
+
+const getSnapshotManifest = () => {
+    if (!snapshotManifest) {
+        snapshotManifest = fetch(`${SNAPSHOT_BASE_URL}/manifest.json`, { cache: 'no-cache' })
+            .then((response) => (response.ok ? response.json() : null))
+            .catch(() => null);
+    }
+    return snapshotManifest;
+};
+
+async function fetchSnapshot(endpoint) {
+    const manifest = await getSnapshotManifest();
+    const entry = manifest && manifest.endpoints && manifest.endpoints[endpoint];
+    if (!entry) return null;
+    try {
+        const response = await fetch(`${SNAPSHOT_BASE_URL}/${entry.file}`);
+        return response.ok ? await response.json() : null;
+    } catch (error) {
+        return null;
+    }
+}
+
+// Inline data island written into the page by backend/prerender.py: { endpoint: payload }
+let pageData;
+
+const getPageData = () => {
+    if (pageData === undefined) {
+        pageData = null;
+        const island = document.getElementById('kalongo-data');
+        if (island && island.textContent.trim()) {
+            try {
+                pageData = JSON.parse(island.textContent);
+            } catch (error) {
+                console.warn('⚠️ Ignoring malformed data island:', error.message);
+            }
+        }
+    }
+    return pageData;
+};
+
+// The island is as old as the last prerender: after hydrating from it, ask the API once and
+// hand a changed payload to the page's onFreshData listeners so they re-render
+const freshListeners = new Map();
+const freshData = new Map();
+
+const onFreshData = (endpoint, callback) => {
+    if (!freshListeners.has(endpoint)) freshListeners.set(endpoint, []);
+    freshListeners.get(endpoint).push(callback);
+    if (freshData.has(endpoint)) callback(freshData.get(endpoint)); // arrived before the listener
+};
+
+function revalidate(endpoint, inlineData) {
+    fetchLive(endpoint, true).then((data) => {
+        if (data === null || JSON.stringify(data) === JSON.stringify(inlineData)) return;
+        console.log(`🔄 ${endpoint} changed since the page was pre-rendered, re-rendering`);
+        freshData.set(endpoint, data);
+        (freshListeners.get(endpoint) || []).forEach((callback) => callback(data));
+    });
+}
+
+// Endpoints being loaded together through /api/batch: endpoint -> promise settling when they are cached
+const batchInFlight = new Map();
+
+/** Fetch several endpoints in one request (/api/batch) and seed the cache with each payload */
+function prefetchBatch(endpoints) {
+    const wanted = endpoints.filter((endpoint) => !apiCache.has(endpoint) && !batchInFlight.has(endpoint));
+    if (wanted.length < 2) return Promise.resolve();
+    const names = wanted.map((endpoint) => endpoint.replace(/^\//, ''));
+    const request = fetchAPI(`/batch?resources=${names.join(',')}`, false).then((data) => {
+        wanted.forEach((endpoint, idx) => {
+            batchInFlight.delete(endpoint);
+            if (data && data[names[idx]] !== undefined) {
+                apiCache.set(endpoint, { data: data[names[idx]], timestamp: Date.now() });
+            }
+        });
+    });
+    wanted.forEach((endpoint) => batchInFlight.set(endpoint, request));
+    return request;
+}
+
 async function fetchAPI(endpoint, useCache = true) {
+    // Pre-rendered pages carry their data inline - hydrate from it instead of refetching
+    const inline = useCache ? getPageData() : null;
+    if (inline && Object.prototype.hasOwnProperty.call(inline, endpoint)) {
+        console.log(`🏝️ Using inline data for ${endpoint}`);
+        const data = inline[endpoint];
+        delete inline[endpoint]; // first render only: later calls go to the API
+        revalidate(endpoint, data);
+        return data;
+    }
+
+    // Wait for a batch already fetching this endpoint; it fills the cache below
+    if (useCache && batchInFlight.has(endpoint)) {
+        await batchInFlight.get(endpoint);
+    }
+
     // Check cache first
     if (useCache && apiCache.has(endpoint)) {
         const cached = apiCache.get(endpoint);
@@ -139,7 +235,34 @@ async function fetchAPI(endpoint, useCache = true) {
         }
         apiCache.delete(endpoint);
     }
-    
+
+    if (!useCache) return fetchLive(endpoint, false);
+
+    // Live API first; the static snapshot stands in when it fails or is slow to answer
+    let liveSettled = false;
+    const live = fetchLive(endpoint, true).finally(() => { liveSettled = true; });
+    let data = await Promise.race([live, new Promise((resolve) => setTimeout(resolve, SNAPSHOT_FALLBACK_MS))]);
+    if (data === undefined) {
+        const snapshot = await fetchSnapshot(endpoint);
+        if (snapshot !== null && !liveSettled) {
+            console.log(`🗂️ API slow, using static snapshot for ${endpoint}`);
+            apiCache.set(endpoint, { data: snapshot, timestamp: Date.now() }); // replaced once the live answer lands
+            return snapshot;
+        }
+        data = await live;
+    }
+    if (data === null) {
+        data = await fetchSnapshot(endpoint);
+        if (data !== null) {
+            console.log(`🗂️ API unavailable, using static snapshot for ${endpoint}`);
+            apiCache.set(endpoint, { data, timestamp: Date.now() });
+        }
+    }
+    return data;
+}
+
+/** GET endpoint from the backend; the payload, or null on any failure (logged) */
+async function fetchLive(endpoint, useCache) {
     try {
         const controller = new AbortController();
         const timeoutId = setTimeout(() => controller.abort(), API_TIMEOUT);
@@ -150,11 +273,10 @@ async function fetchAPI(endpoint, useCache = true) {
             const response = await fetch(url, {
             signal: controller.signal,
             headers: {
-                'Accept': 'application/json',
-                'Cache-Control': 'max-age=60' // Allow browser caching for 60 seconds
+                'Accept': 'application/json'
             },
             mode: 'cors',
-            cache: 'default' // Use browser cache
+            cache: 'default' // Browser revalidates with the API's ETag, a 304 costs no body
         });
         
         clearTimeout(timeoutId);
@@ -198,10 +320,15 @@ const API = {
     getFood: () => fetchAPI('/food'),
     getRestaurantMenu: () => fetchAPI('/restaurant-menu'),
     getVideos: () => fetchAPI('/videos'),
+    // One keyset page: { items, next } - pass `next` back as cursor for the following page
+    getVideosPage: (section, cursor = null, limit = 12) =>
+        fetchAPI(`/videos?section=${encodeURIComponent(section)}&limit=${limit}${cursor ? `&cursor=${encodeURIComponent(cursor)}` : ''}`),
     getReviews: () => fetchAPI('/reviews'),
     getSettings: () => fetchAPI('/settings'),
     // Combined endpoint for faster homepage loading
     getHomepageData: () => fetchAPI('/homepage-data'),
+    // Several endpoints in one request, e.g. API.prefetch(['/settings', '/pricing'])
+    prefetch: (endpoints) => prefetchBatch(endpoints),
 };
 
 /** Our Services page — premium image-card catalogs */
@@ -902,18 +1029,13 @@ const Render = {
     },
     
     reviewSlideHtml: (review, idx) => {
-        const metaDefaults = [
-            { name: 'Michael T.', location: 'Dar es Salaam, Tanzania', date: 'April 15, 2024' },
-            { name: 'Sarah M.', location: 'Arusha, Tanzania', date: 'March 8, 2024' },
-            { name: 'Grace T.', location: 'Mbeya, Tanzania', date: 'February 22, 2024' },
-            { name: 'John K.', location: 'Dodoma, Tanzania', date: 'January 10, 2024' },
-        ];
-        const meta = metaDefaults[idx % metaDefaults.length];
+        const metaDefaults = SITE_CONTENT.review_meta || [];
+        const meta = metaDefaults[idx % metaDefaults.length] || { name: '', location: '', date: '' };
         const rating = Math.min(5, Math.max(1, review.rating || 5));
         const starsHtml = Array.from({ length: 5 }, (_, i) =>
             `<span class="lux-review-star" aria-hidden="true">${i < rating ? '★' : '☆'}</span>`
         ).join('');
-        const quote = (review.quote || 'An unforgettable stay surrounded by nature, comfort, and warm hospitality. Kalongo Farm exceeded every expectation.').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+        const quote = (review.quote || SITE_CONTENT.default_review_quote || '').replace(/</g, '&lt;').replace(/>/g, '&gt;');
         const customerName = (review.customer_name || meta.name).replace(/</g, '&lt;');
         const location = meta.location;
         const dateStr = meta.date;
@@ -1136,6 +1258,21 @@ const Render = {
         console.log(`✅ Rendered ${list.length} Kalongo videos`);
         window.dispatchEvent(new CustomEvent('kalongoRendered', { detail: { videos: list } }));
     },
+
+    /** Append a further page of Kalongo videos to the grid */
+    kalongoAppend: (videos) => {
+        const container = document.getElementById('luxKalongoVideos');
+        if (!container || !videos || !videos.length) return;
+        let grid = container.querySelector('.lux-kalongo-video-grid');
+        if (!grid) {
+            grid = document.createElement('div');
+            grid.className = 'lux-kalongo-video-grid';
+            container.appendChild(grid);
+        }
+        grid.insertAdjacentHTML('beforeend', videos.map((v) => Render.kalongoVideoCardHtml(v, false)).join(''));
+        console.log(`✅ Appended ${videos.length} Kalongo videos`);
+        window.dispatchEvent(new CustomEvent('kalongoRendered', { detail: { videos } }));
+    },
     
     
     settings: (settings) => {
@@ -1253,6 +1390,11 @@ async function initializeDataLoading() {
         console.warn('⚠️ Health check error (non-critical):', err.message);
     });
     
+    // Pages needing more than settings load their endpoints in one batch request
+    if (window.location.pathname.includes('booking.html')) {
+        API.prefetch(['/settings', '/pricing']);
+    }
+
     // Load settings first (cached, fast)
     console.log('📥 Fetching settings...');
     const settings = await API.getSettings();
@@ -1263,6 +1405,7 @@ async function initializeDataLoading() {
     } else {
         console.error('❌ Failed to load settings');
     }
+    onFreshData('/settings', (fresh) => Render.settings(fresh));
     
     // Load page-specific data
     const path = window.location.pathname;
@@ -1278,6 +1421,13 @@ async function initializeDataLoading() {
             } catch (e) {
                 console.warn('⚠️ Homepage combined endpoint failed:', e.message);
             }
+            onFreshData('/homepage-data', (fresh) => {
+                if (fresh.settings && Object.keys(fresh.settings).length > 0) Render.settings(fresh.settings);
+                if (fresh.hero_slides?.length) Render.heroSlides(fresh.hero_slides);
+                if (fresh.rooms?.length) Render.rooms(fresh.rooms);
+                if (document.querySelector('.facilities-grid')) Render.facilities(fresh.facilities || []);
+                if (fresh.reviews?.length) Render.reviews(fresh.reviews);
+            });
             if (homepageData && (homepageData.rooms?.length || homepageData.reviews?.length || homepageData.hero_slides?.length)) {
                 heroSlidesData = homepageData.hero_slides || [];
                 roomsData = homepageData.rooms || [];
@@ -1380,9 +1530,39 @@ async function initializeDataLoading() {
             link.classList.add('is-active');
         });
         try {
-            const videos = await API.getVideos();
+            // Videos without a section belong to Our Kalongo too ("none")
+            const KALONGO_SECTIONS = 'our-kalongo,none';
+            const page = await API.getVideosPage(KALONGO_SECTIONS);
+            // A backend without paging answers with the plain list
+            const videos = Array.isArray(page) ? page : (page?.items || await API.getVideos() || []);
             console.log('📊 Videos loaded:', videos?.length || 0);
-            const apply = () => Render.kalongoPage(videos || []);
+            const loadMoreOnScroll = (cursor) => {
+                const container = document.getElementById('luxKalongoVideos');
+                if (!cursor || !container || !('IntersectionObserver' in window)) return;
+                const sentinel = document.createElement('div');
+                sentinel.className = 'lux-kalongo-videos-sentinel';
+                sentinel.setAttribute('aria-hidden', 'true');
+                container.after(sentinel);
+                let next = cursor;
+                let loading = false;
+                const io = new IntersectionObserver(async (entries) => {
+                    if (!entries.some((e) => e.isIntersecting) || loading) return;
+                    loading = true;
+                    const more = await API.getVideosPage(KALONGO_SECTIONS, next);
+                    loading = false;
+                    Render.kalongoAppend(more?.items || []);
+                    next = more?.next;
+                    if (!next) {
+                        io.disconnect();
+                        sentinel.remove();
+                    }
+                }, { rootMargin: '0px 0px 400px 0px' });
+                io.observe(sentinel);
+            };
+            const apply = () => {
+                Render.kalongoPage(videos);
+                if (page && !Array.isArray(page)) loadMoreOnScroll(page.next);
+            };
             if (document.readyState === 'loading') {
                 document.addEventListener('DOMContentLoaded', () => setTimeout(apply, 50));
             } else {
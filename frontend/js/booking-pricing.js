@@ -90,8 +90,10 @@
 
     async function fetchPricing() {
         try {
-            const res = await fetch(API_BASE + '/pricing', { mode: 'cors' });
-            const data = await res.json();
+            // Shares api.js's cache (and its batched /settings + /pricing request) when loaded
+            const data = (typeof API !== 'undefined' && API.getPricing)
+                ? await API.getPricing()
+                : await (await fetch(API_BASE + '/pricing', { mode: 'cors' })).json();
             if (data && Array.isArray(data)) {
                 pricingFromAPI = parsePricingFromAPI(data);
                 return pricingFromAPI;
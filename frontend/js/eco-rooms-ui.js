@@ -4,19 +4,10 @@
 (function () {
   'use strict';
 
-  const ROOM_PRICES = {
-    'a-cabin': { amount: 180000, label: '/ night' },
-    cottage: { amount: 180000, label: '/ night' },
-    kikota: { amount: 400000, label: ' / stay (2–4 guests)' },
-    'family-house': { amount: 250000, label: '/ night (2 guests)' },
-  };
-
-  const DEFAULT_AMENITIES = [
-    'Comfortable beds',
-    'Private bathroom',
-    'Farm view',
-    'Free WiFi',
-  ];
+  // Shared with backend/prerender.py: data/site-content.json, loaded as js/site-content.js
+  const SITE_CONTENT = window.KALONGO_CONTENT || {};
+  const ROOM_PRICES = SITE_CONTENT.room_prices || {};
+  const DEFAULT_AMENITIES = SITE_CONTENT.default_amenities || [];
 
   function formatTzs(n) {
     return 'TZS ' + Number(n).toLocaleString('en-US');
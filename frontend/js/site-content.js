@@ -0,0 +1,82 @@
+// Generated by backend/prerender.py from data/site-content.json - edit that file and re-run it
+window.KALONGO_CONTENT = {
+  "facilities": [
+    {
+      "key": "pool",
+      "name": "Swimming Pool",
+      "description": "Relax and cool off in our refreshing swimming pool surrounded by nature."
+    },
+    {
+      "key": "farm",
+      "name": "Natural Farm",
+      "description": "Experience authentic farm life with our natural farming practices and organic produce."
+    },
+    {
+      "key": "animals",
+      "name": "Domestic Animals",
+      "description": "Interact with our friendly domestic animals including cows, goats, chickens, and more."
+    },
+    {
+      "key": "food",
+      "name": "Farm-Fresh Food",
+      "description": "Enjoy delicious meals made from fresh, locally sourced ingredients from our farm."
+    },
+    {
+      "key": "trails",
+      "name": "Nature Trails",
+      "description": "Explore our beautiful surroundings through guided nature walks and trails."
+    },
+    {
+      "key": "activities",
+      "name": "Activities",
+      "description": "Participate in various farm activities, animal feeding, and educational programs."
+    }
+  ],
+  "room_prices": {
+    "a-cabin": {
+      "amount": 180000,
+      "label": "/ night"
+    },
+    "cottage": {
+      "amount": 180000,
+      "label": "/ night"
+    },
+    "kikota": {
+      "amount": 400000,
+      "label": " / stay (2–4 guests)"
+    },
+    "family-house": {
+      "amount": 250000,
+      "label": "/ night (2 guests)"
+    }
+  },
+  "default_amenities": [
+    "Comfortable beds",
+    "Private bathroom",
+    "Farm view",
+    "Free WiFi"
+  ],
+  "review_meta": [
+    {
+      "name": "Michael T.",
+      "location": "Dar es Salaam, Tanzania",
+      "date": "April 15, 2024"
+    },
+    {
+      "name": "Sarah M.",
+      "location": "Arusha, Tanzania",
+      "date": "March 8, 2024"
+    },
+    {
+      "name": "Grace T.",
+      "location": "Mbeya, Tanzania",
+      "date": "February 22, 2024"
+    },
+    {
+      "name": "John K.",
+      "location": "Dodoma, Tanzania",
+      "date": "January 10, 2024"
+    }
+  ],
+  "default_review_quote": "An unforgettable stay surrounded by nature, comfort, and warm hospitality. Kalongo Farm exceeded every expectation."
+};